@@ -1,3 +1,28 @@
-from django.contrib import admin
+from django.contrib.admin import ModelAdmin, register
+from django.utils.translation import gettext_lazy as _
+from apps.general.models import Job
 
-# Register your models here.
+
+@register(Job)
+class JobAdmin(ModelAdmin):
+    """
+    Admin configuration for the Job model.
+    """
+    list_display = (
+        "id",
+        "task",
+        "status",
+        "attempts",
+        "run_at",
+        "updated_at",
+    )
+
+    list_display_links = ("task",)
+    list_filter = ("status", "task")
+    search_fields = ("task",)
+    search_help_text = _("Search by task")
+    readonly_fields = ("attempts", "locked_until", "last_error")
+    list_per_page = 20
+
+    def has_add_permission(self, request):
+        return False
@@ -8,4 +8,20 @@ class GeneralManagementConstants:
     UUID = _("UUID")
     UPDATED_AT = _("Updated at")
     CREATED_AT = _("Created at")
-    DELETED_AT = _("Deleted at")
\ No newline at end of file
+    DELETED_AT = _("Deleted at")
+
+    # Jobs
+    JOB = _("Job")
+    JOBS = _("Jobs")
+    TASK = _("Task")
+    PAYLOAD = _("Payload")
+    STATUS = _("Status")
+    ATTEMPTS = _("Attempts")
+    MAX_ATTEMPTS = _("Max attempts")
+    RUN_AT = _("Run at")
+    LOCKED_UNTIL = _("Locked until")
+    LAST_ERROR = _("Last error")
+    PENDING = _("Pending")
+    RUNNING = _("Running")
+    DONE = _("Done")
+    FAILED = _("Failed")
@@ -0,0 +1,78 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.general.models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(name):
+    """
+    Register the decorated function as the job task ``name``.
+
+    Tasks receive the job payload as keyword arguments, so payloads must be
+    JSON serializable. Tasks may run more than once and should be idempotent.
+    They run in autocommit mode and open their own transactions, so work
+    committed before a failure is kept when the job is retried.
+    """
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, delay=0, max_attempts=None, **payload):
+    """
+    Store a job for ``run_worker`` and return it.
+
+    The job row is written in the caller's transaction, so a rolled back
+    request never leaves a job behind.
+    """
+    if name not in registry:
+        raise KeyError(f"Unknown job task {name!r}")
+    return Job.objects.create(
+        task=name,
+        payload=payload,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt, doubling after every failure."""
+    return settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1)
+
+
+def run_job(job_id):
+    """
+    Run one claimed job and record the outcome.
+
+    A failed job goes back to pending with an exponential backoff until it
+    reaches ``max_attempts``, then it is marked as failed.
+    """
+    job = Job.objects.get(pk=job_id)
+    try:
+        registry[job.task](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            logger.error("Job %s (%s) failed after %s attempts", job.pk, job.task, job.attempts)
+        else:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+            logger.warning("Job %s (%s) failed, retrying at %s", job.pk, job.task, job.run_at)
+        job.locked_until = None
+        job.save(update_fields=["status", "run_at", "locked_until", "last_error", "updated_at"])
+        return job.status
+
+    job.status = Job.DONE
+    job.locked_until = None
+    job.save(update_fields=["status", "locked_until", "updated_at"])
+    return job.status
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.general.models import CommonInfo
+
+
+def archive_order(models):
+    """Models sorted so that every model comes before the models it references."""
+    ordered = []
+    pending = list(models)
+    while pending:
+        for model in pending:
+            referenced_by = [
+                relation.related_model for relation in model._meta.related_objects
+                if relation.related_model in pending and relation.related_model is not model
+            ]
+            if not referenced_by:
+                ordered.append(model)
+                pending.remove(model)
+                break
+        else:
+            # Reference cycle, archive the rest in any order.
+            ordered.extend(pending)
+            break
+    return ordered
+
+
+class Command(BaseCommand):
+    help = (
+        "Move rows soft deleted more than --days ago from their table to <table>_archive, "
+        "so the hot tables only hold live rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="Archive rows deleted more than this many days ago.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be archived.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        models = [
+            model for model in apps.get_models()
+            if issubclass(model, CommonInfo) and not model._meta.proxy
+        ]
+        total = 0
+        with transaction.atomic():
+            for model in archive_order(models):
+                moved = self.archive(model, cutoff)
+                if moved:
+                    self.stdout.write(f"{model._meta.label}: {moved}")
+                total += moved
+
+            if options["dry_run"]:
+                # Everything ran for real so the counts are exact, undo it.
+                transaction.set_rollback(True)
+
+        action = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(self.style.SUCCESS(f"{action} {total} row(s) deleted before {cutoff:%Y-%m-%d}."))
+
+    def archive(self, model, cutoff):
+        quote = connection.ops.quote_name
+        table = model._meta.db_table
+        archive_table = f"{table}_archive"
+        pk_column = model._meta.pk.column
+
+        # Rows still referenced by a live row of another table cannot be removed.
+        referenced = [
+            "NOT EXISTS (SELECT 1 FROM {child} WHERE {child}.{fk} = {table}.{pk})".format(
+                child=quote(relation.related_model._meta.db_table),
+                fk=quote(relation.field.column),
+                table=quote(table),
+                pk=quote(pk_column),
+            )
+            for relation in model._meta.related_objects
+            if relation.one_to_many or relation.one_to_one
+        ]
+        where = " AND ".join([f"{quote('deleted_at')} < %s", *referenced])
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote(archive_table)} "
+                f"(LIKE {quote(table)} INCLUDING DEFAULTS)"
+            )
+            archive_columns = {
+                column.name
+                for column in connection.introspection.get_table_description(cursor, archive_table)
+            }
+            columns = ", ".join(
+                quote(field.column) for field in model._meta.concrete_fields
+                if field.column in archive_columns
+            )
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {quote(table)} WHERE {where} RETURNING *) "
+                f"INSERT INTO {quote(archive_table)} ({columns}) SELECT {columns} FROM moved",
+                [cutoff],
+            )
+            return cursor.rowcount
@@ -0,0 +1,76 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.general.models import Job
+from apps.general.worker import execute, initialize_process
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (emails, image renditions) in a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.JOB_WORKER_PROCESSES,
+            help="Number of processes running jobs in parallel.",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=settings.JOB_VISIBILITY_TIMEOUT,
+            help="Seconds a claimed job stays hidden from other workers before it is claimed again.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to sleep when no job is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as no job is due instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        processes = options["processes"]
+        running = {}
+        finished = 0
+        # Pool processes are spawned rather than forked so they never share the
+        # parent's database connections.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(processes, mp_context=context, initializer=initialize_process) as pool:
+            try:
+                while True:
+                    free = processes - len(running)
+                    job_ids = Job.objects.claim(free, options["visibility_timeout"]) if free else []
+                    for job_id in job_ids:
+                        running[pool.submit(execute, job_id)] = job_id
+
+                    if not running:
+                        if options["once"]:
+                            break
+                        time.sleep(options["poll_interval"])
+                        continue
+
+                    timeout = None if len(running) == processes else options["poll_interval"]
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job_id = running.pop(future)
+                        finished += 1
+                        try:
+                            self.stdout.write(f"Job {job_id}: {future.result()}")
+                        except Exception as error:
+                            # The job stays running and is claimed again once
+                            # its visibility timeout expires.
+                            self.stderr.write(f"Job {job_id} crashed the worker process: {error!r}")
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping, waiting for the running jobs to finish.")
+                wait(running)
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {finished} job(s)."))
@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import CASCADE, F, Manager, Q, QuerySet
+from django.utils import timezone
+
+from apps.general.signals import soft_deleted
+
+
+class SoftDeleteQuerySet(QuerySet):
+    """
+    QuerySet whose ``delete()`` marks rows as deleted instead of removing them.
+
+    Soft deletes follow ``on_delete=CASCADE`` relations to other soft-deletable
+    models, like a regular delete would. ``hard_delete()`` removes the rows.
+    """
+
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def dead(self):
+        return self.filter(deleted_at__isnull=False)
+
+    def delete(self):
+        """
+        Soft delete the selected rows and the rows cascading from them.
+
+        Sends ``soft_deleted`` for every model with the primary keys it marked.
+
+        Returns:
+            tuple: Number of rows marked and the count per model, like ``QuerySet.delete()``.
+        """
+        with transaction.atomic(using=self.db):
+            pks = list(self.alive().values_list("pk", flat=True))
+            if not pks:
+                return 0, {}
+
+            deleted = {}
+            for relation in self.model._meta.related_objects:
+                related_model = relation.related_model
+                if (
+                    relation.one_to_many
+                    and relation.on_delete is CASCADE
+                    and issubclass(related_model._default_manager._queryset_class, SoftDeleteQuerySet)
+                ):
+                    _, related_deleted = related_model._default_manager.using(self.db).filter(
+                        **{f"{relation.field.name}__in": pks}
+                    ).delete()
+                    for label, count in related_deleted.items():
+                        deleted[label] = deleted.get(label, 0) + count
+
+            now = timezone.now()
+            # Through a fresh queryset so subclasses can hook update(), e.g. to
+            # refresh counters of the deleted rows.
+            rows = self.model._default_manager.using(self.db).filter(pk__in=pks).update(
+                deleted_at=now, updated_at=now
+            )
+            deleted[self.model._meta.label] = rows
+            soft_deleted.send(sender=self.model, pks=pks, using=self.db)
+        return sum(deleted.values()), deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def hard_delete(self):
+        """Remove the selected rows from the database."""
+        return super().delete()
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+
+class SoftDeleteManager(Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    Manager hiding soft-deleted rows.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class JobQuerySet(SoftDeleteQuerySet):
+    """
+    QuerySet for the Job model.
+    """
+
+    def due(self):
+        """
+        Pending jobs whose run time has come, and running jobs whose worker
+        let the visibility timeout expire without reporting back.
+        """
+        now = timezone.now()
+        return self.filter(
+            Q(status=self.model.PENDING, run_at__lte=now)
+            | Q(status=self.model.RUNNING, locked_until__lt=now)
+        )
+
+    def claim(self, limit, visibility_timeout):
+        """
+        Lock up to ``limit`` due jobs for one worker and return their ids.
+
+        Rows locked by other workers are skipped, so concurrent workers never
+        claim the same job. A claimed job stays invisible to other workers for
+        ``visibility_timeout`` seconds.
+        """
+        with transaction.atomic(using=self.db):
+            job_ids = list(
+                self.due().order_by("run_at", "id").select_for_update(
+                    skip_locked=True
+                ).values_list("id", flat=True)[:limit]
+            )
+            if job_ids:
+                self.filter(id__in=job_ids).update(
+                    status=self.model.RUNNING,
+                    attempts=F("attempts") + 1,
+                    locked_until=timezone.now() + timedelta(seconds=visibility_timeout),
+                    updated_at=timezone.now(),
+                )
+        return job_ids
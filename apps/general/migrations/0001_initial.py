@@ -0,0 +1,41 @@
+# Generated by Django 5.0.2 on 2026-10-18 18:57
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(db_column='id', editable=False, primary_key=True, serialize=False)),
+                ('uuid', models.UUIDField(db_column='uuid', db_index=True, default=uuid.uuid4, editable=False, unique=True, verbose_name='UUID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at', db_index=True, help_text='Created at', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='updated_at', help_text='Updated at', null=True, verbose_name='Updated at')),
+                ('deleted_at', models.DateTimeField(blank=True, db_column='deleted_at', help_text='Deleted at', null=True, verbose_name='Deleted at')),
+                ('task', models.CharField(db_column='task', help_text='Task', max_length=255, verbose_name='Task')),
+                ('payload', models.JSONField(blank=True, db_column='payload', default=dict, help_text='Payload', verbose_name='Payload')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_column='status', default='pending', help_text='Status', max_length=20, verbose_name='Status')),
+                ('attempts', models.PositiveIntegerField(db_column='attempts', default=0, help_text='Attempts', verbose_name='Attempts')),
+                ('max_attempts', models.PositiveIntegerField(db_column='max_attempts', default=5, help_text='Max attempts', verbose_name='Max attempts')),
+                ('run_at', models.DateTimeField(db_column='run_at', default=django.utils.timezone.now, help_text='Run at', verbose_name='Run at')),
+                ('locked_until', models.DateTimeField(blank=True, db_column='locked_until', help_text='Locked until', null=True, verbose_name='Locked until')),
+                ('last_error', models.TextField(blank=True, db_column='last_error', help_text='Last error', verbose_name='Last error')),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'db_table': 'general_job',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['status', 'run_at'], name='job_due_idx')],
+            },
+        ),
+    ]
@@ -1,10 +1,28 @@
 import uuid
-from django.db.models import Model, UUIDField, DateTimeField, BigAutoField
+from django.db import router
+from django.db.models import (
+    Model,
+    UUIDField,
+    DateTimeField,
+    BigAutoField,
+    CharField,
+    JSONField,
+    PositiveIntegerField,
+    TextField,
+    Index,
+)
+from django.utils import timezone
 from apps.general.constants import GeneralManagementConstants
+from apps.general.managers import JobQuerySet, SoftDeleteManager, SoftDeleteQuerySet
 
 
 class CommonInfo(Model):
-    """docstring for CommonInfo"""
+    """
+    Common fields of every model, with soft deletes.
+
+    ``objects`` hides rows whose ``deleted_at`` is set and ``delete()`` only
+    sets it. ``all_objects`` sees every row and ``hard_delete()`` removes them.
+    """
 
     id = BigAutoField(
         primary_key=True,
@@ -44,5 +62,115 @@ class CommonInfo(Model):
         help_text= GeneralManagementConstants.DELETED_AT,
     )
 
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(self.__class__, instance=self)
+        return self.__class__._default_manager.using(using).filter(pk=self.pk).delete()
+
+    def hard_delete(self, using=None, keep_parents=False):
+        return super().delete(using=using, keep_parents=keep_parents)
+
     class Meta:
         abstract = True
+
+
+class Job(CommonInfo):
+    """
+    A unit of background work stored in the database and run by ``run_worker``.
+
+    Attributes:
+        task (CharField): Registered name of the function that runs the job.
+        payload (JSONField): Keyword arguments passed to the task.
+        status (CharField): Pending, running, done or failed.
+        attempts (PositiveIntegerField): Times a worker claimed the job.
+        max_attempts (PositiveIntegerField): Attempts before the job is failed.
+        run_at (DateTimeField): Earliest time the job may run.
+        locked_until (DateTimeField): End of the visibility timeout of a running job.
+        last_error (TextField): Traceback of the last failed attempt.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, GeneralManagementConstants.PENDING),
+        (RUNNING, GeneralManagementConstants.RUNNING),
+        (DONE, GeneralManagementConstants.DONE),
+        (FAILED, GeneralManagementConstants.FAILED),
+    ]
+
+    task = CharField(
+        verbose_name=GeneralManagementConstants.TASK,
+        help_text=GeneralManagementConstants.TASK,
+        db_column="task",
+        max_length=255,
+    )
+    payload = JSONField(
+        verbose_name=GeneralManagementConstants.PAYLOAD,
+        help_text=GeneralManagementConstants.PAYLOAD,
+        db_column="payload",
+        default=dict,
+        blank=True,
+    )
+    status = CharField(
+        verbose_name=GeneralManagementConstants.STATUS,
+        help_text=GeneralManagementConstants.STATUS,
+        db_column="status",
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = PositiveIntegerField(
+        verbose_name=GeneralManagementConstants.ATTEMPTS,
+        help_text=GeneralManagementConstants.ATTEMPTS,
+        db_column="attempts",
+        default=0,
+    )
+    max_attempts = PositiveIntegerField(
+        verbose_name=GeneralManagementConstants.MAX_ATTEMPTS,
+        help_text=GeneralManagementConstants.MAX_ATTEMPTS,
+        db_column="max_attempts",
+        default=5,
+    )
+    run_at = DateTimeField(
+        verbose_name=GeneralManagementConstants.RUN_AT,
+        help_text=GeneralManagementConstants.RUN_AT,
+        db_column="run_at",
+        default=timezone.now,
+    )
+    locked_until = DateTimeField(
+        verbose_name=GeneralManagementConstants.LOCKED_UNTIL,
+        help_text=GeneralManagementConstants.LOCKED_UNTIL,
+        db_column="locked_until",
+        null=True,
+        blank=True,
+    )
+    last_error = TextField(
+        verbose_name=GeneralManagementConstants.LAST_ERROR,
+        help_text=GeneralManagementConstants.LAST_ERROR,
+        db_column="last_error",
+        blank=True,
+    )
+
+    objects = SoftDeleteManager.from_queryset(JobQuerySet)()
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}: ({self.task}, {self.status})"
+
+    class Meta:
+        app_label = "general"
+        db_table = "general_job"
+        verbose_name = GeneralManagementConstants.JOB
+        verbose_name_plural = GeneralManagementConstants.JOBS
+        ordering = ["-id"]
+        indexes = [
+            Index(
+                fields=["status", "run_at"],
+                name="job_due_idx",
+            ),
+        ]
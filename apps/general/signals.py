@@ -0,0 +1,5 @@
+from django.db.models.signals import ModelSignal
+
+# Sent after rows are soft deleted, including the rows a soft delete cascades to.
+# Arguments: pks (list of the primary keys marked), using (database alias).
+soft_deleted = ModelSignal(use_caching=True)
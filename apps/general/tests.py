@@ -1,3 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.general.jobs import enqueue, retry_delay, run_job, task
+from apps.general.models import Job
+
+calls = []
+
+
+@task("general.tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task("general.tests.fail")
+def fail():
+    raise RuntimeError("SMTP is down")
+
+
+class JobTests(TestCase):
+    """
+    Jobs are claimed once per visibility timeout and retried with backoff.
+    """
+
+    def setUp(self):
+        calls.clear()
+
+    def test_due_jobs_are_claimed_once_until_their_lock_expires(self):
+        due = enqueue("general.tests.record", value=1)
+        enqueue("general.tests.record", delay=60, value=2)
+
+        self.assertEqual(Job.objects.claim(10, 60), [due.pk])
+        due.refresh_from_db()
+        self.assertEqual((due.status, due.attempts), (Job.RUNNING, 1))
+        self.assertEqual(Job.objects.claim(10, 60), [])
+
+        # A worker that died leaves the job running until its lock expires.
+        Job.objects.filter(pk=due.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(Job.objects.claim(10, 60), [due.pk])
+        due.refresh_from_db()
+        self.assertEqual(due.attempts, 2)
+
+    def test_successful_jobs_are_done(self):
+        job = enqueue("general.tests.record", value=1)
+        Job.objects.claim(1, 60)
+
+        self.assertEqual(run_job(job.pk), Job.DONE)
+        self.assertEqual(calls, [1])
+        job.refresh_from_db()
+        self.assertIsNone(job.locked_until)
+
+    def test_failed_jobs_are_retried_with_backoff_until_max_attempts(self):
+        job = enqueue("general.tests.fail", max_attempts=2)
+
+        Job.objects.claim(1, 60)
+        before = timezone.now()
+        with self.assertLogs("apps.general.jobs", "WARNING"):
+            self.assertEqual(run_job(job.pk), Job.PENDING)
+        job.refresh_from_db()
+        self.assertIn("SMTP is down", job.last_error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=settings.JOB_RETRY_BACKOFF))
+        self.assertEqual(Job.objects.claim(1, 60), [])
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        Job.objects.claim(1, 60)
+        with self.assertLogs("apps.general.jobs", "ERROR"):
+            self.assertEqual(run_job(job.pk), Job.FAILED)
+        self.assertEqual(Job.objects.claim(1, 60), [])
 
-# Create your tests here.
+    def test_retry_delay_doubles_after_every_failure(self):
+        self.assertEqual(
+            [retry_delay(attempts) for attempts in (1, 2, 3)],
+            [settings.JOB_RETRY_BACKOFF, settings.JOB_RETRY_BACKOFF * 2, settings.JOB_RETRY_BACKOFF * 4],
+        )
@@ -0,0 +1,26 @@
+"""
+Entry points of the run_worker pool processes.
+
+Pool processes are spawned, so this module is imported before Django is set
+up and must not import models at module level.
+"""
+import signal
+
+import django
+from django.db import connections
+
+
+def initialize_process():
+    """Set up Django in a freshly spawned pool process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+
+def execute(job_id):
+    """Run one claimed job, then release the database connection."""
+    from apps.general.jobs import run_job
+
+    try:
+        return run_job(job_id)
+    finally:
+        connections.close_all()
@@ -1,8 +1,22 @@
+from collections import Counter
+
+from django.contrib import messages
 from django.contrib.admin import ModelAdmin, register, TabularInline
+from django.contrib.admin.views.main import ChangeList, ORDER_VAR
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.forms.models import BaseInlineFormSet
+from django.http import Http404, HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from django_better_admin_arrayfield.admin.mixins import DynamicArrayMixin
 from django_better_admin_arrayfield.forms.fields import DynamicArrayField
 from django_better_admin_arrayfield.forms.widgets import DynamicArrayTextareaWidget
 from django.utils.translation import gettext_lazy as _
+from apps.travel.constants import TravelManagementConstants
+from apps.travel.forms import PassengerImportForm
+from apps.travel.imports import PassengerImport, read_rows
+from apps.travel.manifests import manifest_response, manifests_zip_response
 from apps.travel.models import (
     Portal,
     SocialMediaAccount,
@@ -10,9 +24,12 @@ from apps.travel.models import (
     TravelImage,
     TravelDestination,
     Passenger,
-    Reservation
+    Reservation,
+    ContactMessage,
+    TravelFullError,
 )
 from django.contrib import admin
+from mvm.utils.pagination import EstimatedCountPaginator
 
 
 @register(Portal)
@@ -23,6 +40,7 @@ class PortalAdmin(ModelAdmin):
     list_display = (
         "id",
         "name",
+        "domain",
         "email",
         "theme_color",
         "is_active",
@@ -95,6 +113,21 @@ class TravelDestinationInline(TabularInline):
     extra = 1
 
 
+class TravelChangeList(ChangeList):
+    """
+    Lists search matches best ``rank`` first, see ``TravelAdmin.get_search_results``.
+
+    The search orders its matches by rank after the changelist ordering is
+    applied, so a column sorted explicitly is applied again on top of it.
+    """
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        if self.query.strip() and ORDER_VAR in self.params:
+            queryset = queryset.order_by(*self.get_ordering(request, queryset))
+        return queryset
+
+
 @register(Travel)
 class TravelAdmin(ModelAdmin, DynamicArrayMixin):
     """
@@ -104,11 +137,15 @@ class TravelAdmin(ModelAdmin, DynamicArrayMixin):
         "name", "start_date", "end_date", "is_active", "max_passengers", "total_reserved", "is_capacity_full", "cancelled"
     )
     list_display_links = ("name",)
-    show_full_result_count = True
+    # A search would run a second COUNT(*) of the whole table for "N total".
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     list_per_page = 20
     exclude = ('deleted_at',)
+    # Derived from the confirmed reservations, close a travel with is_active or cancelled.
+    readonly_fields = ("is_capacity_full",)
     search_fields = ("name",)
-    search_help_text = _("Search by name")
+    search_help_text = _("Search by name, description, inclusions or destinations")
     formfield_overrides = {
         DynamicArrayField: {'widget': DynamicArrayTextareaWidget},
     }
@@ -116,21 +153,89 @@ class TravelAdmin(ModelAdmin, DynamicArrayMixin):
         TravelImageInline,
         TravelDestinationInline,
     ]
+    actions = ["export_manifests"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_availability()
 
-    @admin.display(description="Total Reserved")
+    def get_urls(self):
+        return [
+            path(
+                "<path:object_id>/manifest/",
+                self.admin_site.admin_view(self.manifest_view),
+                name="travel_travel_manifest",
+            ),
+        ] + super().get_urls()
+
+    def manifest_view(self, request, object_id):
+        """
+        Passenger manifest of a travel, ``?format=csv`` (default) or ``?format=json``.
+        """
+        travel = self.get_object(request, unquote(object_id))
+        extension = request.GET.get("format", "csv")
+        if travel is None or extension not in ("csv", "json"):
+            raise Http404
+        if not self.has_view_permission(request, travel):
+            raise PermissionDenied
+        return manifest_response(travel, extension)
+
+    @admin.action(description=TravelManagementConstants.EXPORT_MANIFESTS, permissions=["view"])
+    def export_manifests(self, request, queryset):
+        """CSV manifest of the selected travel, or a zip with one per selected travel."""
+        travels = list(queryset.only("uuid", "name", "start_date").order_by("start_date", "pk"))
+        if len(travels) == 1:
+            return manifest_response(travels[0])
+        return manifests_zip_response(travels)
+
+    def get_changelist(self, request, **kwargs):
+        return TravelChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search the travel search document instead of ILIKE scans on the name.
+
+        Matches are listed best ``rank`` first unless a column is sorted,
+        see ``TravelChangeList``.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
+
+    @admin.display(description="Total Reserved", ordering="passengers_count")
     def total_reserved(self, obj):
-        """docstring total_reserved"""
-        total = Reservation.objects.filter(
-            travel=obj,
-            booking_confirmed=True
-        ).count()
-        return total
+        """Confirmed reservations, annotated from the denormalized counter."""
+        return obj.passengers_count
+
+
+class ReservationInlineFormSet(BaseInlineFormSet):
+    """
+    Rejects confirmations beyond the free seats of their travels.
+
+    The seats are taken when the reservations are saved, this check only
+    reports the common case as a form error.
+    """
+
+    def clean(self):
+        super().clean()
+        seats = Counter(
+            form.instance.travel_id
+            for form in self.forms
+            if form.has_changed() and not form.errors and not self._should_delete_form(form)
+            and form.instance.takes_seat()
+        )
+        if not seats:
+            return
+        for travel in Travel.objects.filter(pk__in=seats):
+            if travel.is_capacity_full or travel.confirmed_passengers + seats[travel.pk] > travel.max_passengers:
+                raise TravelFullError(travel)
 
 
 class ReservationInline(TabularInline):
     """
     Inline configuration for the Reservation model.
     """
+    formset = ReservationInlineFormSet
     exclude = ('deleted_at',)
     raw_id_fields = (
         "travel",
@@ -153,3 +258,78 @@ class PassengerAdmin(ModelAdmin):
     list_display = (
         "first_name", "last_name", "phone", "email"
     )
+
+    def get_urls(self):
+        return [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="travel_passenger_import",
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        """
+        Import passengers and their reservations from a CSV or XLSX file.
+        """
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        passenger_import = None
+        form = PassengerImportForm(request.POST or None, request.FILES or None)
+        if form.is_valid():
+            upload = form.cleaned_data["file"]
+            try:
+                rows = read_rows(upload, upload.name)
+            except ValidationError as error:
+                form.add_error("file", error)
+            else:
+                passenger_import = PassengerImport(
+                    travel=form.cleaned_data["travel"], confirm=form.cleaned_data["confirm"]
+                ).run(rows)
+                self.message_user(
+                    request,
+                    passenger_import.summary(),
+                    messages.WARNING if passenger_import.errors else messages.SUCCESS,
+                )
+        context = {
+            **self.admin_site.each_context(request),
+            "title": TravelManagementConstants.IMPORT_PASSENGERS,
+            "opts": self.model._meta,
+            "form": form,
+            "passenger_import": passenger_import,
+        }
+        return TemplateResponse(request, "admin/travel/passenger/import.html", context)
+
+    def changeform_view(self, request, *args, **kwargs):
+        # A concurrent booking may take the last seat after the form was validated.
+        try:
+            return super().changeform_view(request, *args, **kwargs)
+        except TravelFullError as error:
+            self.message_user(request, error.messages[0], messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
+
+
+@register(ContactMessage)
+class ContactMessageAdmin(ModelAdmin):
+    """
+    Admin configuration for the ContactMessage model.
+    """
+    list_display = (
+        "id",
+        "subject",
+        "name",
+        "email",
+        "created_at",
+        "sent_at",
+        "delivery_attempts",
+    )
+
+    list_display_links = ("subject",)
+    search_fields = ("subject", "name", "email")
+    search_help_text = _("Search by subject, name or email")
+    exclude = ("deleted_at",)
+    readonly_fields = ("sent_at", "delivery_attempts", "last_delivery_error")
+    list_per_page = 20
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,125 @@
+"""
+Read-only JSON API of the public travel pages, served under ``/api/<version>/``.
+
+Views read one ``.values()`` row per travel instead of model instances, with
+images and destinations aggregated into arrays by the database, select only
+the columns of the fields asked for with ``?fields=`` and answer conditional
+requests with the same ``ETag`` / ``Last-Modified`` validators as the HTML
+pages, so an unchanged resource costs a 304 and no query while its
+validators are cached.
+"""
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import OuterRef
+from django.db.models.functions import JSONObject
+from django.utils.decorators import method_decorator
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.travel.conditions import (
+    conditional_page,
+    gallery_validators,
+    portal_validators,
+    travel_detail_validators,
+    travel_gallery_validators,
+    travels_validators,
+)
+from apps.travel.models import Travel, TravelDestination, TravelImage
+from apps.travel.serializers import (
+    GalleryDetailSerializer,
+    GalleryListSerializer,
+    PortalSerializer,
+    TravelDetailSerializer,
+    TravelListSerializer,
+)
+from mvm.utils.api import ValuesDetailAPIView, ValuesListAPIView
+
+
+class TravelLookupMixin:
+    lookup_field = "uuid"
+    lookup_url_kwarg = "travel_uuid"
+
+
+@method_decorator(conditional_page(portal_validators), name="dispatch")
+class PortalAPIView(APIView):
+    """
+    Contact details and social media accounts of the portal of the request host.
+    """
+
+    def get(self, request, *args, **kwargs):
+        serializer = PortalSerializer(context={"request": request})
+        data = request.portal
+        if data["portal"] is None:
+            raise NotFound()
+        row = dict(data["portal"], social_media_accounts=data["social_media_accounts"])
+        return Response(serializer.to_representation(row))
+
+
+@method_decorator(conditional_page(travels_validators), name="dispatch")
+class TravelListAPIView(ValuesListAPIView):
+    """
+    Upcoming travels, latest start date first.
+    """
+    serializer_class = TravelListSerializer
+
+    def get_queryset(self):
+        return Travel.objects.upcoming().for_portal(self.request.portal["id"]).with_availability()
+
+
+@method_decorator(conditional_page(travel_detail_validators), name="dispatch")
+class TravelDetailAPIView(TravelLookupMixin, ValuesDetailAPIView):
+    """
+    One upcoming travel with its images and destinations.
+    """
+    serializer_class = TravelDetailSerializer
+
+    def get_queryset(self):
+        return Travel.objects.upcoming().for_portal(self.request.portal["id"]).with_availability()
+
+    def annotate_fields(self, queryset, serializer):
+        if serializer.wants("travel_images"):
+            queryset = queryset.annotate(travel_images=ArraySubquery(
+                TravelImage.objects.filter(travel=OuterRef("pk")).values("image")
+            ))
+        if serializer.wants("travel_destinations"):
+            queryset = queryset.annotate(travel_destinations=ArraySubquery(
+                TravelDestination.objects.filter(travel=OuterRef("pk")).order_by("start_date").values(
+                    json=JSONObject(
+                        name="name",
+                        start_date="start_date",
+                        end_date="end_date",
+                        image="image",
+                        description="description",
+                    )
+                )
+            ))
+        return queryset
+
+
+@method_decorator(conditional_page(gallery_validators), name="dispatch")
+class GalleryListAPIView(ValuesListAPIView):
+    """
+    Past travels of the gallery, latest start date first.
+    """
+    serializer_class = GalleryListSerializer
+
+    def get_queryset(self):
+        return Travel.objects.past_for_gallery().for_portal(self.request.portal["id"])
+
+
+@method_decorator(conditional_page(travel_gallery_validators), name="dispatch")
+class GalleryDetailAPIView(TravelLookupMixin, ValuesDetailAPIView):
+    """
+    Gallery images of one past travel.
+    """
+    serializer_class = GalleryDetailSerializer
+
+    def get_queryset(self):
+        return Travel.objects.past_for_gallery().for_portal(self.request.portal["id"])
+
+    def annotate_fields(self, queryset, serializer):
+        if serializer.wants("gallery_images"):
+            queryset = queryset.annotate(gallery_images=ArraySubquery(
+                TravelImage.objects.filter(travel=OuterRef("pk"), is_gallery_image=True).values("image")
+            ))
+        return queryset
@@ -6,3 +6,6 @@ class TravelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.travel'
     verbose_name = _("Travel")
+
+    def ready(self):
+        from apps.travel import jobs, signals  # noqa: F401
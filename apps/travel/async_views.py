@@ -0,0 +1,193 @@
+"""
+Async versions of the public travel views, routed by ``mvm.asgi_urls``.
+
+They render the same templates from the same context as ``apps.travel.views``
+and fetch with the async ORM, awaiting the independent parts of a page, e.g.
+the travels and the testimonials, together with ``asyncio.gather``. Django runs the
+ORM calls of one request on a single thread, so the queries themselves still
+run one after another, but the event loop is never blocked on them and serves
+other requests meanwhile.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.views.generic import View
+
+from apps.travel.cache import listing_page_tags, overview_page_tags, page_cache, travel_page_tags
+from apps.travel.conditions import (
+    conditional_page,
+    gallery_validators,
+    overview_validators,
+    travel_detail_validators,
+    travel_gallery_validators,
+    travels_validators,
+)
+from apps.travel.notifications import submit_contact_message
+from apps.travel.utils import aget_featured_reviews
+from apps.travel.views import ContactView, GalleryView, OverView, TravelDetailView, TravelGalleryView, TravelView
+from mvm.utils.images import media_url
+from mvm.utils.pagination import InvalidCursor
+
+
+class AsyncViewMixin:
+    """
+    Applies the view decorators in ``decorators``, outermost first.
+
+    ``method_decorator`` on ``dispatch`` would wrap a coroutine in sync
+    decorators, so the decorators wrap the async view function instead.
+    """
+    decorators = ()
+
+    # Drop the sync decorators the parent view put on ``dispatch``.
+    dispatch = View.dispatch
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        for decorator in reversed(cls.decorators):
+            view = decorator(view)
+        return view
+
+
+class AsyncOverView(AsyncViewMixin, OverView):
+    """
+    Async OverView
+    """
+    decorators = (
+        conditional_page(overview_validators),
+        page_cache.cache_page("overview", overview_page_tags),
+    )
+
+    async def aget_travels(self):
+        travels = [travel async for travel in self.get_travels()]
+        for travel in travels:
+            travel["cover_image"] = media_url(travel["cover_image"])
+        return travels
+
+    async def get(self, request, *args, **kwargs):
+        travels, reviews = await asyncio.gather(
+            self.aget_travels(),
+            aget_featured_reviews(request.portal["id"]),
+        )
+        data = {
+            "travels": travels,
+            "portal": request.portal["portal"],
+            "social_media_accounts": request.portal["social_media_accounts"],
+            "reviews": reviews,
+        }
+        return TemplateResponse(request, "travel/overview.html", data)
+
+
+class AsyncYearGroupedListMixin(AsyncViewMixin):
+    """
+    Async ``YearGroupedListMixin``, fetching the year index and the page together.
+    """
+
+    async def aget_year_index(self, queryset):
+        return [day.year async for day in queryset.dates("start_date", "year", order="DESC")]
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = queryset = self.get_queryset()
+        selected_year = self.get_selected_year()
+        paginator = self.get_paginator(queryset, selected_year)
+        try:
+            years, page = await asyncio.gather(
+                self.aget_year_index(queryset),
+                paginator.apage(request.GET.get("cursor")),
+            )
+        except InvalidCursor:
+            raise Http404
+
+        data = self.get_listing_data(page, years, selected_year)
+        data["portal"] = request.portal["portal"]
+        data["social_media_accounts"] = request.portal["social_media_accounts"]
+        return TemplateResponse(request, self.get_template_names(), data)
+
+
+class AsyncTravelView(AsyncYearGroupedListMixin, TravelView):
+    """
+    Async TravelView
+    """
+    decorators = (
+        conditional_page(travels_validators),
+        page_cache.cache_page("my-travels", listing_page_tags),
+    )
+
+
+class AsyncGalleryView(AsyncYearGroupedListMixin, GalleryView):
+    """
+    Async GalleryView
+    """
+    decorators = (
+        conditional_page(gallery_validators),
+        page_cache.cache_page("gallery", listing_page_tags),
+    )
+
+
+class AsyncTravelPageMixin(AsyncViewMixin):
+    """
+    Async ``TravelPageMixin``, fetching the travel with the async ORM.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        lookup = {self.slug_field: kwargs[self.slug_url_kwarg]}
+        self.object = await self.get_queryset().filter(**lookup).afirst()
+        if self.object is None or not self.is_available(self.object):
+            context = dict(request.portal, reason=self.not_found_reason)
+            return TemplateResponse(request, self.not_found_template, context)
+
+        context = {
+            "object": self.object,
+            "travel": self.get_travel_data(self.object),
+            "portal": request.portal["portal"],
+            "social_media_accounts": request.portal["social_media_accounts"],
+        }
+        return TemplateResponse(request, self.get_template_names(), context)
+
+
+class AsyncTravelDetailView(AsyncTravelPageMixin, TravelDetailView):
+    """
+    Async TravelDetailView
+    """
+    decorators = (
+        conditional_page(travel_detail_validators),
+        page_cache.cache_page("travel_details", travel_page_tags),
+    )
+
+
+class AsyncTravelGalleryView(AsyncTravelPageMixin, TravelGalleryView):
+    """
+    Async TravelGalleryView
+    """
+    decorators = (
+        conditional_page(travel_gallery_validators),
+        page_cache.cache_page("travel_gallery", travel_page_tags),
+    )
+
+
+class AsyncContactView(AsyncViewMixin, ContactView):
+    """
+    Async ContactView
+    """
+
+    async def render_contact(self, request):
+        data = {
+            "portal": request.portal["portal"],
+            "social_media_accounts": request.portal["social_media_accounts"],
+        }
+        return TemplateResponse(request, self.template_name, data)
+
+    async def get(self, request, *args, **kwargs):
+        return await self.render_contact(request)
+
+    async def post(self, request, *args, **kwargs):
+        # Stored first and emailed in batches by the run_worker command.
+        await sync_to_async(submit_contact_message)(
+            request.POST.get('name'),
+            request.POST.get('email'),
+            request.POST.get('subject'),
+            request.POST.get('message'),
+        )
+        return await self.render_contact(request)
@@ -0,0 +1,49 @@
+from django.conf import settings
+
+from mvm.utils.cache import TieredCache
+from mvm.utils.page_cache import TaggedPageCache
+
+portal_context_cache = TieredCache(
+    namespace="travel:portal-context",
+    local_timeout=settings.PORTAL_CACHE_LOCAL_TIMEOUT,
+    shared_timeout=settings.PORTAL_CACHE_SHARED_TIMEOUT,
+)
+
+featured_reviews_cache = TieredCache(
+    namespace="travel:featured-reviews",
+    local_timeout=settings.FEATURED_REVIEWS_CACHE_LOCAL_TIMEOUT,
+    shared_timeout=settings.FEATURED_REVIEWS_CACHE_SHARED_TIMEOUT,
+)
+
+contact_recipients_cache = TieredCache(
+    namespace="travel:contact-recipients",
+    local_timeout=settings.CONTACT_RECIPIENTS_CACHE_LOCAL_TIMEOUT,
+    shared_timeout=settings.CONTACT_RECIPIENTS_CACHE_SHARED_TIMEOUT,
+)
+
+page_cache = TaggedPageCache(
+    alias=settings.PAGE_CACHE_ALIAS,
+    timeout=settings.PAGE_CACHE_TIMEOUT,
+)
+
+# Tags of the public pages. Every page also depends on PORTAL_TAG, since the
+# navbar and footer render the portal data.
+PORTAL_TAG = "portal"
+LISTINGS_TAG = "travel-listings"
+REVIEWS_TAG = "reviews"
+
+
+def travel_tag(travel_uuid):
+    return f"travel:{travel_uuid}"
+
+
+def overview_page_tags(request, **kwargs):
+    return [PORTAL_TAG, LISTINGS_TAG, REVIEWS_TAG]
+
+
+def listing_page_tags(request, **kwargs):
+    return [PORTAL_TAG, LISTINGS_TAG]
+
+
+def travel_page_tags(request, travel_uuid, **kwargs):
+    return [PORTAL_TAG, travel_tag(travel_uuid)]
@@ -0,0 +1,143 @@
+"""
+HTTP validators (``ETag`` / ``Last-Modified``) of the public travel pages.
+
+Each page gets a cheap fingerprint built from ``CommonInfo.updated_at``
+aggregates and row counts, so ``django.views.decorators.http.condition`` can
+answer conditional requests with a 304 before the context is built or the
+template is rendered. The fingerprints are cached under the tags of their page,
+so they are purged together with it and a cache hit runs no query.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from apps.travel.cache import (
+    PORTAL_TAG,
+    listing_page_tags,
+    overview_page_tags,
+    page_cache,
+    travel_page_tags,
+)
+from apps.travel.models import Travel
+from apps.travel.utils import get_featured_reviews
+
+
+def _latest(*values):
+    return max(filter(None, values), default=None)
+
+
+def _weak_etag(*parts):
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _validators(request, key, tags, compute):
+    # condition() asks for the ETag and Last-Modified separately, compute them once.
+    cache = request.__dict__.setdefault("_travel_validators", {})
+    if key not in cache:
+        # Shared until a tag of the page is purged, or the date the listings depend on changes.
+        shared_key = f"validators:{key}:{request.portal['id']}:{timezone.now().date()}"
+        cache[key] = page_cache.get_or_set(shared_key, tags, compute)
+    return cache[key]
+
+
+def _listing_validators(request, queryset, *extra):
+    portal_modified = request.portal["last_modified"]
+    aggregates = queryset.for_portal(request.portal["id"]).aggregate(updated=Max("updated_at"), total=Count("id"))
+    last_modified = _latest(aggregates["updated"], portal_modified)
+    # The listings depend on today's date through their start/end date filters.
+    etag = _weak_etag(last_modified, aggregates["total"], timezone.now().date(), *extra)
+    return last_modified, etag
+
+
+def _travel_validators(request, queryset, travel_uuid):
+    portal_modified = request.portal["last_modified"]
+    aggregates = queryset.for_portal(request.portal["id"]).filter(uuid=travel_uuid).aggregate(
+        travel=Max("updated_at"),
+        images=Max("travel_image__updated_at"),
+        image_count=Count("travel_image", distinct=True),
+        destinations=Max("travel_destination__updated_at"),
+        destination_count=Count("travel_destination", distinct=True),
+    )
+    if aggregates["travel"] is None:
+        return None, None
+    last_modified = _latest(
+        aggregates["travel"], aggregates["images"], aggregates["destinations"], portal_modified
+    )
+    etag = _weak_etag(
+        last_modified, aggregates["image_count"], aggregates["destination_count"], timezone.now().date()
+    )
+    return last_modified, etag
+
+
+def portal_validators(request, **kwargs):
+    def compute():
+        last_modified = request.portal["last_modified"]
+        return last_modified, _weak_etag(last_modified)
+    return _validators(request, "portal", [PORTAL_TAG], compute)
+
+
+def overview_validators(request, **kwargs):
+    def compute():
+        # The testimonials are cached, hashing them costs no query.
+        return _listing_validators(request, Travel.objects.upcoming(), get_featured_reviews(request.portal["id"]))
+    return _validators(request, "overview", overview_page_tags(request), compute)
+
+
+def travels_validators(request, **kwargs):
+    return _validators(
+        request, "travels", listing_page_tags(request), lambda: _listing_validators(request, Travel.objects.upcoming())
+    )
+
+
+def gallery_validators(request, **kwargs):
+    return _validators(
+        request, "gallery", listing_page_tags(request),
+        lambda: _listing_validators(request, Travel.objects.past_for_gallery()),
+    )
+
+
+def travel_detail_validators(request, travel_uuid, **kwargs):
+    return _validators(
+        request, f"travel_detail:{travel_uuid}", travel_page_tags(request, travel_uuid),
+        lambda: _travel_validators(request, Travel.objects.upcoming(), travel_uuid),
+    )
+
+
+def travel_gallery_validators(request, travel_uuid, **kwargs):
+    return _validators(
+        request, f"travel_gallery:{travel_uuid}", travel_page_tags(request, travel_uuid),
+        lambda: _travel_validators(request, Travel.objects.past_for_gallery(), travel_uuid),
+    )
+
+
+def conditional_page(validators):
+    """
+    Decorator answering conditional GET/HEAD requests from ``validators``.
+
+    For async views the validators are computed off the event loop first, so
+    ``condition`` reads them from the request without running a query.
+    """
+    conditional = condition(
+        etag_func=lambda request, *args, **kwargs: validators(request, **kwargs)[1],
+        last_modified_func=lambda request, *args, **kwargs: validators(request, **kwargs)[0],
+    )
+
+    def decorator(view_func):
+        conditional_view = conditional(view_func)
+        if not iscoroutinefunction(view_func):
+            return conditional_view
+
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            await sync_to_async(validators)(request, **kwargs)
+            return await conditional_view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
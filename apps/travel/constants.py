@@ -50,3 +50,48 @@ class TravelManagementConstants:
     RATING = _("Rating")
     TRAVEL_RATING = _("Travel rating (0.0 - 5.0)")
     IS_GALLERY_IMAGE = _("Is gallery image")
+    CONFIRMED_PASSENGERS = _("Confirmed passengers")
+    IS_TRAVEL_FULL = _("Is travel full")
+    CONTACT_MESSAGE = _("Contact message")
+    CONTACT_MESSAGES = _("Contact messages")
+    SUBJECT = _("Subject")
+    MESSAGE = _("Message")
+    SENT_AT = _("Sent at")
+    DELIVERY_ATTEMPTS = _("Delivery attempts")
+    LAST_DELIVERY_ERROR = _("Last delivery error")
+    SEARCH_VECTOR = _("Search document")
+    IMPORT_PASSENGERS = _("Import passengers")
+    IMPORT = _("Import")
+    IMPORT_FILE = _("File")
+    IMPORT_FILE_HELP = _(
+        "CSV or XLSX file with the columns first_name, last_name, email, phone and "
+        "optionally travel (its UUID) and booking_confirmed."
+    )
+    IMPORT_TRAVEL_HELP = _("Travel booked by the rows that leave travel empty.")
+    IMPORT_CONFIRM = _("Confirm bookings")
+    IMPORT_CONFIRM_HELP = _("Confirm the reservations of the rows that leave booking_confirmed empty.")
+    IMPORT_SUMMARY = _(
+        "%(rows)d row(s) read: %(passengers)d passenger(s) created, %(reservations)d reservation(s) "
+        "created, %(confirmed)d seat(s) confirmed, %(errors)d row(s) with errors."
+    )
+    IMPORT_ROW_ERRORS = _("Rows with errors")
+    LINE = _("Line")
+    EXPORT_MANIFESTS = _("Export passenger manifests")
+    CSV_MANIFEST = _("CSV manifest")
+    JSON_MANIFEST = _("JSON manifest")
+    DOMAIN = _("Domain")
+    DOMAIN_HELP = _(
+        "Host name the portal is served on, e.g. viajes.example.com. Unknown hosts get the first active portal."
+    )
+    TRAVEL_PORTAL_HELP = _("Portal the travel is shown on. Travels without a portal are shown on every portal.")
+
+    # Errors
+    TRAVEL_FULL = _("%(travel)s has no seats left.")
+    UNSUPPORTED_IMPORT_FILE = _("Only CSV and XLSX files can be imported.")
+    MISSING_IMPORT_COLUMNS = _("The file has no %(columns)s column.")
+    MISSING_TRAVEL = _("No travel given.")
+    UNKNOWN_TRAVEL = _("Unknown travel %(travel)s.")
+    INVALID_BOOLEAN = _("%(value)s is not a yes or no value.")
+    PORTAL_NAME_TAKEN = _("A portal with this name already exists.")
+    PORTAL_DOMAIN_TAKEN = _("A portal is already served on this domain.")
+    SOCIAL_MEDIA_ACCOUNT_NAME_TAKEN = _("This portal already has a social media account with this name.")
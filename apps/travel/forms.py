@@ -0,0 +1,25 @@
+from django.forms import BooleanField, FileField, Form, ModelChoiceField
+
+from apps.travel.constants import TravelManagementConstants
+from apps.travel.models import Travel
+
+
+class PassengerImportForm(Form):
+    """
+    Upload of a passengers file in the passenger admin, see ``apps.travel.imports``.
+    """
+    file = FileField(
+        label=TravelManagementConstants.IMPORT_FILE,
+        help_text=TravelManagementConstants.IMPORT_FILE_HELP,
+    )
+    travel = ModelChoiceField(
+        queryset=Travel.objects.upcoming().order_by("start_date"),
+        label=TravelManagementConstants.TRAVEL,
+        help_text=TravelManagementConstants.IMPORT_TRAVEL_HELP,
+        required=False,
+    )
+    confirm = BooleanField(
+        label=TravelManagementConstants.IMPORT_CONFIRM,
+        help_text=TravelManagementConstants.IMPORT_CONFIRM_HELP,
+        required=False,
+    )
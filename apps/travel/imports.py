@@ -0,0 +1,277 @@
+"""
+Bulk import of passengers and their reservations from CSV or XLSX files.
+
+Rows are read one at a time and written in batches. Passengers are matched
+with the existing ones by email or phone through an in-memory index, so a
+passenger is never created twice; the new ones are inserted with
+``bulk_create`` and their reservations right after. A row that does not
+validate is reported with its line number and skipped, the rest of its
+batch is imported anyway.
+"""
+import codecs
+import csv
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from apps.travel.constants import TravelManagementConstants
+from apps.travel.models import Passenger, Reservation, Travel
+
+PASSENGER_COLUMNS = ("first_name", "last_name", "email", "phone")
+REQUIRED_COLUMNS = ("first_name", "last_name")
+TRUE_VALUES = {"1", "true", "yes", "y", "si", "sí", "x"}
+FALSE_VALUES = {"0", "false", "no", "n"}
+
+
+def read_rows(file, name):
+    """
+    Rows of the CSV or XLSX ``file`` as ``(line, values)`` pairs, ``values``
+    keyed by the lowercased header. The format is chosen by the extension of
+    ``name``; a file without the required columns raises ``ValidationError``.
+    """
+    extension = Path(name).suffix.lower()
+    if extension == ".csv":
+        rows = _read_csv(file)
+    elif extension == ".xlsx":
+        rows = _read_xlsx(file)
+    else:
+        raise ValidationError(TravelManagementConstants.UNSUPPORTED_IMPORT_FILE, code="unsupported_file")
+    header = [column.strip().lower() for column in next(rows, (None, []))[1]]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValidationError(
+            TravelManagementConstants.MISSING_IMPORT_COLUMNS,
+            code="missing_columns",
+            params={"columns": ", ".join(missing)},
+        )
+    # Blank lines, e.g. trailing spreadsheet rows, are not rows.
+    return ((line, dict(zip(header, values))) for line, values in rows if any(values))
+
+
+def _read_csv(file):
+    reader = csv.reader(codecs.iterdecode(file, "utf-8-sig"))
+    for values in reader:
+        yield reader.line_num, [value.strip() for value in values]
+
+
+def _read_xlsx(file):
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for line, values in enumerate(workbook.active.iter_rows(values_only=True), start=1):
+            yield line, [_cell_text(value) for value in values]
+    finally:
+        workbook.close()
+
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Phones typed as numbers.
+        value = int(value)
+    return str(value).strip()
+
+
+def normalize_phone(phone):
+    """Digits of ``phone``, the key passengers are matched on."""
+    return "".join(character for character in phone if character.isdigit())
+
+
+def parse_boolean(value, default):
+    value = value.strip().lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError(TravelManagementConstants.INVALID_BOOLEAN, code="invalid", params={"value": value})
+
+
+class PassengerImport:
+    """
+    Imports rows of passengers, booking each one on a travel.
+
+    The travel of a row is its ``travel`` column, a travel UUID, or ``travel``
+    when empty. Confirmed reservations take the free seats of their travel,
+    locked for the batch, so an import never overbooks a travel either.
+
+    Attributes:
+        rows (int): Rows read.
+        passengers_created (int): New passengers.
+        reservations_created (int): New reservations.
+        seats_confirmed (int): Seats taken by new or newly confirmed reservations.
+        errors (list): ``(line, message)`` of the rows that were skipped.
+    """
+    excluded_fields = [field.name for field in Passenger._meta.fields if field.name not in PASSENGER_COLUMNS]
+
+    def __init__(self, travel=None, confirm=False, batch_size=1000):
+        self.travel = travel
+        self.confirm = confirm
+        self.batch_size = batch_size
+        self.rows = 0
+        self.passengers_created = 0
+        self.reservations_created = 0
+        self.seats_confirmed = 0
+        self.errors = []
+        self._travel_ids = {}
+        self._by_email = {}
+        self._by_phone = {}
+
+    def run(self, rows):
+        """Import ``rows`` of ``(line, values)``, e.g. from ``read_rows()``."""
+        self._load_passengers()
+        batch = []
+        for line, values in rows:
+            self.rows += 1
+            try:
+                batch.append((line, *self.parse(values)))
+            except ValidationError as error:
+                self.add_error(line, error)
+            if len(batch) >= self.batch_size:
+                self.write(batch)
+                batch = []
+        if batch:
+            self.write(batch)
+        return self
+
+    def summary(self):
+        return TravelManagementConstants.IMPORT_SUMMARY % {
+            "rows": self.rows,
+            "passengers": self.passengers_created,
+            "reservations": self.reservations_created,
+            "confirmed": self.seats_confirmed,
+            "errors": len(self.errors),
+        }
+
+    def add_error(self, line, error):
+        if hasattr(error, "error_dict"):
+            message = " ".join(
+                f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items()
+            )
+        else:
+            message = " ".join(error.messages)
+        self.errors.append((line, message))
+
+    def _load_passengers(self):
+        rows = Passenger.objects.values_list("pk", "email", "phone").order_by("pk")
+        for pk, email, phone in rows.iterator(chunk_size=5000):
+            self._index(pk, email, phone)
+
+    def _index(self, passenger, email, phone):
+        if email:
+            self._by_email.setdefault(email.lower(), passenger)
+        phone = normalize_phone(phone or "")
+        if phone:
+            self._by_phone.setdefault(phone, passenger)
+
+    def get_travel_id(self, value):
+        if not value:
+            if self.travel is None:
+                raise ValidationError(TravelManagementConstants.MISSING_TRAVEL, code="missing_travel")
+            return self.travel.pk
+        if value not in self._travel_ids:
+            try:
+                self._travel_ids[value] = Travel.objects.filter(uuid=value).values_list("pk", flat=True).first()
+            except ValidationError:
+                self._travel_ids[value] = None
+        if self._travel_ids[value] is None:
+            raise ValidationError(
+                TravelManagementConstants.UNKNOWN_TRAVEL, code="unknown_travel", params={"travel": value}
+            )
+        return self._travel_ids[value]
+
+    def parse(self, values):
+        """
+        ``(passenger, travel_id, confirmed)`` of a row. ``passenger`` is the
+        pk of an existing passenger or a new unsaved ``Passenger``.
+        """
+        email = values.get("email", "")
+        phone = values.get("phone", "")
+        travel_id = self.get_travel_id(values.get("travel", ""))
+        confirmed = parse_boolean(values.get("booking_confirmed", ""), self.confirm)
+        passenger = self._by_email.get(email.lower()) if email else None
+        if passenger is None and phone:
+            passenger = self._by_phone.get(normalize_phone(phone))
+        if passenger is None:
+            passenger = Passenger(
+                first_name=values.get("first_name", ""),
+                last_name=values.get("last_name", ""),
+                email=email or None,
+                phone=phone,
+            )
+            passenger.clean_fields(exclude=self.excluded_fields)
+            self._index(passenger, email, phone)
+        return passenger, travel_id, confirmed
+
+    def write(self, batch):
+        """Insert the passengers and reservations of ``batch`` in one transaction."""
+        with transaction.atomic():
+            # A new passenger may have several rows in the batch.
+            new_passengers = list({
+                id(passenger): passenger for _, passenger, _, _ in batch
+                if isinstance(passenger, Passenger) and passenger.pk is None
+            }.values())
+            Passenger.objects.bulk_create(new_passengers, batch_size=self.batch_size)
+            self.passengers_created += len(new_passengers)
+            batch = [
+                (line, getattr(passenger, "pk", passenger), travel_id, confirmed)
+                for line, passenger, travel_id, confirmed in batch
+            ]
+
+            travel_ids = {travel_id for _, _, travel_id, _ in batch}
+            travels = Travel.objects.select_for_update().filter(pk__in=travel_ids).only(
+                "name", "max_passengers", "confirmed_passengers", "is_capacity_full"
+            ).in_bulk()
+            free_seats = {
+                pk: 0 if travel.is_capacity_full else travel.max_passengers - travel.confirmed_passengers
+                for pk, travel in travels.items()
+            }
+            reservations = {
+                (travel_id, passenger_id): [pk, confirmed]
+                for pk, travel_id, passenger_id, confirmed in Reservation.objects.filter(
+                    travel__in=travel_ids,
+                    passenger__in={passenger_id for _, passenger_id, _, _ in batch},
+                ).values_list("pk", "travel_id", "passenger_id", "booking_confirmed")
+            }
+
+            new_reservations = {}
+            confirmations = []
+            for line, passenger_id, travel_id, confirmed in batch:
+                key = (travel_id, passenger_id)
+                takes_seat = confirmed and not (
+                    reservations[key][1] if key in reservations else
+                    key in new_reservations and new_reservations[key].booking_confirmed
+                )
+                if takes_seat:
+                    if free_seats[travel_id] <= 0:
+                        self.add_error(line, ValidationError(
+                            TravelManagementConstants.TRAVEL_FULL, params={"travel": travels[travel_id]}
+                        ))
+                        continue
+                    free_seats[travel_id] -= 1
+                    self.seats_confirmed += 1
+                if key in reservations:
+                    if takes_seat:
+                        confirmations.append(reservations[key][0])
+                        reservations[key][1] = True
+                elif key in new_reservations:
+                    new_reservations[key].booking_confirmed |= confirmed
+                else:
+                    new_reservations[key] = Reservation(
+                        travel_id=travel_id, passenger_id=passenger_id, booking_confirmed=confirmed
+                    )
+
+            # A reservation created meanwhile by someone else is left as it is,
+            # the counters are recounted from the rows either way.
+            Reservation.objects.bulk_create(
+                new_reservations.values(), batch_size=self.batch_size, ignore_conflicts=True
+            )
+            self.reservations_created += len(new_reservations)
+            if confirmations:
+                Reservation.objects.filter(pk__in=confirmations).update(
+                    booking_confirmed=True, updated_at=timezone.now()
+                )
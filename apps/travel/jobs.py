@@ -0,0 +1,25 @@
+from django.core.management import call_command
+
+from apps.general.jobs import task
+from apps.travel import notifications
+from mvm.utils.images import generate_renditions
+
+
+@task("travel.dispatch_contact_messages")
+def dispatch_contact_messages():
+    """Email the pending contact form messages to the staff."""
+    notifications.dispatch_contact_messages()
+
+
+@task("travel.generate_image_renditions")
+def generate_image_renditions(names):
+    """Write the srcset renditions of freshly uploaded images."""
+    for name in names:
+        generate_renditions(name)
+
+
+@task("travel.build_static_site")
+def build_static_site():
+    """Render the pages of the static snapshot that changed since the last build."""
+    call_command("build_static_site", processes=1)
+
@@ -0,0 +1,106 @@
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from apps.travel.models import Travel
+from mvm.utils.instrumentation import QueryRecorder
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency, queries and memory of the JSON API with the HTML page serving "
+        "the same data. Page caches are bypassed so every request does the full work."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Timed requests per URL.")
+        parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per URL.")
+
+    def get_pairs(self):
+        upcoming = Travel.objects.upcoming().order_by("-start_date").values_list("uuid", flat=True).first()
+        past = Travel.objects.past_for_gallery().filter(
+            travel_image__is_gallery_image=True
+        ).order_by("-start_date").values_list("uuid", flat=True).first()
+        if upcoming is None or past is None:
+            raise CommandError("Needs an upcoming travel and a past travel with gallery images, seed a dataset first.")
+        return [
+            (reverse("travels:my-travels"), reverse("api:travel-list", kwargs={"version": "v1"})),
+            (
+                reverse("travels:travel_details", args=[upcoming]),
+                reverse("api:travel-detail", kwargs={"version": "v1", "travel_uuid": upcoming}),
+            ),
+            (reverse("travels:gallery"), reverse("api:gallery-list", kwargs={"version": "v1"})),
+            (
+                reverse("travels:travel_gallery", args=[past]),
+                reverse("api:gallery-detail", kwargs={"version": "v1", "travel_uuid": past}),
+            ),
+        ]
+
+    def measure(self, client, url, requests, warmup):
+        for _ in range(warmup):
+            client.get(url)
+
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise CommandError(f"{url} answered {response.status_code}.")
+
+        # Memory is traced on a separate request, tracing slows everything down.
+        with QueryRecorder.record() as recorder:
+            tracemalloc.start()
+            try:
+                client.get(url)
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        timings.sort()
+        return {
+            "median_ms": statistics.median(timings) * 1000,
+            "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+            "queries": recorder.count,
+            "peak_kib": peak / 1024,
+            "bytes": len(response.content),
+        }
+
+    def write_row(self, url, result):
+        self.stdout.write(
+            f"  {url:<70} {result['median_ms']:8.2f} {result['p95_ms']:8.2f} "
+            f"{result['queries']:7d} {result['peak_kib']:9.1f} {result['bytes']:8d}"
+        )
+
+    def handle(self, *args, **options):
+        dummy_caches = {
+            alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            for alias in settings.CACHES
+        }
+        header = f"  {'URL':<70} {'median':>8} {'p95':>8} {'queries':>7} {'peak KiB':>9} {'bytes':>8}"
+        slower = 0
+        with override_settings(CACHES=dummy_caches, ALLOWED_HOSTS=["testserver"]):
+            client = Client()
+            self.stdout.write(header)
+            for html_url, api_url in self.get_pairs():
+                html = self.measure(client, html_url, options["requests"], options["warmup"])
+                api = self.measure(client, api_url, options["requests"], options["warmup"])
+                self.write_row(html_url, html)
+                self.write_row(api_url, api)
+                if api["median_ms"] >= html["median_ms"] or api["peak_kib"] >= html["peak_kib"]:
+                    slower += 1
+                    self.stdout.write(self.style.WARNING("  The API is not cheaper than the page."))
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"  API: {html['median_ms'] / api['median_ms']:.1f}x faster, "
+                        f"{html['peak_kib'] / api['peak_kib']:.1f}x less memory"
+                    ))
+
+        if slower:
+            raise CommandError(f"{slower} API endpoint(s) cost as much as their HTML page.")
@@ -0,0 +1,44 @@
+import time
+
+from django.core import mail
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from apps.travel.models import ContactMessage
+from apps.travel.notifications import dispatch_contact_messages
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure contact message dispatch throughput against Django's locmem email backend. "
+        "Every row written is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=500, help="Contact messages to dispatch.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Messages locked per batch.")
+
+    def handle(self, *args, **options):
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"):
+            with transaction.atomic():
+                mail.outbox = []
+                ContactMessage.objects.bulk_create(
+                    ContactMessage(
+                        name=f"Visitante {number}",
+                        email=f"visitante{number}@example.com",
+                        subject="Benchmark",
+                        message="Quisiera información de sus próximos viajes.",
+                    )
+                    for number in range(options["messages"])
+                )
+
+                started = time.perf_counter()
+                delivered = dispatch_contact_messages(options["batch_size"])
+                elapsed = time.perf_counter() - started
+                sent = len(mail.outbox)
+                transaction.set_rollback(True)
+
+        rate = delivered / elapsed if elapsed else 0
+        self.stdout.write(f"Delivered {delivered} message(s), {sent} in the outbox, in {elapsed:.3f}s")
+        self.stdout.write(self.style.SUCCESS(f"{rate:.0f} messages/s"))
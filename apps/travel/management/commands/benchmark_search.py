@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.travel.models import Travel
+
+DEFAULT_QUERIES = ("tikal", "zurich", "viajes a parís", "hospedaje", "semuk champei", "atitlan")
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the travel search against the ILIKE scans it replaced. Seed a large dataset first, "
+        "e.g. seed_travel_data --travels 100000."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES, help="Search terms.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query and strategy.")
+        parser.add_argument("--limit", type=int, default=24, help="Results fetched per run.")
+        parser.add_argument(
+            "--strategies",
+            nargs="+",
+            default=["ilike", "fulltext", "trigram", "search"],
+            help="Strategies to time.",
+        )
+
+    def strategies(self, text):
+        travels = Travel.objects.public()
+        return {
+            "ilike": lambda: travels.filter(
+                Q(name__icontains=text)
+                | Q(description__icontains=text)
+                | Q(highlight_feature__icontains=text)
+                | Q(travel_destination__name__icontains=text)
+            ).distinct().order_by("-start_date"),
+            "fulltext": lambda: travels.matching(text),
+            "trigram": lambda: travels.similar(text),
+            # Full-text first, trigram when nothing matches: what the site runs.
+            "search": lambda: travels.search(text),
+        }
+
+    def measure(self, build, limit, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = list(build().values_list("name", flat=True)[:limit])
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000, rows
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{Travel.objects.count()} travels")
+        self.stdout.write(f"  {'query':<18} {'strategy':<10} {'median ms':>10} {'results':>8}  first match")
+        for text in options["queries"]:
+            for name, build in self.strategies(text).items():
+                if name not in options["strategies"]:
+                    continue
+                median, rows = self.measure(build, options["limit"], options["repeat"])
+                first = rows[0] if rows else "-"
+                self.stdout.write(f"  {text:<18} {name:<10} {median:10.2f} {len(rows):8d}  {first}")
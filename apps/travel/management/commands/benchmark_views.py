@@ -0,0 +1,162 @@
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from apps.travel.models import Reservation, Travel
+from mvm.utils.instrumentation import QueryRecorder
+from mvm.utils.static_site import STATIC_SITE_MIDDLEWARE
+
+# Measures compared against the baseline, queries must not grow at all.
+TIMED_MEASURES = ("p50_ms", "p95_ms")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the public pages with the test client: p50 and p95 latency, queries and peak "
+        "memory of every route. Page caches and the static snapshot are bypassed so every request "
+        "does the full work. Save the results with --output and compare a later run against them "
+        "with --baseline, regressions beyond --tolerance fail. Seed a dataset first, e.g. "
+        "seed_travel_data --scale 10k."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=30, help="Timed requests per route.")
+        parser.add_argument("--warmup", type=int, default=3, help="Untimed requests per route.")
+        parser.add_argument("--output", help="JSON file the results are written to.")
+        parser.add_argument("--baseline", help="JSON file of an earlier run to compare against.")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed relative growth of latency and memory over the baseline, 0.25 is 25%%.",
+        )
+        parser.add_argument(
+            "--slack-ms", type=float, default=2.0,
+            help="Allowed absolute growth of latency, for the noise of the fastest routes.",
+        )
+
+    def get_routes(self):
+        upcoming = Travel.objects.upcoming().order_by("-start_date").values_list("uuid", "start_date").first()
+        past = Travel.objects.past_for_gallery().filter(
+            travel_image__is_gallery_image=True
+        ).order_by("-start_date").values_list("uuid", flat=True).first()
+        if upcoming is None or past is None:
+            raise CommandError("Needs an upcoming travel and a past travel with gallery images, seed a dataset first.")
+        upcoming_uuid, upcoming_start_date = upcoming
+        return {
+            "overview": reverse("travels:overview"),
+            "travels": reverse("travels:my-travels"),
+            "travels_year": f"{reverse('travels:my-travels')}?year={upcoming_start_date.year}",
+            "travel_details": reverse("travels:travel_details", args=[upcoming_uuid]),
+            "gallery": reverse("travels:gallery"),
+            "travel_gallery": reverse("travels:travel_gallery", args=[past]),
+            "search": f"{reverse('travels:search')}?q=tikal",
+            "contact": reverse("travels:contact"),
+        }
+
+    def measure(self, client, url, requests, warmup):
+        for _ in range(warmup):
+            client.get(url)
+
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise CommandError(f"{url} answered {response.status_code}.")
+
+        # Memory is traced on a separate request, tracing slows everything down.
+        with QueryRecorder.record() as recorder:
+            tracemalloc.start()
+            try:
+                client.get(url)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+        return {
+            "url": url,
+            "p50_ms": round(quantiles[49] * 1000, 3),
+            "p95_ms": round(quantiles[94] * 1000, 3),
+            "queries": recorder.count,
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    def run(self, requests, warmup):
+        dummy_caches = {
+            alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            for alias in settings.CACHES
+        }
+        middleware = [name for name in settings.MIDDLEWARE if name != STATIC_SITE_MIDDLEWARE]
+        routes = {}
+        with override_settings(CACHES=dummy_caches, MIDDLEWARE=middleware, ALLOWED_HOSTS=["testserver"]):
+            client = Client()
+            for name, url in self.get_routes().items():
+                routes[name] = self.measure(client, url, requests, warmup)
+                self.write_row(name, routes[name])
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "dataset": {"travels": Travel.objects.count(), "reservations": Reservation.objects.count()},
+            "requests": requests,
+            "routes": routes,
+        }
+
+    def write_row(self, name, result):
+        self.stdout.write(
+            f"  {name:<16} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} "
+            f"{result['queries']:8d} {result['peak_kib']:10.1f}"
+        )
+
+    def compare(self, results, baseline, tolerance, slack_ms):
+        """Regressions of ``results`` over ``baseline``, as messages."""
+        regressions = []
+        for name, result in results["routes"].items():
+            before = baseline["routes"].get(name)
+            if before is None:
+                continue
+            if result["queries"] > before["queries"]:
+                regressions.append(f"{name}: {result['queries']} queries, baseline {before['queries']}")
+            for measure in TIMED_MEASURES:
+                if result[measure] > before[measure] * (1 + tolerance) + slack_ms:
+                    regressions.append(
+                        f"{name}: {measure} {result[measure]:.2f}, baseline {before[measure]:.2f}"
+                    )
+            if result["peak_kib"] > before["peak_kib"] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: peak_kib {result['peak_kib']:.1f}, baseline {before['peak_kib']:.1f}"
+                )
+        return regressions
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text())
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Cannot read the baseline: {error}")
+
+        self.stdout.write(f"  {'route':<16} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KiB':>10}")
+        results = self.run(options["requests"], options["warmup"])
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(f"Results written to {options['output']}.")
+        if baseline is None:
+            return
+
+        if baseline.get("dataset") != results["dataset"]:
+            self.stdout.write(self.style.WARNING(
+                f"The baseline was measured on {baseline.get('dataset')}, this run on {results['dataset']}."
+            ))
+        regressions = self.compare(results, baseline, options["tolerance"], options["slack_ms"])
+        if regressions:
+            raise CommandError("Regressions over the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regression over {options['baseline']}."))
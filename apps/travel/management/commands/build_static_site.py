@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.http import HttpRequest
+from django.urls import reverse
+
+from apps.travel.conditions import gallery_validators, overview_validators, travels_validators
+from apps.travel.models import Portal, Travel
+from apps.travel.utils import get_portal_with_social_media_data
+from mvm.utils.static_site import (
+    mark_built,
+    portal_root,
+    read_manifest,
+    remove_page,
+    render_pages,
+    setup_worker,
+    write_manifest,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the public pages to HTML files under STATIC_SITE_ROOT, served by StaticSiteMiddleware "
+        "without database queries. Only the pages whose content changed since the last build are "
+        "rendered again, run it after editing travels and once a day, e.g. from cron. Every active "
+        "portal gets its own snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", type=int, default=os.cpu_count(), help="Rendering processes, 1 renders in this process."
+        )
+        parser.add_argument("--batch-size", type=int, default=25, help="Pages rendered per task.")
+        parser.add_argument("--full", action="store_true", help="Render every page, changed or not.")
+        parser.add_argument("--output", default=None, help="Snapshot directory, STATIC_SITE_ROOT by default.")
+
+    def get_portal_hosts(self):
+        """
+        Host every portal snapshot is rendered on, by portal. Portals without a
+        domain are only reachable as the default portal, on any other host.
+        """
+        portals = list(Portal.objects.filter(is_active=True).order_by("pk").values_list("pk", "domain"))
+        hosts = {portal_id: domain for portal_id, domain in portals if domain}
+        hosts.setdefault(portals[0][0] if portals else None, "testserver")
+        return hosts
+
+    def get_pages(self, portal_id):
+        """
+        Fingerprint of every page of the snapshot of the portal, by URL.
+
+        The listings reuse the ETags of their views. A travel page changes with
+        the travel, its images, its destinations or the portal.
+        """
+        request = HttpRequest()
+        request.portal = get_portal_with_social_media_data(portal_id)
+        pages = {
+            reverse("travels:overview"): overview_validators(request)[1],
+            reverse("travels:my-travels"): travels_validators(request)[1],
+            reverse("travels:gallery"): gallery_validators(request)[1],
+        }
+        portal_modified = request.portal["last_modified"]
+        for url_name, queryset in (
+            ("travels:travel_details", Travel.objects.upcoming()),
+            ("travels:travel_gallery", Travel.objects.past_for_gallery()),
+        ):
+            rows = queryset.for_portal(portal_id).with_content_state().values_list(
+                "uuid", "content_updated_at", "image_count", "destination_count"
+            )
+            for travel_uuid, content_updated_at, image_count, destination_count in rows.iterator():
+                pages[reverse(url_name, args=[travel_uuid])] = "|".join(
+                    str(part) for part in (content_updated_at, image_count, destination_count, portal_modified)
+                )
+        return pages
+
+    def render(self, root, host, urls, processes, batch_size):
+        batches = [urls[start:start + batch_size] for start in range(0, len(urls), batch_size)]
+        if processes <= 1 or len(batches) <= 1:
+            return [url for batch in batches for url in render_pages(root, batch, host)]
+
+        # Spawned processes open their own connections instead of sharing ours.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(batches)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=setup_worker,
+        ) as executor:
+            written = executor.map(render_pages, [root] * len(batches), batches, [host] * len(batches))
+            return [url for batch in written for url in batch]
+
+    def build(self, root, portal_id, host, options):
+        """Update the snapshot of the portal under ``root``, return the page counts."""
+        manifest = {} if options["full"] else read_manifest(root)
+
+        pages = self.get_pages(portal_id)
+        changed = [url for url, fingerprint in pages.items() if manifest.get(url) != fingerprint]
+        removed = [url for url in manifest if url not in pages]
+        for url in removed:
+            remove_page(root, url)
+
+        written = set(self.render(root, host, changed, options["processes"], options["batch_size"]))
+        manifest = {
+            url: fingerprint for url, fingerprint in pages.items()
+            if url in written or (url not in changed and url in manifest)
+        }
+        write_manifest(root, manifest)
+        return len(written), len(pages) - len(changed), len(removed) + len(changed) - len(written)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        root = Path(options["output"] or settings.STATIC_SITE_ROOT)
+        totals = [0, 0, 0]
+        for portal_id, host in self.get_portal_hosts().items():
+            counts = self.build(portal_root(root, portal_id), portal_id, host, options)
+            totals = [total + count for total, count in zip(totals, counts)]
+        mark_built(root)
+
+        written, unchanged, removed = totals
+        self.stdout.write(self.style.SUCCESS(
+            f"{written} page(s) rendered, {unchanged} unchanged, {removed} removed, "
+            f"in {time.perf_counter() - started:.1f}s to {root}"
+        ))
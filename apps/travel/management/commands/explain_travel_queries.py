@@ -0,0 +1,54 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.travel.managers import confirmed_passengers_subquery
+from apps.travel.models import Travel
+
+SCENARIOS = {
+    # The annotation the public views used before the counter column existed.
+    "availability-correlated": lambda: Travel.objects.upcoming().annotate(
+        passengers_count=confirmed_passengers_subquery()
+    ).order_by("-start_date"),
+    "availability-grouped": lambda: Travel.objects.upcoming().with_availability(live=True).order_by("-start_date"),
+    "availability-counter": lambda: Travel.objects.upcoming().with_availability().order_by("-start_date"),
+}
+
+EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN ANALYZE for the travel query variants and compare their execution time. "
+        "Seed a dataset first, e.g. seed_travel_data --travels 10000 --reservations 1000000."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "scenarios",
+            nargs="*",
+            help=f"Scenarios to run (default: all). Choices: {', '.join(SCENARIOS)}.",
+        )
+        parser.add_argument("--runs", type=int, default=3, help="EXPLAIN ANALYZE runs per scenario.")
+        parser.add_argument("--plans", action="store_true", help="Print the plan of the last run.")
+
+    def handle(self, *args, **options):
+        names = options["scenarios"] or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        for name in names:
+            timings = []
+            plan = ""
+            for _ in range(options["runs"]):
+                plan = SCENARIOS[name]().explain(analyze=True, buffers=True)
+                match = EXECUTION_TIME.search(plan)
+                if match:
+                    timings.append(float(match.group(1)))
+
+            best = min(timings) if timings else float("nan")
+            self.stdout.write(f"{name:<28} best {best:10.2f} ms over {len(timings)} run(s)")
+            if options["plans"]:
+                self.stdout.write(plan)
+                self.stdout.write("")
@@ -0,0 +1,106 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from apps.travel.cache import contact_recipients_cache, featured_reviews_cache, portal_context_cache
+from apps.travel.models import Travel
+from mvm.utils.instrumentation import QueryRecorder
+
+
+def seq_scans(plan):
+    """Relations read with a sequential scan anywhere in a JSON plan."""
+    relations = []
+    if plan.get("Node Type") == "Seq Scan":
+        relations.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        relations.extend(seq_scans(child))
+    return relations
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every public travel page, run each of its SELECT queries through EXPLAIN and "
+        "flag sequential scans on large tables. Seed a dataset first, e.g. seed_travel_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Only flag sequential scans on tables with at least this many rows.",
+        )
+        parser.add_argument("--analyze", action="store_true", help="Run EXPLAIN ANALYZE instead of EXPLAIN.")
+        parser.add_argument("--plans", action="store_true", help="Print the plan of every flagged query.")
+
+    def get_routes(self):
+        upcoming = Travel.objects.upcoming().order_by("-start_date").values_list("uuid", flat=True).first()
+        past = Travel.objects.past_for_gallery().filter(
+            travel_image__is_gallery_image=True
+        ).order_by("-start_date").values_list("uuid", flat=True).first()
+        if upcoming is None or past is None:
+            raise CommandError("Needs an upcoming travel and a past travel with gallery images, seed a dataset first.")
+        return [
+            reverse("travels:overview"),
+            reverse("travels:my-travels"),
+            reverse("travels:travel_details", args=[upcoming]),
+            reverse("travels:gallery"),
+            reverse("travels:travel_gallery", args=[past]),
+        ]
+
+    def table_rows(self, connection, tables):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%s)", [list(tables)])
+            return dict(cursor.fetchall())
+
+    def explain(self, connection, sql, params, analyze):
+        options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN ({options}) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+
+    def handle(self, *args, **options):
+        flagged = 0
+        dummy_caches = {
+            alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            for alias in settings.CACHES
+        }
+        # Render every page cold, so all of its queries run.
+        with override_settings(CACHES=dummy_caches, ALLOWED_HOSTS=["testserver"]):
+            client = Client()
+            for url in self.get_routes():
+                for tiered_cache in (portal_context_cache, featured_reviews_cache, contact_recipients_cache):
+                    tiered_cache.invalidate()
+                with QueryRecorder.record(keep_queries=True) as recorder:
+                    response = client.get(url)
+                self.stdout.write(f"{url} -> {response.status_code}, {recorder.count} queries")
+
+                for alias, sql, params in recorder.queries:
+                    if not sql.lstrip().upper().startswith("SELECT"):
+                        continue
+                    connection = connections[alias]
+                    plan = self.explain(connection, sql, params, options["analyze"])
+                    scans = seq_scans(plan)
+                    rows = self.table_rows(connection, scans) if scans else {}
+                    large = [table for table in scans if rows.get(table, 0) >= options["min_rows"]]
+                    if not large:
+                        continue
+                    flagged += 1
+                    self.stdout.write(self.style.WARNING(
+                        f"  Seq Scan on {', '.join(large)}: {sql[:160]}"
+                    ))
+                    if options["plans"]:
+                        self.stdout.write(json.dumps(plan, indent=2))
+
+        if flagged:
+            self.stdout.write(self.style.WARNING(f"{flagged} query(ies) scan a large table sequentially."))
+        else:
+            self.stdout.write(self.style.SUCCESS("No sequential scan on a large table."))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from apps.travel.models import Passenger, Travel, TravelDestination, TravelImage
+from mvm.utils.images import generate_renditions
+
+IMAGE_FIELDS = (
+    (Travel, "cover_image"),
+    (TravelImage, "image"),
+    (TravelDestination, "image"),
+    (Passenger, "photo"),
+)
+
+
+class Command(BaseCommand):
+    help = "Write the srcset renditions of images uploaded before renditions were generated on save."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild renditions that already exist, e.g. after changing IMAGE_RENDITION_WIDTHS.",
+        )
+
+    def handle(self, *args, **options):
+        written = 0
+        for model, field_name in IMAGE_FIELDS:
+            names = model.objects.exclude(
+                **{f"{field_name}__isnull": True}
+            ).exclude(
+                **{field_name: ""}
+            ).values_list(field_name, flat=True).distinct()
+            for name in names.iterator():
+                written += len(generate_renditions(name, force=options["force"]))
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rendition(s)."))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.travel.imports import PassengerImport, read_rows
+from apps.travel.models import Travel
+
+
+class Command(BaseCommand):
+    help = (
+        "Import passengers and their reservations from a CSV or XLSX file with the columns first_name, "
+        "last_name, email, phone and optionally travel (its UUID) and booking_confirmed. Passengers "
+        "are matched by email or phone, rows with errors are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or XLSX file.")
+        parser.add_argument("--travel", default=None, help="UUID of the travel of the rows without one.")
+        parser.add_argument(
+            "--confirm", action="store_true", help="Confirm the rows without a booking_confirmed value."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows written per transaction.")
+
+    def handle(self, *args, **options):
+        travel = None
+        if options["travel"]:
+            try:
+                travel = Travel.objects.get(uuid=options["travel"])
+            except (Travel.DoesNotExist, ValidationError):
+                raise CommandError(f"Unknown travel {options['travel']}.")
+
+        started = time.perf_counter()
+        with open(options["path"], "rb") as file:
+            try:
+                rows = read_rows(file, options["path"])
+            except ValidationError as error:
+                raise CommandError(" ".join(error.messages))
+            passenger_import = PassengerImport(
+                travel=travel, confirm=options["confirm"], batch_size=options["batch_size"]
+            ).run(rows)
+
+        for line, message in passenger_import.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{passenger_import.summary()} ({time.perf_counter() - started:.1f}s)"
+        ))
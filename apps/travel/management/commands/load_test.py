@@ -0,0 +1,170 @@
+import http.client
+import itertools
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from apps.travel.models import Travel
+
+SERVERS = {
+    # Sync views, one request at a time per worker process.
+    "sync": ["mvm.wsgi:application"],
+    # Async views from ASGI_URLCONF, one event loop per worker process.
+    "async": ["mvm.asgi:application", "--worker-class", "uvicorn.workers.UvicornWorker"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the public pages on gunicorn sync workers and on uvicorn workers, with the "
+        "same number of worker processes on the same machine, and compare throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--servers", nargs="+", choices=SERVERS, default=list(SERVERS), help="Servers to test.")
+        parser.add_argument("--workers", type=int, default=2, help="Worker processes per server.")
+        parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive clients.")
+        parser.add_argument("--duration", type=float, default=15, help="Seconds of load per server.")
+        parser.add_argument("--warmup", type=float, default=3, help="Seconds of untimed load per server.")
+        parser.add_argument("--port", type=int, default=8765, help="Port the servers listen on.")
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Make every URL unique so no request is answered from the page cache.",
+        )
+        parser.add_argument("paths", nargs="*", help="Paths to request, the public pages by default.")
+
+    def get_paths(self):
+        upcoming = Travel.objects.upcoming().order_by("-start_date").values_list("uuid", flat=True).first()
+        past = Travel.objects.past_for_gallery().order_by("-start_date").values_list("uuid", flat=True).first()
+        if upcoming is None or past is None:
+            raise CommandError("Needs an upcoming and a past travel, seed a dataset first.")
+        return [
+            reverse("travels:overview"),
+            reverse("travels:my-travels"),
+            reverse("travels:travel_details", args=[upcoming]),
+            reverse("travels:gallery"),
+            reverse("travels:travel_gallery", args=[past]),
+            reverse("travels:contact"),
+        ]
+
+    def start_server(self, name, workers, port):
+        command = [
+            sys.executable, "-m", "gunicorn", *SERVERS[name],
+            "--workers", str(workers),
+            "--bind", f"127.0.0.1:{port}",
+            "--log-level", "warning",
+        ]
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"The {name} server exited with {server.returncode}.")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f"The {name} server did not start listening on port {port}.")
+
+    def run_load(self, port, paths, concurrency, duration, cold):
+        """
+        Request ``paths`` round-robin from ``concurrency`` threads, each on its
+        own keep-alive connection, for ``duration`` seconds.
+        """
+        timings = []
+        errors = []
+        counter = itertools.count()
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def client(offset):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            local_timings = []
+            local_errors = 0
+            for path in itertools.islice(itertools.cycle(paths), offset, None):
+                if time.monotonic() >= deadline:
+                    break
+                if cold:
+                    path = f"{path}?load={next(counter)}"
+                started = time.perf_counter()
+                try:
+                    connection.request("GET", path)
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    local_errors += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                    continue
+                local_timings.append(time.perf_counter() - started)
+                if response.status >= 400:
+                    local_errors += 1
+            connection.close()
+            with lock:
+                timings.extend(local_timings)
+                errors.append(local_errors)
+
+        threads = [threading.Thread(target=client, args=(number,)) for number in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return timings, sum(errors), time.perf_counter() - started
+
+    def summarize(self, timings, errors, elapsed):
+        if not timings:
+            raise CommandError("No request completed.")
+        timings.sort()
+        quantiles = statistics.quantiles(timings, n=100)
+        return {
+            "requests": len(timings),
+            "rps": len(timings) / elapsed,
+            "p50_ms": quantiles[49] * 1000,
+            "p95_ms": quantiles[94] * 1000,
+            "p99_ms": quantiles[98] * 1000,
+            "errors": errors,
+        }
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or self.get_paths()
+        self.stdout.write(
+            f"{options['workers']} worker(s), {options['concurrency']} clients, "
+            f"{options['duration']:g}s per server, {len(paths)} path(s)"
+            + (", page cache bypassed" if options["cold"] else "")
+        )
+        results = {}
+        for name in options["servers"]:
+            server = self.start_server(name, options["workers"], options["port"])
+            try:
+                self.run_load(options["port"], paths, options["concurrency"], options["warmup"], options["cold"])
+                results[name] = self.summarize(
+                    *self.run_load(options["port"], paths, options["concurrency"], options["duration"], options["cold"])
+                )
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+        self.stdout.write(
+            f"  {'server':<8} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"  {name:<8} {result['requests']:9d} {result['rps']:9.1f} {result['p50_ms']:8.1f} "
+                f"{result['p95_ms']:8.1f} {result['p99_ms']:8.1f} {result['errors']:7d}"
+            )
+        if len(results) == 2:
+            self.stdout.write(self.style.SUCCESS(
+                f"  async/sync throughput: {results['async']['rps'] / results['sync']['rps']:.2f}x"
+            ))
+        if any(result["errors"] for result in results.values()):
+            raise CommandError("Some requests failed.")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.travel import views  # noqa: F401  Registers the cached routes.
+from apps.travel.cache import page_cache
+
+
+class Command(BaseCommand):
+    help = "Show the hit ratio and rendering time saved by the page cache, per route."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'route':<16} {'hits':>8} {'misses':>8} {'ratio':>7} {'saved':>10}")
+        for route, stats in page_cache.stats().items():
+            self.stdout.write(
+                f"{route:<16} {stats['hits']:>8} {stats['misses']:>8} "
+                f"{stats['hit_ratio']:>7.1%} {stats['saved_ms'] / 1000:>9.1f}s"
+            )
+        if options["reset"]:
+            page_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
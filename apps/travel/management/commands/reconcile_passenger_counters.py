@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from apps.travel.models import Travel
+
+
+class Command(BaseCommand):
+    help = "Recompute Travel.confirmed_passengers for travels whose counter drifted from the reservations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the drifted travels without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = list(
+                Travel.objects.with_availability(live=True).exclude(
+                    confirmed_passengers=F("passengers_count")
+                ).values_list("pk", "name", "confirmed_passengers", "passengers_count")
+            )
+            for pk, name, stored, actual in drifted:
+                self.stdout.write(f"{pk} {name}: stored {stored}, actual {actual}")
+
+            if drifted and not options["dry_run"]:
+                Travel.objects.filter(
+                    pk__in=[pk for pk, *_ in drifted]
+                ).refresh_confirmed_passengers()
+
+        action = "Found" if options["dry_run"] else "Reconciled"
+        self.stdout.write(self.style.SUCCESS(f"{action} {len(drifted)} drifted travel(s)."))
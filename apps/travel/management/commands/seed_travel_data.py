@@ -0,0 +1,177 @@
+import datetime
+import itertools
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.travel.models import (
+    Passenger,
+    Portal,
+    Reservation,
+    SocialMediaAccount,
+    Travel,
+    TravelDestination,
+    TravelImage,
+)
+
+COVER_IMAGES = (
+    "travel/travels/francia.jpeg",
+    "travel/travels/guatemala.jpeg",
+    "travel/travels/suiza.jpg",
+    "travel/travels/tikal.jpeg",
+)
+DESTINATION_IMAGES = (
+    "travel/travel_destinations/antigua.jpeg",
+    "travel/travel_destinations/france.jpeg",
+    "travel/travel_destinations/spain.jpeg",
+    "travel/travel_destinations/tikal.jpeg",
+)
+TRAVEL_IMAGES = (
+    "travel/travel_images/amatitlan.jpeg",
+    "travel/travel_images/antigua.jpeg",
+    "travel/travel_images/semuc.jpeg",
+    "travel/travel_images/tikal.jpeg",
+)
+PLACES = ("Antigua", "Tikal", "Semuc Champey", "París", "Madrid", "Zúrich", "Atitlán", "Roma")
+# Travels and reservations of the benchmark datasets.
+SCALES = {
+    "1k": (1000, 10000),
+    "10k": (10000, 100000),
+    "100k": (100000, 1000000),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a deterministic dataset of travels, destinations, images, passengers and "
+        "reservations for benchmarks. Rows are appended, run it on an empty database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", choices=SCALES, default="1k", help="Dataset size, --travels and --reservations override it."
+        )
+        parser.add_argument("--travels", type=int, help="Number of travels.")
+        parser.add_argument("--reservations", type=int, help="Number of reservations.")
+        parser.add_argument("--images", type=int, default=3, help="Images per travel.")
+        parser.add_argument("--destinations", type=int, default=2, help="Destinations per travel.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT.")
+
+    def insert(self, manager, objs, batch_size):
+        """``bulk_create`` ``objs`` a batch at a time, never holding all of them in memory."""
+        objs = iter(objs)
+        while batch := list(itertools.islice(objs, batch_size)):
+            manager.bulk_create(batch)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        default_travels, default_reservations = SCALES[options["scale"]]
+        travels_total = options["travels"] if options["travels"] is not None else default_travels
+        reservations_total = (
+            options["reservations"] if options["reservations"] is not None else default_reservations
+        )
+        today = datetime.date.today()
+
+        with transaction.atomic():
+            if not Portal.objects.filter(is_active=True).exists():
+                portal = Portal.objects.create(
+                    name="Mujeres Viajeras por el Mundo",
+                    address="Ciudad de Guatemala",
+                    email="info@example.com",
+                    mobile_phone="00000000",
+                )
+                SocialMediaAccount.objects.create(portal=portal, name="facebook", url="https://facebook.com")
+
+            travels = []
+            for index in range(travels_total):
+                # Spread travels over the last ten years and the next two.
+                start_date = today + datetime.timedelta(days=rng.randint(-3650, 730))
+                place = rng.choice(PLACES)
+                travels.append(Travel(
+                    name=f"{place} {index}",
+                    highlight_feature=rng.choice(("", "Todo incluido", "Cupos limitados")),
+                    start_date=start_date,
+                    end_date=start_date + datetime.timedelta(days=rng.randint(2, 15)),
+                    all_inclusive=rng.random() < 0.3,
+                    cancelled=rng.random() < 0.05,
+                    max_passengers=rng.randint(10, 200),
+                    description=f"Viaje a {place}.",
+                    cover_image=rng.choice(COVER_IMAGES),
+                    inclusions=["Transporte", "Hospedaje"],
+                    restrictions=["Pasaporte vigente"],
+                ))
+            travels = Travel.objects.bulk_create(travels, batch_size=batch_size)
+            self.stdout.write(f"Created {len(travels)} travels.")
+
+            self.insert(
+                TravelImage.objects,
+                (
+                    TravelImage(
+                        travel=travel,
+                        image=rng.choice(TRAVEL_IMAGES),
+                        is_gallery_image=rng.random() < 0.5,
+                    )
+                    for travel in travels
+                    for _ in range(options["images"])
+                ),
+                batch_size=batch_size,
+            )
+            self.insert(
+                TravelDestination.objects,
+                (
+                    TravelDestination(
+                        travel=travel,
+                        name=rng.choice(PLACES),
+                        start_date=travel.start_date,
+                        end_date=travel.end_date,
+                        image=rng.choice(DESTINATION_IMAGES),
+                        description="Destino del viaje.",
+                    )
+                    for travel in travels
+                    for _ in range(options["destinations"])
+                ),
+                batch_size=batch_size,
+            )
+            # Bulk inserts skip the signals that maintain the search document.
+            Travel.objects.filter(pk__in=[travel.pk for travel in travels]).refresh_search_vector()
+
+            # Reservation i books passenger i // travels on travel i % travels,
+            # which keeps every (travel, passenger) pair unique.
+            passengers_total = -(-reservations_total // max(travels_total, 1))
+            passengers = Passenger.objects.bulk_create(
+                (
+                    Passenger(
+                        first_name=f"Pasajera{index}",
+                        last_name=rng.choice(("López", "García", "Pérez", "Méndez")),
+                        phone=f"{rng.randint(30000000, 59999999)}",
+                        email=f"pasajera{index}@example.com",
+                    )
+                    for index in range(passengers_total)
+                ),
+                batch_size=batch_size,
+            )
+            self.stdout.write(f"Created {len(passengers)} passengers.")
+
+            # The base manager skips the per-batch counter refresh; the counters
+            # are recomputed once below.
+            self.insert(
+                Reservation._base_manager,
+                (
+                    Reservation(
+                        travel=travels[index % travels_total],
+                        passenger=passengers[index // travels_total],
+                        booking_confirmed=rng.random() < 0.8,
+                        review=rng.choice(("", "", "¡Excelente viaje!", "Muy bien organizado.")),
+                        rating=rng.randint(0, 5),
+                    )
+                    for index in range(reservations_total)
+                ),
+                batch_size=batch_size,
+            )
+            Travel.objects.filter(pk__in=[travel.pk for travel in travels]).refresh_confirmed_passengers()
+            self.stdout.write(f"Created {reservations_total} reservations.")
+
+        self.stdout.write(self.style.SUCCESS("Seed data created."))
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.travel.models import Passenger, Reservation, Travel, TravelFullError
+from apps.travel.reservations import confirm_booking
+
+
+class Command(BaseCommand):
+    help = (
+        "Book more passengers than seats on a new travel from many threads at once, every passenger "
+        "twice, and check that the travel is not overbooked. The rows created are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seats", type=int, default=10, help="Seats of the travel.")
+        parser.add_argument("--passengers", type=int, default=100, help="Passengers trying to book.")
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent booking threads.")
+
+    def book(self, travel, passengers, barrier, outcomes):
+        try:
+            barrier.wait()
+            for passenger in passengers:
+                try:
+                    _, created = confirm_booking(travel, passenger)
+                    outcomes["booked" if created else "already booked"] += 1
+                except TravelFullError:
+                    outcomes["full"] += 1
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        start_date = timezone.now().date() + timedelta(days=365)
+        travel = Travel.objects.create(
+            name="Stress test", start_date=start_date, end_date=start_date, max_passengers=options["seats"],
+        )
+        passengers = Passenger.objects.bulk_create(
+            Passenger(first_name=f"Passenger {number}", last_name="Stress test")
+            for number in range(options["passengers"])
+        )
+        try:
+            # Every passenger is booked by two threads.
+            attempts = passengers + passengers[::-1]
+            threads_count = options["threads"]
+            barrier = threading.Barrier(threads_count)
+            outcomes = [Counter() for _ in range(threads_count)]
+            threads = [
+                threading.Thread(
+                    target=self.book, args=(travel, attempts[number::threads_count], barrier, outcomes[number])
+                )
+                for number in range(threads_count)
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            total = sum(outcomes, Counter())
+            travel.refresh_from_db()
+            confirmed = Reservation.objects.filter(travel=travel, booking_confirmed=True).count()
+            self.stdout.write(
+                f"{len(attempts)} booking attempts from {threads_count} threads in {elapsed:.2f}s: "
+                f"{total['booked']} booked, {total['already booked']} already booked, {total['full']} full"
+            )
+            self.stdout.write(
+                f"{travel.max_passengers} seats, {confirmed} confirmed reservations, counter "
+                f"{travel.confirmed_passengers}, is_capacity_full {travel.is_capacity_full}"
+            )
+            expected = min(options["seats"], options["passengers"])
+            if confirmed != expected or travel.confirmed_passengers != confirmed or total["booked"] != confirmed:
+                raise CommandError(f"Expected {expected} confirmed reservations.")
+            self.stdout.write(self.style.SUCCESS("No overbooking."))
+        finally:
+            Reservation.all_objects.filter(travel=travel).hard_delete()
+            Travel.all_objects.filter(pk=travel.pk).hard_delete()
+            Passenger.all_objects.filter(pk__in=[passenger.pk for passenger in passengers]).hard_delete()
@@ -0,0 +1,338 @@
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    Func,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, ExtractYear, Greatest, Now
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+
+from apps.general.managers import SoftDeleteQuerySet
+from apps.travel.signals import reservations_changed
+from mvm.utils.subqueries import SubqueryCount
+
+
+def confirmed_passengers_subquery():
+    """Correlated count of the confirmed reservations of the outer travel."""
+    reservation_model = apps.get_model("travel", "Reservation")
+    return SubqueryCount(
+        reservation_model.objects.filter(
+            travel=OuterRef("pk"),
+            booking_confirmed=True,
+        ).values("pk")
+    )
+
+
+def capacity_full_expression():
+    """Whether the confirmed reservations of the outer travel fill its ``max_passengers``."""
+    return Case(
+        When(GreaterThanOrEqual(confirmed_passengers_subquery(), F("max_passengers")), then=Value(True)),
+        default=Value(False),
+    )
+
+
+def latest_related_update_subquery(model_name):
+    """Latest ``updated_at`` of the live ``model_name`` rows of the outer travel."""
+    related_model = apps.get_model("travel", model_name)
+    return Subquery(
+        related_model.objects.filter(
+            travel=OuterRef("pk"),
+        ).order_by().values("travel").annotate(latest=Max("updated_at")).values("latest")
+    )
+
+
+def related_count_subquery(model_name):
+    """Correlated count of the live ``model_name`` rows of the outer travel."""
+    related_model = apps.get_model("travel", model_name)
+    return SubqueryCount(related_model.objects.filter(travel=OuterRef("pk")).values("pk"))
+
+
+def destinations_text_subquery(field):
+    """Text of ``field`` of every live destination of the outer travel, space separated."""
+    destination_model = apps.get_model("travel", "TravelDestination")
+    return Coalesce(
+        Subquery(
+            destination_model._base_manager.filter(
+                travel=OuterRef("pk"),
+                deleted_at__isnull=True,
+            ).order_by().values("travel").annotate(text=StringAgg(field, " ")).values("text")
+        ),
+        Value(""),
+        output_field=TextField(),
+    )
+
+
+def travel_search_vector():
+    """
+    Weighted search document of a travel.
+
+    A: name. B: highlight and destination names. C: description.
+    D: inclusions, restrictions and destination descriptions.
+    """
+    def vector(expression, weight):
+        return SearchVector(expression, weight=weight, config=settings.SEARCH_CONFIG)
+
+    def array_text(field):
+        return Func(F(field), Value(" "), function="array_to_string", output_field=TextField())
+
+    return (
+        vector("name", "A")
+        + vector("highlight_feature", "B")
+        + vector(destinations_text_subquery("name"), "B")
+        + vector("description", "C")
+        + vector(array_text("inclusions"), "D")
+        + vector(array_text("restrictions"), "D")
+        + vector(destinations_text_subquery("description"), "D")
+    )
+
+
+class TravelQuerySet(SoftDeleteQuerySet):
+    """
+    QuerySet for the Travel model.
+    """
+
+    def for_portal(self, portal_id):
+        """
+        Travels shown on the portal ``portal_id``: its own and those without a portal.
+        """
+        if portal_id is None:
+            return self
+        return self.filter(Q(portal=portal_id) | Q(portal__isnull=True))
+
+    def upcoming(self):
+        """
+        Active, not cancelled travels that have not started yet.
+        """
+        return self.filter(
+            cancelled=False,
+            is_active=True,
+            start_date__gt=timezone.now()
+        )
+
+    def past_for_gallery(self):
+        """
+        Not cancelled travels that already ended, shown in the gallery.
+        """
+        return self.filter(
+            cancelled=False,
+            end_date__lt=timezone.now()
+        )
+
+    def with_year(self):
+        """
+        Annotate the ``year`` of the start date.
+        """
+        return self.annotate(
+            year=ExpressionWrapper(ExtractYear("start_date"), output_field=IntegerField())
+        )
+
+    def with_content_state(self):
+        """
+        Annotate what the travel pages are rendered from: ``content_updated_at``,
+        the latest ``updated_at`` of the travel, its images and its destinations,
+        and the ``image_count`` and ``destination_count``.
+        """
+        return self.annotate(
+            content_updated_at=Greatest(
+                "updated_at",
+                latest_related_update_subquery("TravelImage"),
+                latest_related_update_subquery("TravelDestination"),
+            ),
+            image_count=related_count_subquery("TravelImage"),
+            destination_count=related_count_subquery("TravelDestination"),
+        )
+
+    def with_availability(self, live=False):
+        """
+        Annotate ``passengers_count`` and ``available_seats``.
+
+        By default both are read from the persisted ``confirmed_passengers``
+        counter. With ``live=True`` the confirmed reservations are counted with
+        a single grouped LEFT JOIN instead of one correlated subquery per row.
+        """
+        if live:
+            passengers_count = Count(
+                "reservation_travel",
+                filter=Q(
+                    reservation_travel__booking_confirmed=True,
+                    reservation_travel__deleted_at__isnull=True,
+                ),
+            )
+        else:
+            passengers_count = F("confirmed_passengers")
+        return self.annotate(
+            passengers_count=passengers_count,
+            available_seats=ExpressionWrapper(
+                F("max_passengers") - F("passengers_count"),
+                output_field=IntegerField(),
+            ),
+        )
+
+    def public(self):
+        """
+        Travels with a public page: upcoming ones and those shown in the gallery.
+        """
+        now = timezone.now()
+        return self.filter(
+            Q(is_active=True, start_date__gt=now) | Q(end_date__lt=now),
+            cancelled=False,
+        )
+
+    def matching(self, text):
+        """
+        Full-text match of ``text`` on ``search_vector``, best ``rank`` first.
+
+        Words are stemmed in Spanish and accents ignored; quotes, ``or`` and
+        ``-word`` work as in web search engines.
+        """
+        query = SearchQuery(text, config=settings.SEARCH_CONFIG, search_type="websearch")
+        return self.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query),
+        ).order_by("-rank", "-start_date")
+
+    def similar(self, text):
+        """
+        Travels whose name contains a word close to ``text``, for typos.
+        """
+        return self.filter(name__trigram_word_similar=text).annotate(
+            rank=TrigramWordSimilarity(text, "name"),
+        ).order_by("-rank", "-start_date")
+
+    def search(self, text):
+        """
+        ``matching(text)``, or ``similar(text)`` when no travel matches.
+
+        Runs one EXISTS query to choose between them.
+        """
+        matches = self.matching(text)
+        if matches.exists():
+            return matches
+        return self.similar(text)
+
+    def refresh_search_vector(self):
+        """
+        Recompute ``search_vector`` of the selected travels in a single UPDATE.
+        """
+        return self.update(search_vector=travel_search_vector())
+
+    def refresh_confirmed_passengers(self):
+        """
+        Recompute ``confirmed_passengers`` of the selected travels in a single UPDATE.
+
+        Only travels whose count or ``is_capacity_full`` changed are written,
+        and their ``updated_at`` is bumped so the HTTP validators of their pages
+        change too. ``is_capacity_full`` is set exactly while the confirmed
+        passengers fill ``max_passengers``, so freed seats reopen the travel.
+        """
+        return self.annotate(
+            actual_passengers=confirmed_passengers_subquery(),
+            actual_capacity_full=capacity_full_expression(),
+        ).exclude(
+            confirmed_passengers=F("actual_passengers"),
+            is_capacity_full=F("actual_capacity_full"),
+        ).update(
+            confirmed_passengers=confirmed_passengers_subquery(),
+            is_capacity_full=capacity_full_expression(),
+            updated_at=Now(),
+        )
+
+    def take_seat(self):
+        """
+        Count one more confirmed passenger on the selected travels that have a
+        free seat, in a single conditional UPDATE. Return how many travels had one.
+
+        Concurrent bookings of a travel queue on its row lock and check the
+        capacity again once the previous one commits, so a travel is never
+        overbooked. The booking that takes the last seat sets ``is_capacity_full``.
+        """
+        return self.filter(
+            is_capacity_full=False,
+            confirmed_passengers__lt=F("max_passengers"),
+        ).update(
+            confirmed_passengers=F("confirmed_passengers") + 1,
+            is_capacity_full=Case(
+                When(confirmed_passengers__gte=F("max_passengers") - 1, then=Value(True)),
+                default=Value(False),
+            ),
+            updated_at=Now(),
+        )
+
+
+class ReservationQuerySet(SoftDeleteQuerySet):
+    """
+    QuerySet for the Reservation model.
+
+    Bulk writes do not send model signals, so they send ``reservations_changed``
+    themselves inside the same transaction as the write. They lock the travels
+    they touch like ``take_seat`` does and raise ``TravelFullError`` instead of
+    confirming more passengers than a travel has seats.
+    """
+
+    def _notify(self, travel_ids):
+        reservations_changed.send(sender=self.model, travel_ids=set(travel_ids))
+
+    @contextmanager
+    def _writing(self, travel_ids):
+        """
+        Lock the travels ``travel_ids`` for the write, then recount their
+        passengers and refuse the write if it overbooks one of them.
+        """
+        from apps.travel.models import TravelFullError
+
+        travel_model = apps.get_model("travel", "Travel")
+        travels = travel_model._base_manager.using(self.db).filter(pk__in=travel_ids)
+        with transaction.atomic(using=self.db):
+            confirmed_before = dict(
+                travels.select_for_update().order_by("pk").values_list("pk", "confirmed_passengers")
+            )
+            yield
+            self._notify(travel_ids)
+            for travel in travels.filter(confirmed_passengers__gt=F("max_passengers")):
+                if travel.confirmed_passengers > confirmed_before[travel.pk]:
+                    raise TravelFullError(travel)
+
+    def update(self, **kwargs):
+        travel_ids = set(self.values_list("travel_id", flat=True).distinct())
+        new_travel = kwargs.get("travel", kwargs.get("travel_id"))
+        if new_travel is not None:
+            travel_ids.add(getattr(new_travel, "pk", new_travel))
+        with self._writing(travel_ids):
+            return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with self._writing({obj.travel_id for obj in objs}):
+            return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        travel_ids = {obj.travel_id for obj in objs}
+        if "travel" in fields or "travel_id" in fields:
+            travel_ids.update(
+                self.model._base_manager.using(self.db).filter(
+                    pk__in=[obj.pk for obj in objs]
+                ).values_list("travel_id", flat=True)
+            )
+        with self._writing(travel_ids):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+    bulk_update.alters_data = True
@@ -0,0 +1,134 @@
+"""
+Passenger manifests of travels, streamed as CSV, JSON or a zip of CSV files.
+
+Reservations are read through a server-side cursor and written out as they
+arrive, so memory does not grow with the manifest. The CSV columns are the
+ones ``apps.travel.imports`` reads, a manifest can be imported again.
+"""
+import csv
+import json
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.text import slugify
+
+from apps.travel.imports import PASSENGER_COLUMNS
+from apps.travel.models import Reservation
+
+MANIFEST_COLUMNS = (*PASSENGER_COLUMNS, "travel", "booking_confirmed")
+MANIFEST_FIELDS = (
+    "passenger__first_name",
+    "passenger__last_name",
+    "passenger__email",
+    "passenger__phone",
+    "travel__uuid",
+    "booking_confirmed",
+)
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+    "zip": "application/zip",
+}
+
+
+def manifest_rows(travel):
+    """Manifest rows of ``travel``, in ``MANIFEST_COLUMNS`` order, by passenger name."""
+    return Reservation.objects.filter(travel=travel).order_by(
+        "passenger__last_name", "passenger__first_name", "pk"
+    ).values_list(*MANIFEST_FIELDS).iterator(chunk_size=CHUNK_SIZE)
+
+
+def manifest_filename(travel, extension):
+    return f"{travel.start_date:%Y-%m-%d}-{slugify(travel.name)}-{travel.pk}.{extension}"
+
+
+def buffered(chunks, size=BUFFER_SIZE):
+    """Join small ``chunks`` of text into pieces of about ``size`` characters."""
+    pending, length = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(pending)
+            pending, length = [], 0
+    if pending:
+        yield "".join(pending)
+
+
+class _Echo:
+    """File-like object whose ``write`` returns what it was given, for ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(travel):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(MANIFEST_COLUMNS)
+    for row in manifest_rows(travel):
+        yield writer.writerow(row)
+
+
+def json_chunks(travel):
+    header = {"uuid": travel.uuid, "name": travel.name, "start_date": travel.start_date}
+    yield f'{{"travel": {json.dumps(header, cls=DjangoJSONEncoder)}, "passengers": ['
+    separator = ""
+    for row in manifest_rows(travel):
+        yield separator + json.dumps(dict(zip(MANIFEST_COLUMNS, row)), cls=DjangoJSONEncoder)
+        separator = ", "
+    yield "]}"
+
+
+class _ZipBuffer:
+    """
+    Unseekable output of a ``ZipFile``, drained after every write. ``zipfile``
+    writes each entry with a data descriptor when it cannot seek back.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        if self.chunks:
+            yield b"".join(self.chunks)
+            self.chunks = []
+
+
+def zip_chunks(travels):
+    """Zip archive with the CSV manifest of every travel, built while it is sent."""
+    buffer = _ZipBuffer()
+    with ZipFile(buffer, "w", ZIP_DEFLATED) as archive:
+        for travel in travels:
+            with archive.open(manifest_filename(travel, "csv"), "w") as entry:
+                for chunk in buffered(csv_lines(travel)):
+                    entry.write(chunk.encode())
+                    yield from buffer.drain()
+            yield from buffer.drain()
+    yield from buffer.drain()
+
+
+def _streaming_response(chunks, extension, filename):
+    response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[extension])
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def manifest_response(travel, extension="csv"):
+    """Streaming download of the ``csv`` or ``json`` manifest of ``travel``."""
+    chunks = csv_lines(travel) if extension == "csv" else json_chunks(travel)
+    return _streaming_response(buffered(chunks), extension, manifest_filename(travel, extension))
+
+
+def manifests_zip_response(travels):
+    """Streaming download of a zip with the CSV manifests of ``travels``."""
+    return _streaming_response(zip_chunks(travels), "zip", "manifests.zip")
@@ -0,0 +1,31 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from apps.travel.utils import get_request_portal
+
+
+class PortalMiddleware:
+    """
+    Resolves the portal of the request host into ``request.portal``.
+
+    ``request.portal`` is the cached portal context, with the portal ``id``,
+    its contact details and social media accounts. Views and validators read
+    it instead of querying the portal again. Contexts are kept in memory by
+    host and dropped whenever a portal changes.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.portal = get_request_portal(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        request.portal = await sync_to_async(get_request_portal)(request)
+        return await self.get_response(request)
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-18 18:46
+
+from django.db import migrations, models
+from django.db.models import OuterRef
+
+from mvm.utils.subqueries import SubqueryCount
+
+
+def backfill_confirmed_passengers(apps, schema_editor):
+    Travel = apps.get_model("travel", "Travel")
+    Reservation = apps.get_model("travel", "Reservation")
+    Travel.objects.update(
+        confirmed_passengers=SubqueryCount(
+            Reservation.objects.filter(travel=OuterRef("pk"), booking_confirmed=True).values("pk")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0015_alter_travel_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='travel',
+            name='confirmed_passengers',
+            field=models.PositiveIntegerField(db_column='confirmed_passengers', default=0, editable=False, help_text='Confirmed passengers', verbose_name='Confirmed passengers'),
+        ),
+        migrations.RunPython(backfill_confirmed_passengers, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='travel',
+            name='is_travel_full',
+            field=models.GeneratedField(db_column='is_travel_full', db_persist=True, expression=models.Case(models.When(models.Q(('confirmed_passengers__gte', models.F('max_passengers')), ('is_capacity_full', True), _connector='OR'), then=models.Value(True)), default=models.Value(False)), help_text='Is travel full', output_field=models.BooleanField(), verbose_name='Is travel full'),
+        ),
+    ]
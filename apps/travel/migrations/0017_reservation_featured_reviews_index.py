@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0016_travel_confirmed_passengers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('review', ''), _negated=True), fields=['booking_confirmed', '-rating', '-updated_at'], name='reservation_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-18 18:59
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0017_reservation_featured_reviews_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactMessage',
+            fields=[
+                ('id', models.BigAutoField(db_column='id', editable=False, primary_key=True, serialize=False)),
+                ('uuid', models.UUIDField(db_column='uuid', db_index=True, default=uuid.uuid4, editable=False, unique=True, verbose_name='UUID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at', db_index=True, help_text='Created at', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='updated_at', help_text='Updated at', null=True, verbose_name='Updated at')),
+                ('deleted_at', models.DateTimeField(blank=True, db_column='deleted_at', help_text='Deleted at', null=True, verbose_name='Deleted at')),
+                ('name', models.CharField(blank=True, db_column='name', help_text='Name', max_length=255, verbose_name='Name')),
+                ('email', models.EmailField(blank=True, db_column='email', help_text='Email Address', max_length=255, verbose_name='Email Address')),
+                ('subject', models.CharField(blank=True, db_column='subject', help_text='Subject', max_length=255, verbose_name='Subject')),
+                ('message', models.TextField(blank=True, db_column='message', help_text='Message', verbose_name='Message')),
+                ('sent_at', models.DateTimeField(blank=True, db_column='sent_at', help_text='Sent at', null=True, verbose_name='Sent at')),
+                ('delivery_attempts', models.PositiveIntegerField(db_column='delivery_attempts', default=0, help_text='Delivery attempts', verbose_name='Delivery attempts')),
+                ('last_delivery_error', models.TextField(blank=True, db_column='last_delivery_error', help_text='Last delivery error', verbose_name='Last delivery error')),
+            ],
+            options={
+                'verbose_name': 'Contact message',
+                'verbose_name_plural': 'Contact messages',
+                'db_table': 'travel_contact_message',
+                'ordering': ['-id'],
+                'indexes': [models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['id'], name='contact_message_unsent_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:03
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the tables against writes.
+    atomic = False
+
+    dependencies = [
+        ('travel', '0018_contact_message'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('booking_confirmed', True)), fields=['travel'], name='reservation_confirmed_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False), ('is_active', True)), fields=['-start_date', '-id'], include=('updated_at',), name='travel_upcoming_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False)), fields=['-start_date', '-id'], include=('end_date',), name='travel_gallery_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False)), fields=['end_date'], include=('updated_at', 'id'), name='travel_ended_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travelimage',
+            index=models.Index(condition=models.Q(('is_gallery_image', True)), fields=['travel', '-id'], name='travel_image_gallery_idx'),
+        ),
+    ]
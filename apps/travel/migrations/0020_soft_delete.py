@@ -0,0 +1,82 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Rebuild the partial indexes without locking the tables against writes.
+    atomic = False
+
+    dependencies = [
+        ('travel', '0019_public_query_indexes'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='reservation',
+            name='reservation_featured_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='reservation',
+            name='reservation_confirmed_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='travel',
+            name='travel_upcoming_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='travel',
+            name='travel_gallery_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='travel',
+            name='travel_ended_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='travelimage',
+            name='travel_image_gallery_idx',
+        ),
+        # Outside a transaction, the partial constraint must exist before the
+        # unique_together it replaces is dropped, or a duplicate can slip in.
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('travel', 'passenger'), name='reservation_unique_travel_passenger'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reservation',
+            unique_together=set(),
+        ),
+        AddIndexConcurrently(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('booking_confirmed', True), ('deleted_at__isnull', True)), fields=['travel'], name='reservation_confirmed_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(models.Q(('review', ''), _negated=True), ('deleted_at__isnull', True)), fields=['booking_confirmed', '-rating', '-updated_at'], name='reservation_featured_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False), ('deleted_at__isnull', True), ('is_active', True)), fields=['-start_date', '-id'], include=('updated_at',), name='travel_upcoming_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False), ('deleted_at__isnull', True)), fields=['-start_date', '-id'], include=('end_date',), name='travel_gallery_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False), ('deleted_at__isnull', True)), fields=['end_date'], include=('updated_at', 'id'), name='travel_ended_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='traveldestination',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['travel', 'start_date'], name='travel_destination_alive_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travelimage',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['travel', '-id'], name='travel_image_alive_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travelimage',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_gallery_image', True)), fields=['travel', '-id'], name='travel_image_gallery_idx'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension, UnaccentExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_search_vector(apps, schema_editor):
+    # A frozen copy of apps.travel.managers.travel_search_vector(), as of this migration.
+    travel_model = apps.get_model("travel", "Travel")
+    destination_model = apps.get_model("travel", "TravelDestination")
+
+    def vector(expression, weight):
+        return SearchVector(expression, weight=weight, config="spanish_unaccent")
+
+    def array_text(field):
+        return models.Func(
+            models.F(field), models.Value(" "), function="array_to_string", output_field=models.TextField()
+        )
+
+    def destinations_text(field):
+        return Coalesce(
+            models.Subquery(
+                destination_model._base_manager.filter(
+                    travel=models.OuterRef("pk"),
+                    deleted_at__isnull=True,
+                ).order_by().values("travel").annotate(text=StringAgg(field, " ")).values("text")
+            ),
+            models.Value(""),
+            output_field=models.TextField(),
+        )
+
+    travel_model._base_manager.update(search_vector=(
+        vector("name", "A")
+        + vector("highlight_feature", "B")
+        + vector(destinations_text("name"), "B")
+        + vector("description", "C")
+        + vector(array_text("inclusions"), "D")
+        + vector(array_text("restrictions"), "D")
+        + vector(destinations_text("description"), "D")
+    ))
+
+
+class Migration(migrations.Migration):
+    # Build the search indexes without locking the travels against writes.
+    atomic = False
+
+    dependencies = [
+        ('travel', '0020_soft_delete'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        TrigramExtension(),
+        migrations.RunSQL(
+            sql=[
+                "CREATE TEXT SEARCH CONFIGURATION spanish_unaccent (COPY = spanish)",
+                "ALTER TEXT SEARCH CONFIGURATION spanish_unaccent "
+                "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem",
+            ],
+            reverse_sql="DROP TEXT SEARCH CONFIGURATION spanish_unaccent",
+        ),
+        migrations.AddField(
+            model_name='travel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(db_column='search_vector', editable=False, help_text='Search document', null=True, verbose_name='Search document'),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('deleted_at__isnull', True)), fields=['search_vector'], name='travel_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('name', name='gin_trgm_ops'), condition=models.Q(('deleted_at__isnull', True)), name='travel_name_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:56
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Rebuild the listing indexes without locking the travels against writes.
+    atomic = False
+
+    dependencies = [
+        ('travel', '0021_travel_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portal',
+            name='domain',
+            field=models.CharField(blank=True, db_column='domain', help_text='Host name the portal is served on, e.g. viajes.example.com. Unknown hosts get the first active portal.', max_length=255, null=True, unique=True, verbose_name='Domain'),
+        ),
+        migrations.AddField(
+            model_name='travel',
+            name='portal',
+            field=models.ForeignKey(blank=True, db_column='portal_id', help_text='Portal the travel is shown on. Travels without a portal are shown on every portal.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='travels', related_query_name='travel', to='travel.portal', verbose_name='Portal'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='travel',
+            name='travel_upcoming_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False), ('deleted_at__isnull', True), ('is_active', True)), fields=['-start_date', '-id'], include=('updated_at', 'portal'), name='travel_upcoming_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='travel',
+            name='travel_ended_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='travel',
+            index=models.Index(condition=models.Q(('cancelled', False), ('deleted_at__isnull', True)), fields=['end_date'], include=('updated_at', 'id', 'portal'), name='travel_ended_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.2 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0022_portal_routing'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='socialmediaaccount',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='portal',
+            name='domain',
+            field=models.CharField(blank=True, db_column='domain', help_text='Host name the portal is served on, e.g. viajes.example.com. Unknown hosts get the first active portal.', max_length=255, null=True, verbose_name='Domain'),
+        ),
+        migrations.AlterField(
+            model_name='portal',
+            name='name',
+            field=models.CharField(db_column='name', help_text='Name', max_length=255, verbose_name='Name'),
+        ),
+        migrations.AlterField(
+            model_name='socialmediaaccount',
+            name='name',
+            field=models.CharField(db_column='name', help_text='Name', max_length=255, verbose_name='Name'),
+        ),
+        migrations.AddConstraint(
+            model_name='portal',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('name',), name='portal_unique_name', violation_error_message='A portal with this name already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='portal',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('domain',), name='portal_unique_domain', violation_error_message='A portal is already served on this domain.'),
+        ),
+        migrations.AddConstraint(
+            model_name='socialmediaaccount',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('name',), name='social_media_account_unique_name', violation_error_message='A social media account with this name already exists.'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-18 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0023_soft_deleted_unique_names'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='socialmediaaccount',
+            name='social_media_account_unique_name',
+        ),
+        migrations.AddConstraint(
+            model_name='socialmediaaccount',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('portal', 'name'), name='social_media_account_unique_portal_name', violation_error_message='This portal already has a social media account with this name.'),
+        ),
+    ]
@@ -1,5 +1,8 @@
+from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import router, transaction
 from django.db.models import (
+    Case,
     CharField,
     EmailField,
     ImageField,
@@ -7,12 +10,25 @@ from django.db.models import (
     ForeignKey,
     CASCADE,
     DateField,
+    DateTimeField,
     BooleanField,
     PositiveIntegerField,
-    IntegerField
+    IntegerField,
+    Index,
+    PROTECT,
+    F,
+    GeneratedField,
+    Q,
+    UniqueConstraint,
+    Value,
+    When,
 )
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from spectrum.fields import ColorField
 from apps.travel.constants import TravelManagementConstants
+from apps.travel.managers import ReservationQuerySet, TravelQuerySet
+from apps.general.managers import SoftDeleteManager
 from apps.general.models import CommonInfo
 from django_better_admin_arrayfield.models.fields import ArrayField
 
@@ -28,9 +44,9 @@ class Portal(CommonInfo):
         mobile_phone (CharField): The mobile phone number of the portal.
         theme_color (ColorField): The theme color of the portal.
         is_active (BooleanField): Indicates if the portal is active.
+        domain (CharField): The host name the portal is served on.
     """
     name = CharField(
-        unique=True,
         verbose_name=TravelManagementConstants.NAME,
         help_text=TravelManagementConstants.NAME,
         db_column="name",
@@ -68,6 +84,19 @@ class Portal(CommonInfo):
         db_column="is_active",
         help_text=TravelManagementConstants.IS_ACTIVE,
     )
+    domain = CharField(
+        verbose_name=TravelManagementConstants.DOMAIN,
+        help_text=TravelManagementConstants.DOMAIN_HELP,
+        db_column="domain",
+        max_length=255,
+        null=True,
+        blank=True,
+    )
+
+    def save(self, *args, **kwargs):
+        # Host names are case-insensitive, requests are resolved on the lowercased host.
+        self.domain = (self.domain or "").strip().lower() or None
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name}"
@@ -81,6 +110,21 @@ class Portal(CommonInfo):
         verbose_name = TravelManagementConstants.PORTAL
         verbose_name_plural = TravelManagementConstants.PORTALS
         ordering = ["name"]
+        constraints = [
+            # Names and domains of soft deleted portals can be used again.
+            UniqueConstraint(
+                fields=["name"],
+                condition=Q(deleted_at__isnull=True),
+                name="portal_unique_name",
+                violation_error_message=TravelManagementConstants.PORTAL_NAME_TAKEN,
+            ),
+            UniqueConstraint(
+                fields=["domain"],
+                condition=Q(deleted_at__isnull=True),
+                name="portal_unique_domain",
+                violation_error_message=TravelManagementConstants.PORTAL_DOMAIN_TAKEN,
+            ),
+        ]
 
 
 class SocialMediaAccount(CommonInfo):
@@ -104,7 +148,6 @@ class SocialMediaAccount(CommonInfo):
         help_text=TravelManagementConstants.PORTAL,
     )
     name = CharField(
-        unique=True,
         verbose_name=TravelManagementConstants.NAME,
         help_text=TravelManagementConstants.NAME,
         db_column="name",
@@ -141,7 +184,15 @@ class SocialMediaAccount(CommonInfo):
         ordering = ["name"]
         verbose_name = TravelManagementConstants.SOCIAL_MEDIA_ACCOUNT
         verbose_name_plural = TravelManagementConstants.SOCIAL_MEDIA_ACCOUNTS
-        unique_together = [["name", "portal"]]
+        constraints = [
+            # One account per name and portal, the name of a soft deleted account can be used again.
+            UniqueConstraint(
+                fields=["portal", "name"],
+                condition=Q(deleted_at__isnull=True),
+                name="social_media_account_unique_portal_name",
+                violation_error_message=TravelManagementConstants.SOCIAL_MEDIA_ACCOUNT_NAME_TAKEN,
+            ),
+        ]
 
 
 class Travel(CommonInfo):
@@ -158,11 +209,28 @@ class Travel(CommonInfo):
         is_capacity_full (BooleanField): Indicates if the travel's capacity is full.
         cancelled (BooleanField): Indicates if the travel is cancelled.
         max_passengers (PositiveIntegerField): The maximum number of passengers for the travel.
+        confirmed_passengers (PositiveIntegerField): The number of confirmed reservations, kept in sync
+            by the reservations_changed signal.
+        is_travel_full (GeneratedField): Indicates if the travel is full, computed by the database.
         description (TextField): The description of the travel.
         cover_image (ImageField): The cover image of the travel.
         inclusions (ArrayField): The inclusions of the travel.
         restrictions (ArrayField): The restrictions of the travel.
+        search_vector (SearchVectorField): The weighted search document of the travel and its
+            destinations, kept in sync by the travel signals.
+        portal (ForeignKey): The portal the travel is shown on, every portal when empty.
     """
+    portal = ForeignKey(
+        Portal,
+        verbose_name=TravelManagementConstants.PORTAL,
+        db_column="portal_id",
+        on_delete=PROTECT,
+        related_name="travels",
+        related_query_name="travel",
+        null=True,
+        blank=True,
+        help_text=TravelManagementConstants.TRAVEL_PORTAL_HELP,
+    )
     name = CharField(
         verbose_name=TravelManagementConstants.NAME,
         help_text=TravelManagementConstants.NAME,
@@ -216,6 +284,27 @@ class Travel(CommonInfo):
         db_column="max_passengers",
         help_text=TravelManagementConstants.MAX_PASSENGERS,
     )
+    confirmed_passengers = PositiveIntegerField(
+        verbose_name=TravelManagementConstants.CONFIRMED_PASSENGERS,
+        default=0,
+        editable=False,
+        db_column="confirmed_passengers",
+        help_text=TravelManagementConstants.CONFIRMED_PASSENGERS,
+    )
+    is_travel_full = GeneratedField(
+        expression=Case(
+            When(
+                Q(confirmed_passengers__gte=F("max_passengers")) | Q(is_capacity_full=True),
+                then=Value(True),
+            ),
+            default=Value(False),
+        ),
+        output_field=BooleanField(),
+        db_persist=True,
+        verbose_name=TravelManagementConstants.IS_TRAVEL_FULL,
+        db_column="is_travel_full",
+        help_text=TravelManagementConstants.IS_TRAVEL_FULL,
+    )
     description = TextField(
         verbose_name=TravelManagementConstants.DESCRIPTION,
         help_text=TravelManagementConstants.DESCRIPTION,
@@ -260,6 +349,16 @@ class Travel(CommonInfo):
         help_text=TravelManagementConstants.URL_OF_THE_TRAVEL_IMAGES,
         blank=True,
     )
+    search_vector = SearchVectorField(
+        verbose_name=TravelManagementConstants.SEARCH_VECTOR,
+        help_text=TravelManagementConstants.SEARCH_VECTOR,
+        db_column="search_vector",
+        null=True,
+        editable=False,
+    )
+
+    objects = SoftDeleteManager.from_queryset(TravelQuerySet)()
+    all_objects = TravelQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.name}"
@@ -273,6 +372,43 @@ class Travel(CommonInfo):
         verbose_name = TravelManagementConstants.TRAVEL
         verbose_name_plural = TravelManagementConstants.TRAVELS
         ordering = ["-start_date"]
+        indexes = [
+            # Overview and travels listing: upcoming travels, newest first, seeked on
+            # (start_date, id). updated_at and portal let their HTTP validators scan
+            # the index only.
+            Index(
+                fields=["-start_date", "-id"],
+                include=["updated_at", "portal"],
+                condition=Q(cancelled=False, is_active=True, deleted_at__isnull=True),
+                name="travel_upcoming_idx",
+            ),
+            # Gallery listing: travels that already ended, newest first.
+            Index(
+                fields=["-start_date", "-id"],
+                include=["end_date"],
+                condition=Q(cancelled=False, deleted_at__isnull=True),
+                name="travel_gallery_idx",
+            ),
+            # Gallery HTTP validators: MAX(updated_at) and COUNT(id) of the ended travels.
+            Index(
+                fields=["end_date"],
+                include=["updated_at", "id", "portal"],
+                condition=Q(cancelled=False, deleted_at__isnull=True),
+                name="travel_ended_idx",
+            ),
+            # Full-text search.
+            GinIndex(
+                fields=["search_vector"],
+                condition=Q(deleted_at__isnull=True),
+                name="travel_search_idx",
+            ),
+            # Trigram fallback of the search, for typos in travel names.
+            GinIndex(
+                OpClass("name", name="gin_trgm_ops"),
+                condition=Q(deleted_at__isnull=True),
+                name="travel_name_trgm_idx",
+            ),
+        ]
 
 
 class TravelImage(CommonInfo):
@@ -311,6 +447,20 @@ class TravelImage(CommonInfo):
         verbose_name = TravelManagementConstants.TRAVEL
         verbose_name_plural = TravelManagementConstants.TRAVELS
         ordering = ["-id"]
+        indexes = [
+            # Travel detail page: the images of one travel.
+            Index(
+                fields=["travel", "-id"],
+                condition=Q(deleted_at__isnull=True),
+                name="travel_image_alive_idx",
+            ),
+            # Travel gallery page: the gallery images of one travel.
+            Index(
+                fields=["travel", "-id"],
+                condition=Q(is_gallery_image=True, deleted_at__isnull=True),
+                name="travel_image_gallery_idx",
+            ),
+        ]
 
 
 class TravelDestination(CommonInfo):
@@ -375,6 +525,14 @@ class TravelDestination(CommonInfo):
         verbose_name = TravelManagementConstants.TRAVEL_DESTINATION
         verbose_name_plural = TravelManagementConstants.TRAVEL_DESTINATIONS
         ordering = ["-start_date"]
+        indexes = [
+            # Travel detail page: the destinations of one travel by start date.
+            Index(
+                fields=["travel", "start_date"],
+                condition=Q(deleted_at__isnull=True),
+                name="travel_destination_alive_idx",
+            ),
+        ]
 
 
 class Passenger(CommonInfo):
@@ -437,6 +595,15 @@ class Passenger(CommonInfo):
         ordering = ["first_name", "last_name"]
 
 
+class TravelFullError(ValidationError):
+    """
+    Raised when a reservation is confirmed on a travel without free seats.
+    """
+
+    def __init__(self, travel):
+        super().__init__(TravelManagementConstants.TRAVEL_FULL, code="travel_full", params={"travel": travel})
+
+
 class Reservation(CommonInfo):
     """
     Represents a reservation for a travel.
@@ -485,6 +652,46 @@ class Reservation(CommonInfo):
         validators=[MinValueValidator(0), MaxValueValidator(5)],
     )
 
+    objects = SoftDeleteManager.from_queryset(ReservationQuerySet)()
+    all_objects = ReservationQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded travel so moving a reservation refreshes both counters.
+        instance._previous_travel_id = instance.__dict__.get("travel_id")
+        instance._previous_booking_confirmed = instance.__dict__.get("booking_confirmed")
+        return instance
+
+    def takes_seat(self):
+        """
+        Whether saving confirms a seat that is not counted yet: a new confirmed
+        reservation, a confirmation or a confirmed reservation moved to another travel.
+        """
+        if not self.booking_confirmed:
+            return False
+        if self._state.adding:
+            return True
+        return not (
+            getattr(self, "_previous_booking_confirmed", False)
+            and getattr(self, "_previous_travel_id", None) == self.travel_id
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Save the reservation, taking a seat of the travel when it confirms one.
+
+        Raise ``TravelFullError`` when the travel has no seat left; the seat
+        count and the reservation are written in the same transaction.
+        """
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using):
+            if self.takes_seat() and not Travel.objects.using(using).filter(pk=self.travel_id).take_seat():
+                raise TravelFullError(self.travel)
+            super().save(*args, **kwargs)
+        self._previous_travel_id = self.travel_id
+        self._previous_booking_confirmed = self.booking_confirmed
+
     def __str__(self):
         return f"{self.booking_confirmed}"
 
@@ -496,4 +703,110 @@ class Reservation(CommonInfo):
         db_table = "travel_reservation"
         verbose_name = TravelManagementConstants.RESERVATION
         verbose_name_plural = TravelManagementConstants.RESERVATIONS
-        unique_together = [["travel", "passenger"]]
+        constraints = [
+            # A passenger may book a travel again after a reservation was soft deleted.
+            UniqueConstraint(
+                fields=["travel", "passenger"],
+                condition=Q(deleted_at__isnull=True),
+                name="reservation_unique_travel_passenger",
+            ),
+        ]
+        indexes = [
+            # Confirmed passengers counter: the confirmed reservations of one travel.
+            Index(
+                fields=["travel"],
+                condition=Q(booking_confirmed=True, deleted_at__isnull=True),
+                name="reservation_confirmed_idx",
+            ),
+            # Overview testimonials: confirmed reservations with a review, best rated first.
+            Index(
+                fields=["booking_confirmed", "-rating", "-updated_at"],
+                condition=~Q(review="") & Q(deleted_at__isnull=True),
+                name="reservation_featured_idx",
+            ),
+        ]
+
+
+class ContactMessage(CommonInfo):
+    """
+    Represents a message sent through the contact form.
+
+    Messages are stored before they are emailed, so a failed delivery is
+    retried by the contact dispatcher instead of being lost.
+
+    Attributes:
+        name (CharField): The name of the sender.
+        email (EmailField): The email address of the sender.
+        subject (CharField): The subject of the message.
+        message (TextField): The body of the message.
+        sent_at (DateTimeField): When the message was emailed to the staff.
+        delivery_attempts (PositiveIntegerField): Failed attempts to email the message.
+        last_delivery_error (TextField): The error of the last failed attempt.
+    """
+    name = CharField(
+        verbose_name=TravelManagementConstants.NAME,
+        help_text=TravelManagementConstants.NAME,
+        db_column="name",
+        max_length=255,
+        blank=True,
+    )
+    email = EmailField(
+        verbose_name=TravelManagementConstants.EMAIL,
+        help_text=TravelManagementConstants.EMAIL,
+        db_column="email",
+        max_length=255,
+        blank=True,
+    )
+    subject = CharField(
+        verbose_name=TravelManagementConstants.SUBJECT,
+        help_text=TravelManagementConstants.SUBJECT,
+        db_column="subject",
+        max_length=255,
+        blank=True,
+    )
+    message = TextField(
+        verbose_name=TravelManagementConstants.MESSAGE,
+        help_text=TravelManagementConstants.MESSAGE,
+        db_column="message",
+        blank=True,
+    )
+    sent_at = DateTimeField(
+        verbose_name=TravelManagementConstants.SENT_AT,
+        help_text=TravelManagementConstants.SENT_AT,
+        db_column="sent_at",
+        null=True,
+        blank=True,
+    )
+    delivery_attempts = PositiveIntegerField(
+        verbose_name=TravelManagementConstants.DELIVERY_ATTEMPTS,
+        help_text=TravelManagementConstants.DELIVERY_ATTEMPTS,
+        db_column="delivery_attempts",
+        default=0,
+    )
+    last_delivery_error = TextField(
+        verbose_name=TravelManagementConstants.LAST_DELIVERY_ERROR,
+        help_text=TravelManagementConstants.LAST_DELIVERY_ERROR,
+        db_column="last_delivery_error",
+        blank=True,
+    )
+
+    def __str__(self):
+        return f"{self.subject}"
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}: ({self.subject})"
+
+    class Meta:
+        app_label = "travel"
+        db_table = "travel_contact_message"
+        verbose_name = TravelManagementConstants.CONTACT_MESSAGE
+        verbose_name_plural = TravelManagementConstants.CONTACT_MESSAGES
+        ordering = ["-id"]
+        indexes = [
+            # Contact dispatcher: undelivered messages, oldest first.
+            Index(
+                fields=["id"],
+                condition=Q(sent_at__isnull=True),
+                name="contact_message_unsent_idx",
+            ),
+        ]
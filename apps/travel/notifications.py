@@ -0,0 +1,122 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.general.jobs import enqueue, retry_delay
+from apps.general.models import Job
+from apps.travel.cache import contact_recipients_cache
+from apps.travel.models import ContactMessage
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_TASK = "travel.dispatch_contact_messages"
+
+
+def build_contact_recipients():
+    return list(
+        User.objects.filter(is_active=True).exclude(email="").values_list("email", flat=True)
+    )
+
+
+def get_contact_recipients():
+    """Emails of the staff notified of contact messages, cached until a user changes."""
+    return contact_recipients_cache.get_or_set("recipients", build_contact_recipients)
+
+
+def submit_contact_message(name, email, subject, message):
+    """
+    Store a contact form message and make sure a dispatch is scheduled.
+
+    The dispatch waits ``CONTACT_DISPATCH_DELAY`` seconds, so messages sent
+    close together are delivered by a single job over one SMTP connection.
+    """
+    contact_message = ContactMessage.objects.create(
+        name=(name or "")[:255],
+        email=(email or "")[:255],
+        subject=(subject or "")[:255],
+        message=message or "",
+    )
+    schedule_dispatch(settings.CONTACT_DISPATCH_DELAY)
+    return contact_message
+
+
+def schedule_dispatch(delay):
+    if not Job.objects.filter(task=DISPATCH_TASK, status=Job.PENDING).exists():
+        enqueue(DISPATCH_TASK, delay=delay)
+
+
+def build_email(contact_message, recipients):
+    body = (f"Nombre: {contact_message.name} \n\n"
+            f"Correo: {contact_message.email} \n\n"
+            f"Mensaje: {contact_message.message}")
+    return EmailMessage(
+        contact_message.subject,
+        body,
+        settings.EMAIL_HOST_USER,
+        recipients,
+        reply_to=[contact_message.email] if contact_message.email else None,
+    )
+
+
+def dispatch_contact_messages(batch_size=None):
+    """
+    Email every undelivered contact message over one SMTP connection.
+
+    Messages are locked in batches of ``batch_size`` so concurrent dispatchers
+    never send the same message. A message that fails is left undelivered and
+    a later dispatch is scheduled with backoff, until it reaches
+    ``CONTACT_MESSAGE_MAX_ATTEMPTS``.
+
+    Returns:
+        int: Number of messages delivered.
+    """
+    batch_size = batch_size or settings.CONTACT_DISPATCH_BATCH_SIZE
+    recipients = get_contact_recipients()
+    if not recipients:
+        return 0
+
+    delivered = 0
+    retry_attempts = []
+    last_id = 0
+    with get_connection(fail_silently=False) as connection:
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    ContactMessage.objects.filter(
+                        sent_at__isnull=True,
+                        delivery_attempts__lt=settings.CONTACT_MESSAGE_MAX_ATTEMPTS,
+                        id__gt=last_id,
+                    ).order_by("id").select_for_update(skip_locked=True)[:batch_size]
+                )
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                sent, failed = [], []
+                for contact_message in batch:
+                    try:
+                        connection.send_messages([build_email(contact_message, recipients)])
+                    except Exception as error:
+                        logger.warning("Could not email contact message %s", contact_message.pk, exc_info=True)
+                        contact_message.delivery_attempts += 1
+                        contact_message.last_delivery_error = repr(error)
+                        failed.append(contact_message)
+                    else:
+                        contact_message.sent_at = timezone.now()
+                        sent.append(contact_message)
+
+                ContactMessage.objects.bulk_update(sent, ["sent_at"])
+                ContactMessage.objects.bulk_update(failed, ["delivery_attempts", "last_delivery_error"])
+                delivered += len(sent)
+                retry_attempts += [
+                    contact_message.delivery_attempts for contact_message in failed
+                    if contact_message.delivery_attempts < settings.CONTACT_MESSAGE_MAX_ATTEMPTS
+                ]
+
+    if retry_attempts:
+        schedule_dispatch(retry_delay(min(retry_attempts)))
+    return delivered
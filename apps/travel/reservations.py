@@ -0,0 +1,41 @@
+"""
+Booking of travel seats.
+
+Every save of a reservation that confirms a seat takes it with
+``TravelQuerySet.take_seat()``, a conditional UPDATE of the travel counter
+in the same transaction, so concurrent confirmations from the admin or from
+``confirm_booking`` never overbook a travel.
+"""
+from django.db import IntegrityError, transaction
+
+from apps.travel.models import Reservation, TravelFullError
+
+
+def confirm_booking(travel, passenger, **fields):
+    """
+    Book ``passenger`` on ``travel`` with a confirmed reservation.
+
+    Booking the same passenger again, e.g. a retried request, confirms and
+    returns their reservation instead of taking a second seat; the unique
+    travel and passenger constraint settles concurrent attempts. Raise
+    ``TravelFullError`` when the travel has no seat left.
+
+    Return ``(reservation, created)``.
+    """
+    try:
+        with transaction.atomic():
+            reservation = Reservation.objects.create(
+                travel=travel, passenger=passenger, booking_confirmed=True, **fields
+            )
+            return reservation, True
+    except (IntegrityError, TravelFullError):
+        # Booked already, the last seat may be their own.
+        if not Reservation.objects.filter(travel=travel, passenger=passenger).exists():
+            raise
+
+    with transaction.atomic():
+        reservation = Reservation.objects.select_for_update().get(travel=travel, passenger=passenger)
+        if not reservation.booking_confirmed:
+            reservation.booking_confirmed = True
+            reservation.save(update_fields=["booking_confirmed", "updated_at"])
+    return reservation, False
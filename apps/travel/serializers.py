@@ -0,0 +1,72 @@
+from rest_framework import serializers
+
+from mvm.utils.api import MediaURLField, ValuesSerializer
+
+
+class SocialMediaAccountSerializer(serializers.Serializer):
+    name = serializers.CharField(read_only=True)
+    url = serializers.CharField(read_only=True)
+
+
+class PortalSerializer(ValuesSerializer):
+    """
+    Portal contact details, read from the cached portal context.
+    """
+    name = serializers.CharField(read_only=True)
+    address = serializers.CharField(read_only=True)
+    email = serializers.EmailField(read_only=True)
+    mobile_phone = serializers.CharField(read_only=True)
+    theme_color = serializers.CharField(read_only=True)
+    social_media_accounts = SocialMediaAccountSerializer(many=True, read_only=True)
+
+
+class TravelListSerializer(ValuesSerializer):
+    """
+    Upcoming travel as listed on the travels page.
+    """
+    uuid = serializers.UUIDField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    start_date = serializers.DateField(read_only=True)
+    end_date = serializers.DateField(read_only=True)
+    highlight_feature = serializers.CharField(read_only=True)
+    cover_image = MediaURLField()
+    all_inclusive = serializers.BooleanField(read_only=True)
+    is_travel_full = serializers.BooleanField(read_only=True)
+    available_seats = serializers.IntegerField(read_only=True)
+
+
+class TravelDestinationSerializer(serializers.Serializer):
+    name = serializers.CharField(read_only=True)
+    start_date = serializers.DateField(read_only=True)
+    end_date = serializers.DateField(read_only=True)
+    image = MediaURLField()
+    description = serializers.CharField(read_only=True)
+
+
+class TravelDetailSerializer(TravelListSerializer):
+    """
+    Upcoming travel with its description, images and destinations.
+    """
+    description = serializers.CharField(read_only=True)
+    inclusions = serializers.ListField(child=serializers.CharField(allow_null=True), read_only=True)
+    restrictions = serializers.ListField(child=serializers.CharField(allow_null=True), read_only=True)
+    travel_images = serializers.ListField(child=MediaURLField(), read_only=True)
+    travel_destinations = TravelDestinationSerializer(many=True, read_only=True)
+
+
+class GalleryListSerializer(ValuesSerializer):
+    """
+    Past travel as listed on the gallery page.
+    """
+    uuid = serializers.UUIDField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    start_date = serializers.DateField(read_only=True)
+    cover_image = MediaURLField()
+
+
+class GalleryDetailSerializer(GalleryListSerializer):
+    """
+    Past travel with its gallery images and external album URL.
+    """
+    url = serializers.CharField(read_only=True)
+    gallery_images = serializers.ListField(child=MediaURLField(), read_only=True)
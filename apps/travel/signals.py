@@ -0,0 +1,216 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import ImageField
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver, Signal
+
+from apps.travel.cache import (
+    contact_recipients_cache,
+    featured_reviews_cache,
+    LISTINGS_TAG,
+    page_cache,
+    PORTAL_TAG,
+    portal_context_cache,
+    REVIEWS_TAG,
+    travel_tag,
+)
+from apps.general.jobs import enqueue
+from apps.general.models import Job
+from apps.general.signals import soft_deleted
+from mvm.utils.images import has_renditions
+from mvm.utils.static_site import build_time
+
+# Sent inside the writing transaction whenever reservations are created,
+# updated or deleted, including bulk operations that skip model signals.
+# Arguments: travel_ids (set of Travel primary keys affected).
+reservations_changed = Signal()
+
+# Travel fields written into Travel.search_vector.
+SEARCHABLE_TRAVEL_FIELDS = {"name", "highlight_feature", "description", "inclusions", "restrictions"}
+
+
+def on_commit(callback):
+    """
+    Run the cache invalidation ``callback`` once the writing transaction commits.
+
+    Invalidating earlier lets a concurrent request cache the rows it still
+    sees before the COMMIT, and keep them until the cache expires. A failing
+    cache does not fail a write that is already committed.
+    """
+    transaction.on_commit(callback, robust=True)
+
+
+def schedule_static_site_build():
+    """
+    Schedule a rebuild of the static snapshot unless one is pending already.
+
+    Nothing is scheduled before the snapshot is built for the first time.
+    """
+    if build_time(settings.STATIC_SITE_ROOT) is None:
+        return
+    if not Job.objects.filter(task="travel.build_static_site", status=Job.PENDING).exists():
+        enqueue("travel.build_static_site", delay=settings.STATIC_SITE_BUILD_DELAY)
+
+
+def purge_pages(*tags):
+    """
+    Purge the cached pages tagged ``tags`` once the transaction commits, and
+    schedule a rebuild of the static snapshot, which serves the same pages.
+    """
+    on_commit(lambda: page_cache.purge(*tags))
+    schedule_static_site_build()
+
+
+@receiver(post_save, sender="travel.Portal")
+@receiver(post_delete, sender="travel.Portal")
+@receiver(soft_deleted, sender="travel.Portal")
+@receiver(post_save, sender="travel.SocialMediaAccount")
+@receiver(post_delete, sender="travel.SocialMediaAccount")
+@receiver(soft_deleted, sender="travel.SocialMediaAccount")
+def invalidate_portal_context(sender, **kwargs):
+    """Drop the cached portal context whenever a portal or one of its accounts changes."""
+    on_commit(portal_context_cache.invalidate)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_contact_recipients(sender, **kwargs):
+    """Contact messages are emailed to the users of the portal."""
+    on_commit(contact_recipients_cache.invalidate)
+
+
+@receiver(post_save, sender="travel.Travel")
+@receiver(post_save, sender="travel.TravelImage")
+@receiver(post_save, sender="travel.TravelDestination")
+@receiver(post_save, sender="travel.Passenger")
+def enqueue_image_renditions(sender, instance, **kwargs):
+    """Build the srcset renditions of new uploads in the background worker."""
+    if not settings.IMAGE_RENDITIONS_ENABLED:
+        return
+    names = [
+        getattr(instance, field.attname).name
+        for field in instance._meta.fields
+        if isinstance(field, ImageField) and getattr(instance, field.attname)
+    ]
+    names = [name for name in names if not has_renditions(name)]
+    if names:
+        enqueue("travel.generate_image_renditions", names=names)
+
+
+@receiver(post_save, sender="travel.Reservation")
+@receiver(post_delete, sender="travel.Reservation")
+def notify_reservation_change(sender, instance, **kwargs):
+    """Forward single reservation writes, including cascaded deletes, to reservations_changed."""
+    travel_ids = {instance.travel_id}
+    previous_travel_id = getattr(instance, "_previous_travel_id", None)
+    if previous_travel_id is not None:
+        travel_ids.add(previous_travel_id)
+    reservations_changed.send(sender=sender, travel_ids=travel_ids)
+
+
+@receiver(reservations_changed)
+def refresh_confirmed_passengers(sender, travel_ids, **kwargs):
+    """Keep Travel.confirmed_passengers in sync with the confirmed reservations."""
+    travel_model = apps.get_model("travel", "Travel")
+    travel_model.all_objects.filter(pk__in=travel_ids).refresh_confirmed_passengers()
+
+
+@receiver(post_save, sender="travel.Travel")
+def refresh_travel_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Keep Travel.search_vector in sync with the searchable fields of the travel."""
+    if update_fields is not None and not set(update_fields) & SEARCHABLE_TRAVEL_FIELDS:
+        return
+    sender.all_objects.filter(pk=instance.pk).refresh_search_vector()
+
+
+@receiver(post_save, sender="travel.TravelDestination")
+@receiver(post_delete, sender="travel.TravelDestination")
+def refresh_destination_search_vector(sender, instance, **kwargs):
+    """Destination names and descriptions are part of the search document of their travel."""
+    travel_model = apps.get_model("travel", "Travel")
+    travel_model.all_objects.filter(pk=instance.travel_id).refresh_search_vector()
+
+
+@receiver(soft_deleted, sender="travel.TravelDestination")
+def refresh_soft_deleted_destination_search_vector(sender, pks, **kwargs):
+    travel_model = apps.get_model("travel", "Travel")
+    travel_model.all_objects.filter(
+        pk__in=sender.all_objects.filter(pk__in=pks).values("travel_id")
+    ).refresh_search_vector()
+
+
+@receiver(reservations_changed)
+@receiver(post_save, sender="travel.Travel")
+@receiver(post_save, sender="travel.Passenger")
+@receiver(post_delete, sender="travel.Passenger")
+@receiver(soft_deleted, sender="travel.Passenger")
+def invalidate_featured_reviews(sender, **kwargs):
+    """
+    Reviews, ratings and reviewer names feed the overview testimonials, and
+    the portal of their travel decides which overview shows them.
+    """
+    on_commit(featured_reviews_cache.invalidate)
+
+
+@receiver(post_save, sender="travel.Portal")
+@receiver(post_delete, sender="travel.Portal")
+@receiver(soft_deleted, sender="travel.Portal")
+@receiver(post_save, sender="travel.SocialMediaAccount")
+@receiver(post_delete, sender="travel.SocialMediaAccount")
+@receiver(soft_deleted, sender="travel.SocialMediaAccount")
+def purge_all_pages(sender, **kwargs):
+    """Every public page renders the portal in its navbar and footer."""
+    purge_pages(PORTAL_TAG)
+
+
+@receiver(post_save, sender="travel.Travel")
+@receiver(post_delete, sender="travel.Travel")
+def purge_travel_pages(sender, instance, **kwargs):
+    tags = [travel_tag(instance.uuid), LISTINGS_TAG]
+    purge_pages(*tags)
+
+
+@receiver(soft_deleted, sender="travel.Travel")
+def purge_soft_deleted_travel_pages(sender, pks, **kwargs):
+    travel_uuids = sender.all_objects.filter(pk__in=pks).values_list("uuid", flat=True)
+    tags = [*[travel_tag(travel_uuid) for travel_uuid in travel_uuids], LISTINGS_TAG]
+    purge_pages(*tags)
+
+
+@receiver(post_save, sender="travel.TravelImage")
+@receiver(post_delete, sender="travel.TravelImage")
+@receiver(post_save, sender="travel.TravelDestination")
+@receiver(post_delete, sender="travel.TravelDestination")
+def purge_travel_detail_pages(sender, instance, **kwargs):
+    travel_model = apps.get_model("travel", "Travel")
+    travel_uuids = travel_model.all_objects.filter(pk=instance.travel_id).values_list("uuid", flat=True)
+    tags = [travel_tag(travel_uuid) for travel_uuid in travel_uuids]
+    purge_pages(*tags)
+
+
+@receiver(soft_deleted, sender="travel.TravelImage")
+@receiver(soft_deleted, sender="travel.TravelDestination")
+def purge_soft_deleted_travel_detail_pages(sender, pks, **kwargs):
+    travel_model = apps.get_model("travel", "Travel")
+    travel_uuids = travel_model.all_objects.filter(
+        pk__in=sender.all_objects.filter(pk__in=pks).values("travel_id")
+    ).values_list("uuid", flat=True)
+    tags = [travel_tag(travel_uuid) for travel_uuid in travel_uuids]
+    purge_pages(*tags)
+
+
+@receiver(reservations_changed)
+def purge_reservation_pages(sender, travel_ids, **kwargs):
+    """Reservations drive the availability shown on travel pages and the testimonials."""
+    travel_model = apps.get_model("travel", "Travel")
+    travel_uuids = travel_model.all_objects.filter(pk__in=travel_ids).values_list("uuid", flat=True)
+    tags = [*[travel_tag(travel_uuid) for travel_uuid in travel_uuids], LISTINGS_TAG, REVIEWS_TAG]
+    purge_pages(*tags)
+
+
+@receiver(post_save, sender="travel.Passenger")
+@receiver(post_delete, sender="travel.Passenger")
+@receiver(soft_deleted, sender="travel.Passenger")
+def purge_review_pages(sender, **kwargs):
+    purge_pages(REVIEWS_TAG)
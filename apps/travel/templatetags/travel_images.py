@@ -0,0 +1,17 @@
+from django import template
+
+from mvm.utils import images
+
+register = template.Library()
+
+
+@register.filter
+def rendition(url, width):
+    """URL of the ``width`` pixels wide rendition of a media URL."""
+    return images.rendition_url(images.name_from_url(url), width)
+
+
+@register.filter
+def srcset(url):
+    """``srcset`` candidates of a media URL, empty when renditions are disabled."""
+    return images.srcset(images.name_from_url(url))
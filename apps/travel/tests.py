@@ -1,3 +1,1353 @@
-from django.test import TestCase
+import base64
+import csv
+import json
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import Workbook
+from PIL import Image
+
+from apps.general.jobs import run_job
+from apps.general.models import Job
+from apps.general.worker import initialize_process
+from apps.travel.cache import contact_recipients_cache, featured_reviews_cache, portal_context_cache
+from apps.travel.constants import TravelManagementConstants
+from apps.travel.imports import PassengerImport, read_rows
+from apps.travel.management.commands.explain_views import seq_scans
+from apps.travel.models import (
+    ContactMessage,
+    Passenger,
+    Portal,
+    Reservation,
+    SocialMediaAccount,
+    Travel,
+    TravelDestination,
+    TravelFullError,
+    TravelImage,
+)
+from apps.travel.notifications import DISPATCH_TASK, dispatch_contact_messages, submit_contact_message
+from apps.travel.reservations import confirm_booking
+from apps.travel.utils import get_featured_reviews
+from apps.travel.views import TravelView
+from mvm.utils import images
+from mvm.utils.cache import TieredCache
+from mvm.utils.page_cache import TaggedPageCache
+from mvm.utils.pagination import EstimatedCountPaginator, InvalidCursor, KeysetPaginator
+from mvm.utils.static_site import STATIC_SITE_MIDDLEWARE, page_path, portal_root
+from mvm.utils.testing import QueryBudgetMixin
+
+
+class PublicPagesQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Query budgets of the public pages, rendered without any cache.
+    """
+    query_budgets = {
+        "travels:overview": 5,
+        "travels:my-travels": 5,
+        "travels:travel_details": (6, lambda test: [test.upcoming.uuid]),
+        "travels:gallery": 5,
+        "travels:travel_gallery": (5, lambda test: [test.past.uuid]),
+        "travels:contact": 2,
+        "api:portal": (2, lambda test: ["v1"]),
+        "api:travel-list": (4, lambda test: ["v1"]),
+        "api:travel-detail": (4, lambda test: ["v1", test.upcoming.uuid]),
+        "api:gallery-list": (4, lambda test: ["v1"]),
+        "api:gallery-detail": (4, lambda test: ["v1", test.past.uuid]),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        portal = Portal.objects.create(
+            name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678",
+        )
+        SocialMediaAccount.objects.create(portal=portal, name="facebook", url="https://facebook.com/mvm")
+
+        today = timezone.now().date()
+        travels = []
+        for number in range(6):
+            start_date = today + timedelta(days=(number - 3) * 30)
+            travel = Travel.objects.create(
+                name=f"Viaje {number}",
+                start_date=start_date,
+                end_date=start_date + timedelta(days=3),
+                max_passengers=10,
+                description="Descripción",
+                cover_image="travel/travels/cover.jpeg",
+            )
+            TravelImage.objects.create(travel=travel, image="travel/travel_images/image.jpeg", is_gallery_image=True)
+            TravelDestination.objects.create(
+                travel=travel, name="Tikal", start_date=start_date, end_date=start_date,
+                image="travel/travel_destinations/image.jpeg",
+            )
+            for seat in range(3):
+                passenger = Passenger.objects.create(first_name=f"Pasajero {number}{seat}", last_name="Prueba")
+                Reservation.objects.create(
+                    travel=travel, passenger=passenger, booking_confirmed=True, review="Excelente", rating=5,
+                )
+            travels.append(travel)
+        cls.past = travels[0]
+        cls.upcoming = travels[-1]
+
+    def prepare_route(self, name):
+        for cache in caches.all():
+            cache.clear()
+        for tiered_cache in (portal_context_cache, featured_reviews_cache, contact_recipients_cache):
+            tiered_cache.invalidate()
+
+    def test_public_pages_stay_within_query_budgets(self):
+        self.assertQueryBudgets()
+
+
+@override_settings(ROOT_URLCONF=settings.ASGI_URLCONF)
+class AsyncPublicPagesQueryBudgetTests(PublicPagesQueryBudgetTests):
+    """
+    Query budgets of the async versions of the public pages.
+    """
+    query_budgets = {
+        name: budget for name, budget in PublicPagesQueryBudgetTests.query_budgets.items()
+        if name.startswith("travels:")
+    }
+
+
+class TravelAdminQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    The travel changelist runs the same queries whatever the rows on the page.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser("admin@example.com", "secret")
+        start_date = timezone.now().date() + timedelta(days=30)
+        travels = [
+            Travel.objects.create(
+                name=f"Viaje {number}", start_date=start_date, end_date=start_date, max_passengers=10,
+            )
+            for number in range(25)
+        ]
+        passenger = Passenger.objects.create(first_name="Ana", last_name="Prueba")
+        for travel in travels[:3]:
+            confirm_booking(travel, passenger)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist_stays_within_query_budget(self):
+        url = reverse("admin:travel_travel_changelist")
+        # Session, user, count estimate, exact count of a small table and page.
+        self.assertQueryBudget(url, 5)
+        response = self.assertQueryBudget(url, 5, data={"o": "-6"})
+        self.assertEqual(
+            [travel.passengers_count for travel in response.context["cl"].result_list][:4], [1, 1, 1, 0]
+        )
+
+    def test_large_tables_are_counted_from_the_planner_estimate(self):
+        class EveryCountEstimated(EstimatedCountPaginator):
+            exact_count_limit = 0
+
+        paginator = EveryCountEstimated(Travel.objects.all(), 20)
+        with self.assertNumQueries(1) as queries:
+            self.assertIsInstance(paginator.count, int)
+        self.assertTrue(queries.captured_queries[0]["sql"].startswith("EXPLAIN"))
+
+        # Filters and searches are counted exactly.
+        paginator = EveryCountEstimated(Travel.objects.filter(name="Viaje 1"), 20)
+        with self.assertNumQueries(1) as queries:
+            self.assertEqual(paginator.count, 1)
+        self.assertFalse(queries.captured_queries[0]["sql"].startswith("EXPLAIN"))
+
+
+class FeaturedReviewsTests(TestCase):
+    """
+    The overview shows the best recent reviews, capped and cached.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        start_date = timezone.now().date()
+        cls.travel = Travel.objects.create(
+            name="Tikal", start_date=start_date, end_date=start_date, max_passengers=10,
+        )
+
+    def setUp(self):
+        featured_reviews_cache.invalidate()
+
+    def review(self, name, updated_days_ago=0, **fields):
+        passenger = Passenger.objects.create(first_name=name, last_name="Prueba")
+        fields = {"booking_confirmed": True, "review": "Excelente", "rating": 5, **fields}
+        reservation = Reservation.objects.create(travel=self.travel, passenger=passenger, **fields)
+        Reservation.objects.filter(pk=reservation.pk).update(
+            updated_at=timezone.now() - timedelta(days=updated_days_ago)
+        )
+        return reservation
+
+    def names(self):
+        return [review["full_name"] for review in get_featured_reviews()]
+
+    def test_reviews_are_ranked_by_rating_then_recency(self):
+        self.review("Antigua", updated_days_ago=10)
+        self.review("Reciente", updated_days_ago=1)
+        self.review("Regular", rating=3)
+        self.assertEqual(self.names(), ["Reciente Prueba", "Antigua Prueba", "Regular Prueba"])
+
+    def test_empty_and_unconfirmed_reviews_are_excluded(self):
+        self.review("Callada", review="")
+        self.review("Pendiente", booking_confirmed=False)
+        self.review("Contenta")
+        self.assertEqual(self.names(), ["Contenta Prueba"])
+
+    @override_settings(FEATURED_REVIEWS_LIMIT=2)
+    def test_reviews_are_capped_and_cached(self):
+        for number in range(3):
+            self.review(f"Pasajera {number}", updated_days_ago=number)
+        self.assertEqual(self.names(), ["Pasajera 0 Prueba", "Pasajera 1 Prueba"])
+        with self.assertNumQueries(0):
+            self.assertEqual(len(get_featured_reviews()), 2)
+
+
+class KeysetPaginatorTests(TestCase):
+    """
+    Listing cursors round-trip and tampered ones are rejected before the query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Portal.objects.create(name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678")
+        today = timezone.now().date()
+        # Two travels share a start date, the id breaks the tie.
+        for days in (10, 20, 20, 30, 40):
+            Travel.objects.create(
+                name=f"En {days} días", start_date=today + timedelta(days=days), end_date=today + timedelta(days=days),
+                max_passengers=10, cover_image="travel/travels/cover.jpeg",
+            )
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def encode(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def test_pages_follow_each_other_without_gaps(self):
+        paginator = KeysetPaginator(Travel.objects.values("id", "start_date"), 2)
+        ids, cursor, last_rows = [], None, []
+        while True:
+            page = paginator.page(cursor)
+            ids += [row["id"] for row in page]
+            last_rows.append(page.last_row)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(ids, list(Travel.objects.order_by("-start_date", "-id").values_list("id", flat=True)))
+        self.assertIsNone(last_rows[0])
+        self.assertEqual(
+            last_rows[1], Travel.objects.order_by("-start_date", "-id").values("start_date", "id")[1]
+        )
+
+    def test_tampered_cursors_are_rejected(self):
+        paginator = KeysetPaginator(Travel.objects.all(), 2)
+        cursors = [
+            "%%%",
+            self.encode({"start_date": "2024-01-01"}),
+            self.encode(["2024-01-01"]),
+            self.encode(["x", 1]),
+            self.encode(["2024-01-01", "abc"]),
+            self.encode([None, 1]),
+            self.encode(["2024-01-01", 10 ** 20]),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    paginator.page(cursor)
+                for url in (reverse("travels:my-travels"), reverse("travels:gallery")):
+                    response = self.client.get(url, {"cursor": cursor})
+                    self.assertTemplateUsed(response, "travel/detail_not_found.html")
+                response = self.client.get(reverse("api:travel-list", args=["v1"]), {"cursor": cursor})
+                self.assertEqual(response.status_code, 404)
+
+    def test_years_outside_the_calendar_are_ignored(self):
+        for year in ("0", "-1", "10000", "abc"):
+            with self.subTest(year=year):
+                for url in (reverse("travels:my-travels"), reverse("travels:gallery")):
+                    response = self.client.get(url, {"year": year})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertIsNone(response.context["selected_year"])
+
+
+def other_process_lookup(caches, key, value):
+    """Look ``key`` up from a worker process, loading ``value`` on a miss."""
+    with override_settings(CACHES=caches):
+        return TieredCache("tests:tiered", alias="shared").get_or_set(key, lambda: value)
+
+
+class YearGroupedListingTests(TestCase):
+    """
+    Listing pages group travels by year and carry a year across pages.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Portal.objects.create(name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678")
+        cls.next_year = timezone.now().year + 1
+        for year, months in ((cls.next_year, (3, 4, 5)), (cls.next_year + 1, (3, 4))):
+            for month in months:
+                start_date = timezone.now().date().replace(year=year, month=month, day=1)
+                Travel.objects.create(
+                    name=f"Viaje {month}/{year}", start_date=start_date, end_date=start_date,
+                    max_passengers=10, cover_image="travel/travels/cover.jpeg",
+                )
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def pages(self, **params):
+        pages, url = [], reverse("travels:my-travels")
+        while url:
+            response = self.client.get(url, params)
+            params = {}
+            groups = response.context["travels"].groups
+            pages.append((
+                {year: len(rows) for year, rows in groups.items()},
+                response.context["continued_year"],
+            ))
+            url = response.context["next_url"]
+        return pages, response.context["years"]
+
+    @mock.patch.object(TravelView, "per_page", 2)
+    def test_groups_continue_the_year_of_the_previous_page(self):
+        pages, years = self.pages()
+        self.assertEqual(pages, [
+            ({self.next_year + 1: 2}, None),
+            ({self.next_year: 2}, None),
+            ({self.next_year: 1}, self.next_year),
+        ])
+        self.assertEqual(years, [self.next_year + 1, self.next_year])
+
+    @mock.patch.object(TravelView, "per_page", 2)
+    def test_year_filter_follows_the_pages(self):
+        pages, years = self.pages(year=self.next_year)
+        self.assertEqual(pages, [({self.next_year: 2}, None), ({self.next_year: 1}, self.next_year)])
+        self.assertEqual(years, [self.next_year + 1, self.next_year])
+
+
+class TieredCacheTests(TestCase):
+    """
+    Values are shared between processes and reloaded once per invalidation.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.caches = {
+            **settings.CACHES,
+            "shared": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory},
+            "local": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tests-local"},
+        }
+        settings_override = override_settings(CACHES=self.caches)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.loads
+
+    def test_invalidation_reaches_other_processes(self):
+        cache = TieredCache("tests:tiered", alias="shared")
+        self.assertEqual(cache.get_or_set("key", lambda: "this process"), "this process")
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(1, mp_context=context, initializer=initialize_process) as pool:
+            def lookup():
+                return pool.submit(other_process_lookup, self.caches, "key", "other process").result()
+
+            self.assertEqual(lookup(), "this process")
+            cache.invalidate()
+            self.assertEqual(lookup(), "other process")
+        self.assertEqual(cache.get_or_set("key", lambda: "reloaded"), "other process")
+
+    def test_local_tier_expires_after_local_timeout(self):
+        this = TieredCache("tests:tiered", local_timeout=30, alias="shared")
+        other = TieredCache("tests:tiered", local_timeout=30, alias="shared")
+        self.assertEqual(this.get_or_set("key", self.load), 1)
+        self.assertEqual(other.get_or_set("key", self.load), 1)
+
+        this.invalidate()
+        self.assertEqual(this.get_or_set("key", self.load), 2)
+        self.assertEqual(other.get_or_set("key", self.load), 1)
+        with mock.patch("mvm.utils.cache.time.monotonic", return_value=time.monotonic() + 31):
+            self.assertEqual(other.get_or_set("key", self.load), 2)
+
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(
+            {counter: other.stats()[counter] for counter in ("local_hits", "shared_hits", "misses")},
+            {"local_hits": 1, "shared_hits": 2, "misses": 0},
+        )
+
+    def test_process_local_backends_are_refused_when_shared_caches_are_required(self):
+        with override_settings(REQUIRE_SHARED_CACHES=True):
+            with self.assertRaises(ImproperlyConfigured):
+                TieredCache("tests:tiered", alias="local")
+            TieredCache("tests:tiered", alias="shared")
+
+
+class TravelPageTests(TestCase):
+    """
+    Travel detail and gallery pages, built from a single fetch of the travel.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Portal.objects.create(
+            name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678",
+        )
+        today = timezone.now().date()
+        cls.upcoming = Travel.objects.create(
+            name="Próximo", start_date=today + timedelta(days=30), end_date=today + timedelta(days=35),
+            max_passengers=10, description="Descripción", cover_image="travel/travels/cover.jpeg",
+        )
+        for days in (3, 1, 2):
+            TravelDestination.objects.create(
+                travel=cls.upcoming, name=f"Día {days}",
+                start_date=cls.upcoming.start_date + timedelta(days=days),
+                end_date=cls.upcoming.start_date + timedelta(days=days),
+                image="travel/travel_destinations/image.jpeg",
+            )
+        cls.past = Travel.objects.create(
+            name="Pasado", start_date=today - timedelta(days=35), end_date=today - timedelta(days=30),
+            max_passengers=10, description="Descripción", cover_image="travel/travels/cover.jpeg",
+        )
+        TravelImage.objects.create(travel=cls.past, image="travel/travel_images/other.jpeg")
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def test_destinations_are_listed_by_start_date(self):
+        response = self.client.get(reverse("travels:travel_details", args=[self.upcoming.uuid]))
+        names = [destination["name"] for destination in response.context["travel"]["travel_destinations"]]
+        self.assertEqual(names, ["Día 1", "Día 2", "Día 3"])
+
+    def test_cached_page_is_purged_once_the_change_commits(self):
+        url = reverse("travels:travel_details", args=[self.upcoming.uuid])
+        self.client.get(url)
+        self.upcoming.name = "Próximo viaje"
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.upcoming.save()
+            self.assertNotContains(self.client.get(url), "Próximo viaje")
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(url), "Próximo viaje")
+
+    def test_unchanged_pages_answer_not_modified_without_queries(self):
+        url = reverse("travels:travel_details", args=[self.upcoming.uuid])
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TravelImage.objects.create(travel=self.upcoming, image="travel/travel_images/new.jpeg")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_changes_purge_only_the_pages_that_depend_on_them(self):
+        detail_url = reverse("travels:travel_details", args=[self.upcoming.uuid])
+        listing_url = reverse("travels:my-travels")
+        self.client.get(detail_url)
+        self.client.get(listing_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TravelDestination.objects.create(
+                travel=self.upcoming, name="Día 4", start_date=self.upcoming.start_date,
+                end_date=self.upcoming.start_date, image="travel/travel_destinations/image.jpeg",
+            )
+        self.assertEqual(self.client.get(detail_url)["X-Page-Cache"], "miss")
+        self.assertEqual(self.client.get(listing_url)["X-Page-Cache"], "hit")
+
+        # Every page renders the portal.
+        with self.captureOnCommitCallbacks(execute=True):
+            Portal.objects.get().save()
+        self.assertEqual(self.client.get(detail_url)["X-Page-Cache"], "miss")
+        self.assertEqual(self.client.get(listing_url)["X-Page-Cache"], "miss")
+
+    @override_settings(
+        CACHES={"local": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}, REQUIRE_SHARED_CACHES=True,
+    )
+    def test_page_cache_refuses_process_local_backends(self):
+        with self.assertRaises(ImproperlyConfigured):
+            TaggedPageCache(alias="local")
+
+    def test_gallery_without_gallery_images_or_url_is_not_available(self):
+        response = self.client.get(reverse("travels:travel_gallery", args=[self.past.uuid]))
+        self.assertTemplateUsed(response, "travel/detail_not_found.html")
+        self.assertEqual(response.context["reason"], "Oops! Imagenes no se han cargado")
+
+
+class TravelAPITests(TestCase):
+    """
+    Read-only JSON API of the travels.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Portal.objects.create(
+            name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678",
+        )
+        today = timezone.now().date()
+        for days in (10, 30, 20):
+            Travel.objects.create(
+                name=f"En {days} días", start_date=today + timedelta(days=days),
+                end_date=today + timedelta(days=days + 3), max_passengers=10, description="Descripción",
+                cover_image="travel/travels/cover.jpeg",
+            )
+        cls.upcoming = Travel.objects.get(name="En 30 días")
+        TravelDestination.objects.create(
+            travel=cls.upcoming, name="Tikal", start_date=cls.upcoming.start_date,
+            end_date=cls.upcoming.start_date, image="travel/travel_destinations/image.jpeg",
+        )
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "PAGE_SIZE": 2})
+    def test_travels_are_paginated_with_a_cursor_and_sparse_fields(self):
+        url = reverse("api:travel-list", args=["v1"])
+        first = self.client.get(url, {"fields": "name"}).json()
+        second = self.client.get(first["next"]).json()
+
+        self.assertEqual(first["results"], [{"name": "En 30 días"}, {"name": "En 20 días"}])
+        self.assertEqual(second, {"next": None, "results": [{"name": "En 10 días"}]})
+
+    def test_travel_detail_includes_its_destinations(self):
+        response = self.client.get(
+            reverse("api:travel-detail", args=["v1", self.upcoming.uuid]), {"fields": "name,travel_destinations"}
+        )
+        self.assertEqual(response.json(), {
+            "name": "En 30 días",
+            "travel_destinations": [{
+                "name": "Tikal",
+                "start_date": self.upcoming.start_date.isoformat(),
+                "end_date": self.upcoming.start_date.isoformat(),
+                "image": "/media/travel/travel_destinations/image.jpeg",
+                "description": "",
+            }],
+        })
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse("api:travel-list", args=["v1"]), {"fields": "name,password"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unchanged_travels_answer_not_modified(self):
+        url = reverse("api:travel-list", args=["v1"])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class ImageRenditionTests(TestCase):
+    """
+    Pages link the WebP renditions of an image once they are written, the original before.
+    """
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(MEDIA_ROOT=self.root, IMAGE_RENDITIONS_ENABLED=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        buffer = BytesIO()
+        Image.new("RGB", (800, 600), "teal").save(buffer, "JPEG")
+        self.name = default_storage.save("travel/travels/rendition-test.jpeg", ContentFile(buffer.getvalue()))
+
+    def test_original_is_served_until_the_renditions_exist(self):
+        self.assertEqual(images.rendition_url(self.name, 640), images.media_url(self.name))
+        self.assertEqual(images.srcset(self.name), "")
+
+        images.generate_renditions(self.name)
+        self.assertEqual(
+            images.rendition_url(self.name, 640), images.media_url(images.rendition_name(self.name, 640))
+        )
+        self.assertIn("640w", images.srcset(self.name))
+        # Remembered, the storage is not checked again.
+        with mock.patch.object(images, "has_renditions") as has_renditions:
+            images.rendition_url(self.name, 320)
+        has_renditions.assert_not_called()
+
+
+@override_settings(ALLOWED_HOSTS=["viajes.example.com", "tours.example.com", "nuevo.example.com", "testserver"])
+class PortalRoutingTests(TestCase):
+    """
+    Every host is served its own portal, with its travels and the shared ones.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mvm = Portal.objects.create(
+            name="MVM", domain=" Viajes.Example.com ", address="Guatemala", email="info@example.com",
+            mobile_phone="11111111",
+        )
+        cls.tours = Portal.objects.create(
+            name="Tours", domain="tours.example.com", address="Antigua", email="tours@example.com",
+            mobile_phone="22222222",
+        )
+        start_date = timezone.now().date() + timedelta(days=30)
+        cls.mvm_travel, cls.tours_travel, cls.shared_travel = [
+            Travel.objects.create(
+                name=name, portal=portal, start_date=start_date, end_date=start_date, max_passengers=10,
+                cover_image="travel/travels/cover.jpeg",
+            )
+            for name, portal in (("Tikal", cls.mvm), ("Atitlán", cls.tours), ("Semuc Champey", None))
+        ]
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        portal_context_cache.invalidate()
+
+    def get_travel_names(self, host):
+        response = self.client.get(reverse("travels:my-travels"), HTTP_HOST=host)
+        return sorted(travel["name"] for _, travels in response.context["travels"].items() for travel in travels)
+
+    def test_each_host_lists_its_travels_and_the_shared_ones(self):
+        self.assertEqual(self.get_travel_names("viajes.example.com"), ["Semuc Champey", "Tikal"])
+        self.assertEqual(self.get_travel_names("tours.example.com"), ["Atitlán", "Semuc Champey"])
+        # Unknown hosts get the first active portal.
+        self.assertEqual(self.get_travel_names("testserver"), ["Semuc Champey", "Tikal"])
+
+        response = self.client.get(
+            reverse("travels:travel_details", args=[self.tours_travel.uuid]), HTTP_HOST="viajes.example.com"
+        )
+        self.assertTemplateUsed(response, "travel/detail_not_found.html")
+
+    def test_portal_is_resolved_once_per_host(self):
+        url = reverse("travels:whatsapp-general")
+        response = self.client.get(url, HTTP_HOST="tours.example.com")
+        self.assertTrue(response["Location"].startswith("https://wa.me/50222222222?"))
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_HOST="tours.example.com")
+        self.assertTrue(response["Location"].startswith("https://wa.me/50222222222?"))
+
+        response = self.client.get(url, HTTP_HOST="nuevo.example.com")
+        self.assertTrue(response["Location"].startswith("https://wa.me/50211111111?"))
+        # Saving a portal drops the resolved hosts.
+        self.tours.domain = "nuevo.example.com"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tours.save()
+        response = self.client.get(url, HTTP_HOST="nuevo.example.com")
+        self.assertTrue(response["Location"].startswith("https://wa.me/50222222222?"))
+
+
+class TravelSearchTests(TestCase):
+    """
+    Full-text search over the travels and their destinations.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Portal.objects.create(
+            name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678",
+        )
+        today = timezone.now().date()
+        cls.upcoming = Travel.objects.create(
+            name="Aventura en Zúrich", start_date=today + timedelta(days=30), end_date=today + timedelta(days=35),
+            max_passengers=10, description="Paseos por los lagos suizos.", cover_image="travel/travels/cover.jpeg",
+            inclusions=["Hospedaje"],
+        )
+        cls.destination = TravelDestination.objects.create(
+            travel=cls.upcoming, name="Lucerna", start_date=cls.upcoming.start_date,
+            end_date=cls.upcoming.start_date, image="travel/travel_destinations/image.jpeg",
+        )
+        cls.past = Travel.objects.create(
+            name="Ruinas de Tikal", start_date=today - timedelta(days=35), end_date=today - timedelta(days=30),
+            max_passengers=10, description="Templos mayas.", cover_image="travel/travels/cover.jpeg",
+        )
+
+    def search(self, query):
+        response = self.client.get(reverse("travels:search"), {"q": query})
+        return [travel["name"] for travel in response.context["travels"]]
+
+    def test_admin_lists_the_best_matches_first(self):
+        # Newer travels come first without a search, this one only mentions Tikal once.
+        Travel.objects.create(
+            name="Petén", start_date=self.upcoming.start_date, end_date=self.upcoming.end_date,
+            max_passengers=10, description="Visita a Tikal.", cover_image="travel/travels/cover.jpeg",
+        )
+        self.client.force_login(get_user_model().objects.create_superuser("admin@example.com", "secret"))
+        url = reverse("admin:travel_travel_changelist")
+
+        response = self.client.get(url, {"q": "tikal"})
+        self.assertEqual([travel.name for travel in response.context["cl"].result_list], ["Ruinas de Tikal", "Petén"])
+        response = self.client.get(url, {"q": "tikal", "o": "-2"})
+        self.assertEqual([travel.name for travel in response.context["cl"].result_list], ["Petén", "Ruinas de Tikal"])
+
+    def test_search_ignores_accents_and_matches_word_forms(self):
+        self.assertEqual(self.search("zurich"), ["Aventura en Zúrich"])
+        self.assertEqual(self.search("lago"), ["Aventura en Zúrich"])
+        self.assertEqual(self.search("hospedaje"), ["Aventura en Zúrich"])
+
+    def test_search_covers_destinations_and_follows_their_changes(self):
+        self.assertEqual(self.search("lucerna"), ["Aventura en Zúrich"])
+
+        self.destination.name = "Berna"
+        self.destination.save()
+
+        self.assertEqual(self.search("lucerna"), [])
+        self.assertEqual(self.search("berna"), ["Aventura en Zúrich"])
+
+    def test_search_falls_back_to_similar_names_for_typos(self):
+        self.assertEqual(self.search("tikall"), ["Ruinas de Tikal"])
+
+
+class SoftDeleteTests(TestCase):
+    """
+    Soft deletes cascade like CASCADE deletes and keep the counters in sync.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        start_date = timezone.now().date() + timedelta(days=30)
+        cls.travel = Travel.objects.create(
+            name="Viaje", start_date=start_date, end_date=start_date + timedelta(days=3),
+            max_passengers=10, description="Descripción", cover_image="travel/travels/cover.jpeg",
+        )
+        TravelImage.objects.create(travel=cls.travel, image="travel/travel_images/image.jpeg")
+        cls.passenger = Passenger.objects.create(first_name="Ana", last_name="López")
+        cls.reservation = Reservation.objects.create(
+            travel=cls.travel, passenger=cls.passenger, booking_confirmed=True,
+        )
+
+    def test_deleting_a_reservation_frees_its_seat_and_allows_booking_again(self):
+        self.reservation.delete()
+        self.travel.refresh_from_db()
+        self.assertEqual(self.travel.confirmed_passengers, 0)
+        self.assertTrue(Reservation.all_objects.filter(pk=self.reservation.pk).exists())
+
+        Reservation.objects.create(travel=self.travel, passenger=self.passenger, booking_confirmed=True)
+        self.travel.refresh_from_db()
+        self.assertEqual(self.travel.confirmed_passengers, 1)
+
+    def test_deleting_a_travel_cascades_to_its_images_and_reservations(self):
+        _, deleted = Travel.objects.filter(pk=self.travel.pk).delete()
+
+        self.assertEqual(
+            deleted,
+            {"travel.TravelImage": 1, "travel.Reservation": 1, "travel.Travel": 1},
+        )
+        self.assertFalse(Travel.objects.filter(pk=self.travel.pk).exists())
+        self.assertFalse(TravelImage.objects.filter(travel=self.travel).exists())
+        self.assertEqual(Reservation.all_objects.filter(travel=self.travel).dead().count(), 1)
+        self.assertTrue(Passenger.objects.filter(pk=self.passenger.pk).exists())
+
+    def test_names_of_deleted_portals_and_accounts_can_be_used_again(self):
+        portal = Portal.objects.create(
+            name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678",
+            domain="viajes.example.com",
+        )
+        SocialMediaAccount.objects.create(portal=portal, name="Facebook", url="https://facebook.com/mvm")
+        again = Portal(
+            name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678",
+            domain="viajes.example.com",
+        )
+        with self.assertRaises(ValidationError) as raised:
+            again.full_clean()
+        self.assertEqual(set(raised.exception.message_dict), {"__all__"})
+        self.assertEqual(len(raised.exception.messages), 2)
+
+        portal.delete()
+        again.full_clean()
+        again.save()
+        account = SocialMediaAccount(portal=again, name="Facebook", url="https://facebook.com/mvm")
+        account.full_clean()
+        account.save()
+
+    def test_account_names_are_unique_per_portal(self):
+        portals = [
+            Portal.objects.create(name=name, address="Guatemala", email="info@example.com", mobile_phone="12345678")
+            for name in ("MVM", "MVM Tours")
+        ]
+        SocialMediaAccount.objects.create(portal=portals[0], name="Facebook", url="https://facebook.com/mvm")
+        account = SocialMediaAccount(portal=portals[1], name="Facebook", url="https://facebook.com/mvm-tours")
+        account.full_clean()
+        account.save()
+
+        with self.assertRaisesMessage(ValidationError, str(TravelManagementConstants.SOCIAL_MEDIA_ACCOUNT_NAME_TAKEN)):
+            SocialMediaAccount(portal=portals[1], name="Facebook", url="https://facebook.com/other").full_clean()
+
+
+class StaticSiteTests(TestCase):
+    """
+    The static snapshot is rebuilt incrementally and served without queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portal = Portal.objects.create(
+            name="MVM", address="Guatemala", email="info@example.com", mobile_phone="12345678"
+        )
+        today = timezone.now().date()
+        cls.upcoming, cls.past = [
+            Travel.objects.create(
+                name=name, start_date=start_date, end_date=start_date + timedelta(days=3),
+                max_passengers=10, description="Descripción", cover_image="travel/travels/cover.jpeg",
+            )
+            for name, start_date in (("Tikal", today + timedelta(days=30)), ("Atitlán", today - timedelta(days=30)))
+        ]
+        TravelImage.objects.create(travel=cls.past, image="travel/travel_images/image.jpeg", is_gallery_image=True)
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        portal_context_cache.invalidate()
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        # The middleware of the settings the site runs with, only the snapshot is moved.
+        settings_override = override_settings(STATIC_SITE_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def build(self):
+        output = StringIO()
+        call_command("build_static_site", processes=1, stdout=output)
+        return output.getvalue()
+
+    def test_only_changed_pages_are_rendered_again(self):
+        self.assertIn("5 page(s) rendered", self.build())
+        self.assertIn("0 page(s) rendered, 5 unchanged", self.build())
+
+        TravelImage.objects.create(travel=self.upcoming, image="travel/travel_images/other.jpeg")
+        self.assertIn("1 page(s) rendered, 4 unchanged", self.build())
+
+        self.upcoming.name = "Tikal y Yaxhá"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upcoming.save()
+        self.assertIn("3 page(s) rendered, 2 unchanged", self.build())
+        detail_url = reverse("travels:travel_details", args=[self.upcoming.uuid])
+        self.assertIn("Tikal y Yaxhá", page_path(portal_root(self.root, self.portal.pk), detail_url).read_text())
+
+    def test_snapshot_pages_are_served_without_queries(self):
+        self.assertIn(STATIC_SITE_MIDDLEWARE, settings.MIDDLEWARE)
+        self.build()
+        url = reverse("travels:travel_gallery", args=[self.past.uuid])
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            b"".join(response.streaming_content), page_path(portal_root(self.root, self.portal.pk), url).read_bytes()
+        )
+
+        # Paginated and filtered listings are not in the snapshot.
+        response = self.client.get(reverse("travels:my-travels"), {"year": self.upcoming.start_date.year})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+
+    def test_rebuilds_are_served_without_a_restart(self):
+        self.build()
+        url = reverse("travels:travel_details", args=[self.upcoming.uuid])
+        response = self.client.get(url)
+        self.assertIn(b"Tikal", b"".join(response.streaming_content))
+
+        self.upcoming.name = "Tikal y Yaxhá"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upcoming.save()
+        self.build()
+        response = self.client.get(url)
+        content = b"".join(response.streaming_content)
+        self.assertIn("Tikal y Yaxhá", content.decode())
+        self.assertEqual(int(response["Content-Length"]), len(content))
+
+        # Pages new to the snapshot are served as well.
+        travel = Travel.objects.create(
+            name="Yaxhá", start_date=self.upcoming.start_date, end_date=self.upcoming.end_date,
+            max_passengers=10, cover_image="travel/travels/cover.jpeg",
+        )
+        self.build()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("travels:travel_details", args=[travel.uuid]))
+        self.assertTrue(response.streaming)
+
+    def test_changes_schedule_one_rebuild_of_a_built_snapshot(self):
+        self.upcoming.save()
+        self.assertFalse(Job.objects.filter(task="travel.build_static_site").exists())
+
+        self.build()
+        self.upcoming.name = "Tikal y Yaxhá"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upcoming.save()
+        TravelImage.objects.create(travel=self.upcoming, image="travel/travel_images/other.jpeg")
+        job = Job.objects.get(task="travel.build_static_site", status=Job.PENDING)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        Job.objects.claim(1, 60)
+        with mock.patch("sys.stdout", StringIO()):
+            self.assertEqual(run_job(job.pk), Job.DONE)
+        detail_url = reverse("travels:travel_details", args=[self.upcoming.uuid])
+        self.assertIn("Tikal y Yaxhá", page_path(portal_root(self.root, self.portal.pk), detail_url).read_text())
+
+
+class TravelAvailabilityTests(TestCase):
+    """
+    Availability is read from the counter, or counted live in one query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        start_date = timezone.now().date() + timedelta(days=30)
+        cls.tikal, cls.atitlan = (
+            Travel.objects.create(name=name, start_date=start_date, end_date=start_date, max_passengers=5)
+            for name in ("Tikal", "Atitlán")
+        )
+        for number, fields in enumerate(
+            [{"booking_confirmed": True}] * 2 + [{"booking_confirmed": False}, {"booking_confirmed": True}]
+        ):
+            passenger = Passenger.objects.create(first_name=f"Pasajera {number}", last_name="Prueba")
+            Reservation.objects.create(travel=cls.tikal, passenger=passenger, **fields)
+        Reservation.objects.filter(passenger__first_name="Pasajera 3").delete()
+        # A drifted counter, as reconcile_passenger_counters would find it.
+        Travel.objects.filter(pk=cls.atitlan.pk).update(confirmed_passengers=4)
+
+    def availability(self, **kwargs):
+        return {
+            travel.pk: (travel.passengers_count, travel.available_seats)
+            for travel in Travel.objects.with_availability(**kwargs)
+        }
+
+    def test_live_availability_counts_confirmed_live_reservations(self):
+        with self.assertNumQueries(1):
+            live = self.availability(live=True)
+        self.assertEqual(live, {self.tikal.pk: (2, 3), self.atitlan.pk: (0, 5)})
+
+    def test_availability_reads_the_counter_by_default(self):
+        self.assertEqual(self.availability(), {self.tikal.pk: (2, 3), self.atitlan.pk: (4, 1)})
+
+
+class ConfirmedPassengerCounterTests(TestCase):
+    """
+    Bulk reservation writes keep the confirmed passenger counters in sync.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        start_date = timezone.now().date() + timedelta(days=30)
+        cls.tikal, cls.atitlan = (
+            Travel.objects.create(name=name, start_date=start_date, end_date=start_date, max_passengers=3)
+            for name in ("Tikal", "Atitlán")
+        )
+        cls.passengers = Passenger.objects.bulk_create(
+            Passenger(first_name=f"Pasajera {number}", last_name="Prueba") for number in range(3)
+        )
+
+    def assertCounters(self, tikal, atitlan):
+        self.tikal.refresh_from_db()
+        self.atitlan.refresh_from_db()
+        self.assertEqual((self.tikal.confirmed_passengers, self.atitlan.confirmed_passengers), (tikal, atitlan))
+
+    def test_bulk_writes_refresh_the_counters_of_every_travel_they_touch(self):
+        reservations = Reservation.objects.bulk_create(
+            Reservation(travel=self.tikal, passenger=passenger, booking_confirmed=True)
+            for passenger in self.passengers
+        )
+        self.assertCounters(3, 0)
+        self.assertTrue(self.tikal.is_capacity_full)
+
+        Reservation.objects.filter(pk=reservations[0].pk).update(travel=self.atitlan)
+        self.assertCounters(2, 1)
+        self.assertFalse(self.tikal.is_capacity_full)
+
+        reservations[1].booking_confirmed = False
+        Reservation.objects.bulk_update(reservations[1:2], ["booking_confirmed"])
+        self.assertCounters(1, 1)
+
+        Reservation.objects.filter(travel=self.tikal).delete()
+        self.assertCounters(0, 1)
+
+
+class ReconcilePassengerCountersTests(TestCase):
+    """
+    Drifted confirmed passenger counters are reported and recomputed.
+    """
+
+    def test_drifted_counters_are_reconciled(self):
+        start_date = timezone.now().date() + timedelta(days=30)
+        travel = Travel.objects.create(name="Tikal", start_date=start_date, end_date=start_date, max_passengers=3)
+        passenger = Passenger.objects.create(first_name="Ana", last_name="Prueba")
+        Reservation.objects.create(travel=travel, passenger=passenger, booking_confirmed=True)
+        Travel.objects.filter(pk=travel.pk).update(confirmed_passengers=3, is_capacity_full=True)
+
+        output = StringIO()
+        call_command("reconcile_passenger_counters", dry_run=True, stdout=output)
+        self.assertIn(f"{travel.pk} Tikal: stored 3, actual 1", output.getvalue())
+        travel.refresh_from_db()
+        self.assertEqual(travel.confirmed_passengers, 3)
+
+        output = StringIO()
+        call_command("reconcile_passenger_counters", stdout=output)
+        self.assertIn("Reconciled 1 drifted travel(s).", output.getvalue())
+        travel.refresh_from_db()
+        self.assertEqual((travel.confirmed_passengers, travel.is_capacity_full), (1, False))
+
+
+class ContactDispatchTests(TestCase):
+    """
+    Contact messages are emailed to the staff by one delayed, retried job.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        get_user_model().objects.create_superuser("staff@example.com", "secret")
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        contact_recipients_cache.invalidate()
+
+    def test_messages_sent_close_together_share_one_dispatch(self):
+        submit_contact_message("Ana", "ana@example.com", "Tikal", "¿Hay cupo?")
+        submit_contact_message("Eva", "", "Atitlán", "¿Incluye lancha?")
+        self.assertEqual(Job.objects.filter(task=DISPATCH_TASK, status=Job.PENDING).count(), 1)
+
+        self.assertEqual(dispatch_contact_messages(batch_size=1), 2)
+        self.assertEqual([message.subject for message in mail.outbox], ["Tikal", "Atitlán"])
+        self.assertEqual(mail.outbox[0].to, ["staff@example.com"])
+        self.assertEqual(mail.outbox[0].reply_to, ["ana@example.com"])
+        self.assertFalse(ContactMessage.objects.filter(sent_at__isnull=True).exists())
+        self.assertEqual(dispatch_contact_messages(), 0)
+
+    def test_failed_messages_are_dispatched_again_with_backoff(self):
+        contact_message = submit_contact_message("Ana", "ana@example.com", "Tikal", "¿Hay cupo?")
+        Job.objects.update(status=Job.DONE)
+
+        before = timezone.now()
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError):
+            with self.assertLogs("apps.travel.notifications", "WARNING"):
+                self.assertEqual(dispatch_contact_messages(), 0)
+
+        contact_message.refresh_from_db()
+        self.assertEqual(contact_message.delivery_attempts, 1)
+        retry = Job.objects.get(task=DISPATCH_TASK, status=Job.PENDING)
+        self.assertGreaterEqual(retry.run_at, before + timedelta(seconds=settings.JOB_RETRY_BACKOFF))
+
+
+    def test_batches_sent_before_a_failure_stay_sent(self):
+        first = submit_contact_message("Ana", "ana@example.com", "Tikal", "¿Hay cupo?")
+        second = submit_contact_message("Eva", "eva@example.com", "Atitlán", "¿Incluye lancha?")
+        job = Job.objects.get(task=DISPATCH_TASK, status=Job.PENDING)
+        Job.objects.claim(1, 60)
+        bulk_update = ContactMessage.objects.bulk_update
+
+        def fail_on_second_batch(objs, fields):
+            if any(contact_message.pk == second.pk for contact_message in objs):
+                raise DatabaseError("connection lost")
+            return bulk_update(objs, fields)
+
+        with mock.patch.object(ContactMessage.objects, "bulk_update", side_effect=fail_on_second_batch):
+            with mock.patch.object(settings, "CONTACT_DISPATCH_BATCH_SIZE", 1):
+                with self.assertLogs("apps.general.jobs", "WARNING"):
+                    self.assertEqual(run_job(job.pk), Job.PENDING)
+
+        # The first email went out, a retry must not send it again.
+        self.assertEqual(len(mail.outbox), 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertIsNotNone(first.sent_at)
+        self.assertIsNone(second.sent_at)
+
+class PassengerImportTests(TestCase):
+    """
+    Passenger files are imported in batches, matching the existing passengers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        start_date = timezone.now().date() + timedelta(days=30)
+        cls.travel = Travel.objects.create(
+            name="Tikal", start_date=start_date, end_date=start_date, max_passengers=2,
+        )
+        cls.ana = Passenger.objects.create(first_name="Ana", last_name="Prueba", email="ana@example.com")
+
+    def test_rows_are_deduplicated_and_errors_reported_per_row(self):
+        content = "\n".join([
+            "first_name,last_name,email,phone,travel,booking_confirmed",
+            "Ana,Prueba,ANA@example.com,,,si",
+            "Eva,Prueba,,+502 5555-1234,,no",
+            "Eva,Prueba,,50255551234,,si",
+            "Lia,Prueba,lia@,,,",
+            f"Mia,Prueba,,,{timezone.now().date()},",
+            "Sol,Prueba,sol@example.com,,,si",
+            "",
+        ]).encode()
+        passenger_import = PassengerImport(travel=self.travel, batch_size=2).run(
+            read_rows(BytesIO(content), "pasajeros.csv")
+        )
+
+        self.assertEqual([line for line, _ in passenger_import.errors], [5, 6, 7])
+        self.assertEqual(
+            (passenger_import.rows, passenger_import.passengers_created, passenger_import.seats_confirmed),
+            (6, 2, 2),
+        )
+        self.assertEqual(
+            set(Reservation.objects.filter(travel=self.travel).values_list("passenger__first_name", "booking_confirmed")),
+            {("Ana", True), ("Eva", True)},
+        )
+        self.travel.refresh_from_db()
+        self.assertEqual(self.travel.confirmed_passengers, 2)
+        self.assertTrue(self.travel.is_capacity_full)
+
+    def test_admin_imports_xlsx_files(self):
+        self.client.force_login(get_user_model().objects.create_superuser("admin@example.com", "secret"))
+        workbook = Workbook()
+        workbook.active.append(["first_name", "last_name", "phone", "travel"])
+        workbook.active.append(["Eva", "Prueba", 50255551234, str(self.travel.uuid)])
+        upload = BytesIO()
+        workbook.save(upload)
+
+        response = self.client.post(reverse("admin:travel_passenger_import"), {
+            "file": SimpleUploadedFile("pasajeros.xlsx", upload.getvalue()), "confirm": "on",
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["passenger_import"].errors, [])
+        self.assertTrue(Reservation.objects.get(passenger__phone="50255551234").booking_confirmed)
+
+
+class ManifestTests(TestCase):
+    """
+    Passenger manifests are streamed per travel or zipped for several travels.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser("admin@example.com", "secret")
+        start_date = timezone.now().date() + timedelta(days=30)
+        cls.tikal, cls.atitlan = [
+            Travel.objects.create(name=name, start_date=start_date, end_date=start_date, max_passengers=10)
+            for name in ("Tikal", "Atitlán")
+        ]
+        for first_name, confirmed in (("Eva", False), ("Ana", True)):
+            passenger = Passenger.objects.create(
+                first_name=first_name, last_name="Prueba", email=f"{first_name.lower()}@example.com"
+            )
+            Reservation.objects.create(travel=cls.tikal, passenger=passenger, booking_confirmed=confirmed)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_manifest_is_streamed_as_csv_or_json(self):
+        url = reverse("admin:travel_travel_manifest", args=[self.tikal.pk])
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(
+            [(row["first_name"], row["booking_confirmed"]) for row in rows], [("Ana", "True"), ("Eva", "False")]
+        )
+
+        manifest = json.loads(b"".join(self.client.get(url, {"format": "json"}).streaming_content))
+        self.assertEqual(manifest["travel"]["name"], "Tikal")
+        self.assertEqual([row["email"] for row in manifest["passengers"]], ["ana@example.com", "eva@example.com"])
+
+    def test_several_travels_are_exported_in_a_zip(self):
+        response = self.client.post(reverse("admin:travel_travel_changelist"), {
+            "action": "export_manifests", "_selected_action": [self.tikal.pk, self.atitlan.pk],
+        })
+        archive = zipfile.ZipFile(BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(len(archive.namelist()), 2)
+        self.assertEqual(
+            [len(archive.read(name).decode().splitlines()) for name in archive.namelist()], [3, 1]
+        )
+
+
+class BenchmarkViewsTests(TestCase):
+    """
+    benchmark_views measures a seeded dataset and fails on regressions over a baseline.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_travel_data", travels=40, reservations=120, stdout=StringIO())
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def benchmark(self, **options):
+        call_command("benchmark_views", requests=2, warmup=0, stdout=StringIO(), **options)
+
+    def test_results_are_compared_with_the_baseline(self):
+        baseline_path = self.root / "baseline.json"
+        self.benchmark(output=baseline_path)
+        baseline = json.loads(baseline_path.read_text())
+        self.assertEqual(baseline["dataset"], {"travels": 40, "reservations": 120})
+        self.assertEqual(set(baseline["routes"]["gallery"]), {"url", "p50_ms", "p95_ms", "queries", "peak_kib"})
+
+        # Generous enough for the noise of two requests.
+        self.benchmark(baseline=baseline_path, tolerance=10, slack_ms=1000)
+
+        queries = baseline["routes"]["gallery"]["queries"]
+        baseline["routes"]["gallery"]["queries"] = queries - 1
+        baseline_path.write_text(json.dumps(baseline))
+        with self.assertRaisesMessage(CommandError, f"gallery: {queries} queries, baseline {queries - 1}"):
+            self.benchmark(baseline=baseline_path, tolerance=10, slack_ms=1000)
+
+
+class ExplainViewsTests(TestCase):
+    """
+    explain_views flags the queries of the public pages that scan a large table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_travel_data", travels=40, reservations=120, stdout=StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Travel._meta.db_table}")
+
+    def explain(self, **options):
+        output = StringIO()
+        call_command("explain_views", stdout=output, **options)
+        return output.getvalue()
+
+    def test_sequential_scans_are_flagged_above_min_rows(self):
+        output = self.explain(min_rows=1)
+        self.assertEqual(output.count(" -> 200, "), 5)
+        self.assertIn(f"Seq Scan on {Travel._meta.db_table}", output)
+        self.assertIn("scan a large table sequentially.", output)
+
+        self.assertIn("No sequential scan on a large table.", self.explain(min_rows=10 ** 9))
+
+    def test_seq_scans_walk_the_whole_plan(self):
+        plan = {
+            "Node Type": "Hash Join",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "travel"},
+                {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "reservation"}]},
+            ],
+        }
+        self.assertEqual(seq_scans(plan), ["travel", "reservation"])
+
+    def test_an_empty_dataset_is_refused(self):
+        Travel.all_objects.all().hard_delete()
+        with self.assertRaisesMessage(CommandError, "seed a dataset first"):
+            self.explain()
+
+
+class ReservationBookingTests(TransactionTestCase):
+    """
+    Confirmed reservations take the seats of their travel atomically.
+    """
+
+    def setUp(self):
+        start_date = timezone.now().date() + timedelta(days=30)
+        self.travel = Travel.objects.create(
+            name="Tikal", start_date=start_date, end_date=start_date, max_passengers=3,
+        )
+        self.passengers = Passenger.objects.bulk_create(
+            Passenger(first_name=f"Pasajera {number}", last_name="Prueba") for number in range(12)
+        )
+
+    def test_booking_is_idempotent_and_stops_at_capacity(self):
+        first, created = confirm_booking(self.travel, self.passengers[0])
+        self.assertTrue(created)
+        self.assertEqual(confirm_booking(self.travel, self.passengers[0]), (first, False))
+
+        confirm_booking(self.travel, self.passengers[1])
+        confirm_booking(self.travel, self.passengers[2])
+        with self.assertRaises(TravelFullError):
+            confirm_booking(self.travel, self.passengers[3])
+        # The passenger holding the last seat may still retry.
+        self.assertFalse(confirm_booking(self.travel, self.passengers[2])[1])
+
+        self.travel.refresh_from_db()
+        self.assertEqual(self.travel.confirmed_passengers, 3)
+        self.assertTrue(self.travel.is_capacity_full)
+
+    def test_freed_seats_reopen_a_full_travel(self):
+        reservations = [confirm_booking(self.travel, passenger)[0] for passenger in self.passengers[:3]]
+        reservations[0].delete()
+        self.travel.refresh_from_db()
+        self.assertEqual(self.travel.confirmed_passengers, 2)
+        self.assertFalse(self.travel.is_capacity_full)
+
+        self.assertTrue(confirm_booking(self.travel, self.passengers[3])[1])
+        self.travel.refresh_from_db()
+        self.assertTrue(self.travel.is_capacity_full)
+
+    def test_concurrent_bookings_never_overbook(self):
+        barrier = threading.Barrier(8)
+        attempts = self.passengers + self.passengers[::-1]
+
+        def book(passengers):
+            try:
+                barrier.wait()
+                for passenger in passengers:
+                    try:
+                        confirm_booking(self.travel, passenger)
+                    except TravelFullError:
+                        pass
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(attempts[number::8],)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.travel.refresh_from_db()
+        self.assertEqual(Reservation.objects.filter(travel=self.travel, booking_confirmed=True).count(), 3)
+        self.assertEqual(self.travel.confirmed_passengers, 3)
+        self.assertTrue(self.travel.is_capacity_full)
+
+    def test_bulk_confirmations_never_overbook(self):
+        confirm_booking(self.travel, self.passengers[0])
+        pending = Reservation.objects.bulk_create(
+            Reservation(travel=self.travel, passenger=passenger) for passenger in self.passengers[1:4]
+        )
+        with self.assertRaises(TravelFullError):
+            Reservation.objects.filter(pk__in=[reservation.pk for reservation in pending]).update(
+                booking_confirmed=True
+            )
+        with self.assertRaises(TravelFullError):
+            Reservation.objects.bulk_create(
+                Reservation(travel=self.travel, passenger=passenger, booking_confirmed=True)
+                for passenger in self.passengers[4:7]
+            )
+        for reservation in pending:
+            reservation.booking_confirmed = True
+        with self.assertRaises(TravelFullError):
+            Reservation.objects.bulk_update(pending, ["booking_confirmed"])
+
+        self.travel.refresh_from_db()
+        self.assertEqual(Reservation.objects.filter(travel=self.travel, booking_confirmed=True).count(), 1)
+        self.assertEqual(self.travel.confirmed_passengers, 1)
+
+        # Confirmations that fit are still written in one go.
+        Reservation.objects.bulk_update(pending[:2], ["booking_confirmed"])
+        self.travel.refresh_from_db()
+        self.assertEqual(self.travel.confirmed_passengers, 3)
+        self.assertTrue(self.travel.is_capacity_full)
+
+    def test_admin_shows_capacity_as_read_only(self):
+        self.client.force_login(get_user_model().objects.create_superuser("admin@example.com", "secret"))
+        response = self.client.get(reverse("admin:travel_travel_change", args=[self.travel.pk]))
+        self.assertNotIn("is_capacity_full", response.context["adminform"].form.fields)
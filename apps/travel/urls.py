@@ -1,6 +1,10 @@
 from django.urls import path
+from apps.travel.async_views import AsyncContactView, AsyncGalleryView, AsyncOverView, AsyncTravelDetailView, \
+    AsyncTravelGalleryView, AsyncTravelView
+from apps.travel.api import GalleryDetailAPIView, GalleryListAPIView, PortalAPIView, TravelDetailAPIView, \
+    TravelListAPIView
 from apps.travel.views import OverView, TravelView, TravelDetailView, GalleryView, TravelGalleryView, \
-    WhatsappGeneralView, WhatsappTravelView, ContactView
+    WhatsappGeneralView, WhatsappTravelView, ContactView, SearchView
 
 urlpatterns = [
     path("", OverView.as_view(), name="overview"),
@@ -11,4 +15,26 @@ urlpatterns = [
     path("gallery/", GalleryView.as_view(), name="gallery"),
     path('travel-gallery/<uuid:travel_uuid>/', TravelGalleryView.as_view(), name='travel_gallery'),
     path("contact/", ContactView.as_view(), name="contact"),
-]
\ No newline at end of file
+    path("search/", SearchView.as_view(), name="search"),
+]
+
+# Served under ASGI in place of urlpatterns, see mvm.asgi_urls.
+async_urlpatterns = [
+    path("", AsyncOverView.as_view(), name="overview"),
+    path("travels/", AsyncTravelView.as_view(), name="my-travels"),
+    path('travel-details/<uuid:travel_uuid>/', AsyncTravelDetailView.as_view(), name='travel_details'),
+    path('whatsapp-travel/<uuid:travel_uuid>/', WhatsappTravelView.as_view(), name='whatsapp_travel'),
+    path('whatsapp-general/', WhatsappGeneralView.as_view(), name='whatsapp-general'),
+    path("gallery/", AsyncGalleryView.as_view(), name="gallery"),
+    path('travel-gallery/<uuid:travel_uuid>/', AsyncTravelGalleryView.as_view(), name='travel_gallery'),
+    path("contact/", AsyncContactView.as_view(), name="contact"),
+    path("search/", SearchView.as_view(), name="search"),
+]
+
+api_urlpatterns = [
+    path("portal/", PortalAPIView.as_view(), name="portal"),
+    path("travels/", TravelListAPIView.as_view(), name="travel-list"),
+    path("travels/<uuid:travel_uuid>/", TravelDetailAPIView.as_view(), name="travel-detail"),
+    path("gallery/", GalleryListAPIView.as_view(), name="gallery-list"),
+    path("gallery/<uuid:travel_uuid>/", GalleryDetailAPIView.as_view(), name="gallery-detail"),
+]
@@ -1,16 +1,42 @@
-from apps.travel.models import Portal
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Concat
+from django.http.request import split_domain_port
 
+from apps.travel.cache import featured_reviews_cache, portal_context_cache
+from apps.travel.models import Portal, Reservation, Travel
+from mvm.utils.images import media_url
 
-def get_portal_data():
-    portal = Portal.objects.filter(is_active=True).prefetch_related(
-        "social_media_accounts"
-    ).first()
-    return portal
 
-def get_portal_with_social_media_data():
-    portal = get_portal_data()
-    social_media_accounts = list(portal.social_media_accounts.values("name", "url"))
+def get_portal_data(portal_id=None, host=None):
+    """
+    The active portal ``portal_id``, or the one served on ``host``; the first
+    active portal by default.
+    """
+    portals = Portal.objects.filter(is_active=True).prefetch_related("social_media_accounts")
+    if portal_id is not None:
+        portals = portals.filter(pk=portal_id)
+    if host is not None:
+        # The portal of the host first, the default one otherwise, in one query.
+        portals = portals.order_by(Case(When(domain=host, then=Value(0)), default=Value(1)), "pk")
+    return portals.first()
+
+
+def build_portal_with_social_media_data(portal_id=None, host=None):
+    portal = get_portal_data(portal_id, host)
+    if portal is None:
+        return {"id": None, "portal": None, "social_media_accounts": [], "last_modified": None}
+    social_media_accounts = [
+        {"name": account.name, "url": account.url}
+        for account in portal.social_media_accounts.all()
+    ]
+    last_modified = max(
+        filter(None, [portal.updated_at] + [account.updated_at for account in portal.social_media_accounts.all()]),
+        default=None,
+    )
     data = {
+        "id": portal.pk,
         "portal": {
             "name": portal.name,
             "address": portal.address,
@@ -18,6 +44,115 @@ def get_portal_with_social_media_data():
             "mobile_phone": portal.mobile_phone,
             "theme_color": portal.theme_color,
         },
-        "social_media_accounts": social_media_accounts
+        "social_media_accounts": social_media_accounts,
+        "last_modified": last_modified,
     }
     return data
+
+
+def get_portal_with_social_media_data(portal_id=None):
+    """
+    Return the context of the portal ``portal_id`` shared by every public
+    page, of the first active portal by default.
+
+    The data is served from ``portal_context_cache`` and invalidated by the
+    Portal and SocialMediaAccount signals. A new top-level dict is returned
+    because callers add their own keys (e.g. ``reason``) to it.
+    """
+    data = portal_context_cache.get_or_set(
+        f"portal:{portal_id}", lambda: build_portal_with_social_media_data(portal_id)
+    )
+    return dict(data)
+
+
+def get_request_portal(request):
+    """
+    Portal context of the host of ``request``, see ``PortalMiddleware``.
+
+    Contexts are cached by host in ``portal_context_cache``, so a request
+    resolves its portal without a query, and dropped whenever a portal
+    changes, e.g. its domain. The returned dict is shared, copy it to add keys.
+    """
+    host, _ = split_domain_port(request.get_host())
+    host = host.lower()
+    return portal_context_cache.get_or_set(
+        f"host:{host}", lambda: build_portal_with_social_media_data(host=host)
+    )
+
+
+def build_featured_reviews(portal_id=None):
+    reservations = Reservation.objects.filter(
+        booking_confirmed=True,
+        passenger__deleted_at__isnull=True,
+    )
+    if portal_id is not None:
+        reservations = reservations.filter(travel__in=Travel.all_objects.for_portal(portal_id).values("pk"))
+    reviews_data = list(
+        reservations.exclude(
+            review="",
+        ).annotate(
+            full_name=Concat(
+                F("passenger__first_name"),
+                Value(" "),
+                F("passenger__last_name"),
+                output_field=CharField(),
+            ),
+        ).order_by(
+            "-rating", "-updated_at"
+        ).values(
+            "full_name", "review", "passenger__photo", "rating"
+        )[:settings.FEATURED_REVIEWS_LIMIT]
+    )
+    for review in reviews_data:
+        review["photo"] = media_url(review.pop("passenger__photo"))
+    return reviews_data
+
+
+def get_featured_reviews(portal_id=None):
+    """
+    Return the testimonials of the overview page of the portal ``portal_id``.
+
+    At most ``FEATURED_REVIEWS_LIMIT`` confirmed reservations of the travels of
+    the portal with a non-empty review, ranked by rating and recency. The list
+    is cached and invalidated whenever reservations or passengers change.
+    """
+    return featured_reviews_cache.get_or_set(
+        f"overview:{portal_id}", lambda: build_featured_reviews(portal_id)
+    )
+
+
+async def aget_featured_reviews(portal_id=None):
+    """Async version of ``get_featured_reviews``."""
+    return await sync_to_async(get_featured_reviews)(portal_id)
+
+
+class YearGroupedTravels:
+    """
+    Travel rows grouped by the year of their start date.
+
+    Rows must arrive ordered by start date descending, as the database returns
+    them, so the groups are built in a single pass, newest year first, without
+    sorting. The cover image is turned into a URL in the same pass. Only plain
+    dicts and lists are kept, so instances can be stored in the cache as-is.
+
+    Attributes:
+        groups (dict): Maps each year to the list of its travel rows.
+    """
+
+    def __init__(self, rows=()):
+        self.groups = {}
+        for row in rows:
+            self.add(row)
+
+    def add(self, row):
+        row["cover_image"] = media_url(row["cover_image"])
+        self.groups.setdefault(row["year"], []).append(row)
+
+    def items(self):
+        return self.groups.items()
+
+    def first_year(self):
+        return next(iter(self.groups), None)
+
+    def __len__(self):
+        return len(self.groups)
@@ -1,369 +1,343 @@
-from urllib.parse import quote_plus
+from datetime import MAXYEAR, MINYEAR
+from urllib.parse import quote_plus, urlencode
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models.functions import Concat, ExtractYear
 from django.shortcuts import render
-from django.views.generic import View, ListView, DetailView
-from django.db.models import OuterRef, Case, When, BooleanField, F, Value, CharField, ExpressionWrapper, IntegerField
-from apps.travel.models import Travel, Reservation
-from mvm.utils.subqueries import SubqueryCount
 from django.utils import timezone
-import itertools
+from django.views.generic import View, ListView, DetailView
+from django.db.models import Prefetch
+from django.utils.decorators import method_decorator
+from apps.travel.cache import listing_page_tags, overview_page_tags, page_cache, travel_page_tags
+from apps.travel.conditions import (
+    conditional_page,
+    gallery_validators,
+    overview_validators,
+    travel_detail_validators,
+    travel_gallery_validators,
+    travels_validators,
+)
+from apps.travel.models import Travel, TravelDestination, TravelImage
+from apps.travel.notifications import submit_contact_message
 from django.http import Http404, HttpResponseRedirect
 
-from apps.travel.utils import get_portal_with_social_media_data, get_portal_data
-from apps.authentication.models import User
+from apps.travel.utils import get_featured_reviews, YearGroupedTravels
+from mvm.utils.images import media_url
+from mvm.utils.pagination import InvalidCursor, KeysetPaginator
 
 
+@method_decorator(conditional_page(overview_validators), name="dispatch")
+@method_decorator(page_cache.cache_page("overview", overview_page_tags), name="dispatch")
 class OverView(View):
     """
     OverView class based view
     """
 
-    def get(self, request, *args, **kwargs):
-
-        travels = Travel.objects.filter(
-            cancelled=False,
-            is_active=True,
-            start_date__gt=timezone.now()
-        ).annotate(
-            passengers_count=SubqueryCount(
-                Reservation.objects.filter(
-                    travel__pk=OuterRef("pk"),
-                    booking_confirmed=True,
-                )
-            ),
-            is_travel_full=Case(
-                When(
-                    passengers_count__gte=F('max_passengers'), then=True
-                ),
-                When(
-                    is_capacity_full=True, then=True
-                ),
-                default=False,
-                output_field=BooleanField()
-            ),
-        ).order_by(
+    def get_travels(self):
+        return Travel.objects.upcoming().for_portal(self.request.portal["id"]).order_by(
             "-start_date"
+        ).values(
+            "uuid", "name", "start_date", "highlight_feature", "cover_image", "all_inclusive", "is_travel_full",
         )[:9]
 
-        travels_data = travels.values(
-            "uuid", "name", "start_date", "highlight_feature", "cover_image", "all_inclusive", "is_travel_full",
-        )
+    def get(self, request, *args, **kwargs):
+
+        travels_data = list(self.get_travels())
         for travel in travels_data:
-            travel["cover_image"] = settings.MEDIA_URL + str(travel["cover_image"])
-
-        reviews_data = Reservation.objects.filter(
-            review__isnull=False,
-            booking_confirmed=True
-        ).annotate(
-            full_name=Concat(
-                F("passenger__first_name"),
-                Value(" "),
-                F("passenger__last_name"),
-                output_field=CharField(),
-            ),
-        ).values(
-            "full_name", "review", "passenger__photo", "rating"
-        )
-        for review in reviews_data:
-            review["photo"] = settings.MEDIA_URL + str(review["passenger__photo"])
-            del review["passenger__photo"]
+            travel["cover_image"] = media_url(travel["cover_image"])
 
-        portal_data = get_portal_with_social_media_data()
         data = {
-            "travels": list(travels_data),
-            "portal": portal_data["portal"],
-            "social_media_accounts": portal_data["social_media_accounts"],
-            "reviews": list(reviews_data)
+            "travels": travels_data,
+            "portal": request.portal["portal"],
+            "social_media_accounts": request.portal["social_media_accounts"],
+            "reviews": get_featured_reviews(request.portal["id"])
         }
         return render(request, "travel/overview.html", data)
 
 
-class TravelView(ListView):
+class YearGroupedListMixin:
+    """
+    Renders a travel listing as keyset-paginated pages grouped by year.
+
+    Pages are seeked on ``(start_date, id)``, so a page costs the same no matter
+    how many travels come before it. Descending start dates are also descending
+    years, so the database returns each page already in group order. ``?year=`` restricts the listing to one year
+    and ``?cursor=`` continues after the last travel of the previous page.
+    """
+    per_page = 24
+    list_fields = ()
+
+    def get_year_index(self, queryset):
+        """Distinct years of the listing, newest first, for the year filter."""
+        return [day.year for day in queryset.dates("start_date", "year", order="DESC")]
+
+    def get_selected_year(self):
+        """The ``?year=`` filter, or None when it is missing or not a date year."""
+        try:
+            year = int(self.request.GET.get("year", ""))
+        except ValueError:
+            return None
+        return year if MINYEAR <= year <= MAXYEAR else None
+
+    def get_page_url(self, cursor, year):
+        params = {"cursor": cursor}
+        if year:
+            params["year"] = year
+        return f"{self.request.path}?{urlencode(params)}"
+
+    def get_paginator(self, queryset, selected_year):
+        if selected_year:
+            queryset = queryset.filter(start_date__year=selected_year)
+        return KeysetPaginator(queryset.values(*self.list_fields, "id"), self.per_page)
+
+    def get_listing_data(self, page, years, selected_year):
+        travels_data_grouped = YearGroupedTravels(page)
+
+        # The first group continues the last year of the previous page.
+        continued_year = None
+        if page.last_row:
+            last_year = page.last_row["start_date"].year
+            if last_year == travels_data_grouped.first_year():
+                continued_year = last_year
+
+        return {
+            "travels": travels_data_grouped,
+            "years": years,
+            "selected_year": selected_year,
+            "continued_year": continued_year,
+            "next_url": self.get_page_url(page.next_cursor, selected_year) if page.has_next() else None,
+        }
+
+    def render_to_response(self, context, **response_kwargs):
+        queryset = context["object_list"]
+        years = self.get_year_index(queryset)
+        selected_year = self.get_selected_year()
+        try:
+            page = self.get_paginator(queryset, selected_year).page(self.request.GET.get("cursor"))
+        except InvalidCursor:
+            raise Http404
+
+        data = self.get_listing_data(page, years, selected_year)
+        data["portal"] = context["portal"]
+        data["social_media_accounts"] = context["social_media_accounts"]
+        return self.response_class(
+            request=self.request,
+            template=self.get_template_names(),
+            context=data,
+            **response_kwargs
+        )
+
+
+@method_decorator(conditional_page(travels_validators), name="dispatch")
+@method_decorator(page_cache.cache_page("my-travels", listing_page_tags), name="dispatch")
+class TravelView(YearGroupedListMixin, ListView):
     """
     TravelView class based view
     """
     model = Travel  # Set the model for the ListView
     template_name = 'travel/travels.html'  # Set the template name
+    list_fields = (
+        "uuid", "name", "start_date", "highlight_feature", "cover_image", "all_inclusive", "is_travel_full", "year"
+    )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        data = get_portal_with_social_media_data()
-        context["portal"] = data["portal"]
-        context["social_media_accounts"] = data["social_media_accounts"]
+        context["portal"] = self.request.portal["portal"]
+        context["social_media_accounts"] = self.request.portal["social_media_accounts"]
         return context
 
     def get_queryset(self):
-        return super().get_queryset().filter(
-            cancelled=False,
-            is_active=True,
-            start_date__gt=timezone.now()
-        ).annotate(
-            passengers_count=SubqueryCount(
-                Reservation.objects.filter(
-                    travel__pk=OuterRef("pk"),
-                    booking_confirmed=True,
-                )
-            ),
-            is_travel_full=Case(
-                When(
-                    passengers_count__gte=F('max_passengers'), then=True
-                ),
-                When(
-                    is_capacity_full=True, then=True
-                ),
-                default=False,
-                output_field=BooleanField()
-            ),
-            year=ExpressionWrapper(ExtractYear("start_date"), output_field=IntegerField())
-        ).order_by("-start_date")
+        return super().get_queryset().upcoming().for_portal(self.request.portal["id"]).with_year()
 
-    def render_to_response(self, context, **response_kwargs):
-        travels_data = context["object_list"].values(
-            "uuid", "name", "start_date", "highlight_feature", "cover_image", "all_inclusive", "is_travel_full", "year"
-        )
-        travels_data_sorted = sorted(travels_data, key=lambda x: x["year"])
-        travels_data_grouped = {}
-        for year, group in itertools.groupby(travels_data_sorted, key=lambda x: x["year"]):
-            travels_data_grouped[year] = list(group)
-        travels_data_grouped = {k: travels_data_grouped[k] for k in sorted(travels_data_grouped.keys(), reverse=True)}
 
-        years = sorted(set(travel["year"] for travel in travels_data), reverse=True)
-        for travel in travels_data:
-            travel["cover_image"] = settings.MEDIA_URL + str(travel["cover_image"])
+class TravelPageMixin:
+    """
+    Renders one travel from a single fetch of the travel and its relations.
 
-        data = {
-            "travels": travels_data_grouped,
-            "years": years,
-            "portal": context["portal"],
-            "social_media_accounts": context["social_media_accounts"],
+    ``get_queryset`` declares every relation the page needs as a prefetch, the
+    travel is fetched once in ``get`` and ``get_travel_data`` serializes it
+    from the prefetched objects without further queries. Views extend the
+    fields every travel page shows with their own.
+    """
+    not_found_template = 'travel/detail_not_found.html'
+    not_found_reason = "Viaje no disponible"
+    slug_field = 'uuid'
+    slug_url_kwarg = 'travel_uuid'
+
+    def is_available(self, travel):
+        return True
+
+    def get_travel_data(self, travel):
+        return {
+            "uuid": str(travel.uuid),
+            "name": travel.name,
+            "cover_image": media_url(travel.cover_image),
         }
-        return self.response_class(
-            request=self.request,
-            template=self.get_template_names(),
-            context=data,
-            **response_kwargs
-        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["travel"] = self.get_travel_data(self.object)
+        context["portal"] = self.request.portal["portal"]
+        context["social_media_accounts"] = self.request.portal["social_media_accounts"]
+        return context
+
+    def get(self, request, *args, **kwargs):
+        try:
+            self.object = self.get_object()
+        except Http404:
+            self.object = None
+        if self.object is None or not self.is_available(self.object):
+            context = dict(request.portal, reason=self.not_found_reason)
+            return render(request, self.not_found_template, context)
+
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
 
 
-class TravelDetailView(DetailView):
+@method_decorator(conditional_page(travel_detail_validators), name="dispatch")
+@method_decorator(page_cache.cache_page("travel_details", travel_page_tags), name="dispatch")
+class TravelDetailView(TravelPageMixin, DetailView):
     """
     TravelDetailView class based view
     """
     model = Travel
     template_name = 'travel/details.html'
-    not_found_template = 'travel/detail_not_found.html'
-    slug_field = 'uuid'
-    slug_url_kwarg = 'travel_uuid'
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(
-            cancelled=False,
-            is_active=True,
-            start_date__gt=timezone.now()
-        ).annotate(
-            passengers_count=SubqueryCount(
-                Reservation.objects.filter(
-                    travel__pk=OuterRef("pk"),
-                    booking_confirmed=True,
-                )
-            ),
-            is_travel_full=Case(
-                When(
-                    passengers_count__gte=F('max_passengers'), then=True
-                ),
-                When(
-                    is_capacity_full=True, then=True
-                ),
-                default=False,
-                output_field=BooleanField()
-            ),
-        ).prefetch_related(
+        queryset = super().get_queryset().upcoming().for_portal(
+            self.request.portal["id"]
+        ).with_availability().prefetch_related(
             "travel_images",
-            "travel_destinations",
-        ).order_by(
-            "-start_date"
+            Prefetch(
+                "travel_destinations",
+                queryset=TravelDestination.objects.order_by("start_date"),
+            ),
         )
         return queryset
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        travel = self.get_object()
-
+    def get_travel_data(self, travel):
         start_date = travel.start_date.strftime("%d de %B")
         end_date = travel.end_date.strftime("%d de %B")
         date_range = f"Del {start_date} al {end_date}"
 
         travel_data = {
-            "uuid": str(travel.uuid),
-            "name": travel.name,
+            **super().get_travel_data(travel),
             "date": date_range,
             "description": travel.description,
             "highlight_feature": travel.highlight_feature,
-            "cover_image": settings.MEDIA_URL + str(travel.cover_image),
-            "counter": travel.max_passengers - travel.passengers_count,
+            "counter": travel.available_seats,
             "inclusions": travel.inclusions,
             "restrictions": travel.restrictions,
             "all_inclusive": travel.all_inclusive,
             "is_travel_full": travel.is_travel_full,
-            "travel_images": [],
+            "travel_images": [
+                media_url(travel_image.image) for travel_image in travel.travel_images.all()
+            ],
             "travel_destinations": [],
         }
 
-        travel_images = list(travel.travel_images.values("image"))
-        for travel_image in travel_images:
-            travel_data["travel_images"].append(
-                settings.MEDIA_URL + str(travel_image.get("image"))
-            )
-
-        travel_destinations = list(travel.travel_destinations.order_by(
-            "start_date"
-        ).values("name", "image", "start_date", "end_date", "description"))
-
-        for travel_destination in travel_destinations:
-            start_date = travel_destination.get("start_date").strftime("%d")
-            end_date = travel_destination.get("end_date").strftime("%d de %B")
+        for travel_destination in travel.travel_destinations.all():
+            start_date = travel_destination.start_date.strftime("%d")
+            end_date = travel_destination.end_date.strftime("%d de %B")
             date_range = f"Del {start_date} al {end_date}"
 
             travel_data["travel_destinations"].append(
                 {
-                    "name": travel_destination.get("name"),
+                    "name": travel_destination.name,
                     "date": date_range,
-                    "image": settings.MEDIA_URL + str(travel_destination.get("image")),
-                    "description": travel_destination.get("description", None)
+                    "image": media_url(travel_destination.image),
+                    "description": travel_destination.description,
                 }
             )
+        return travel_data
 
-        portal_data = get_portal_with_social_media_data()
 
-        context["travel"] = travel_data
-        context["portal"] = portal_data["portal"]
-        context["social_media_accounts"] = portal_data["social_media_accounts"]
-        print(context)
-        return context
-
-    def get(self, request, *args, **kwargs):
-        try:
-            self.object = self.get_object()
-        except Http404:
-            context = get_portal_with_social_media_data()
-            context["reason"] = "Viaje no disponible"
-            return render(request, self.not_found_template, context)
-
-        context = self.get_context_data(object=self.object)
-        return self.render_to_response(context)
-
-
-class GalleryView(ListView):
+@method_decorator(conditional_page(gallery_validators), name="dispatch")
+@method_decorator(page_cache.cache_page("gallery", listing_page_tags), name="dispatch")
+class GalleryView(YearGroupedListMixin, ListView):
     """
     GalleryView class based view
     """
     model = Travel  # Set the model for the ListView
     template_name = 'travel/gallery.html'  # Set the template name
+    list_fields = ("uuid", "name", "start_date", "cover_image", "year")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        data = get_portal_with_social_media_data()
-        context["portal"] = data["portal"]
-        context["social_media_accounts"] = data["social_media_accounts"]
+        context["portal"] = self.request.portal["portal"]
+        context["social_media_accounts"] = self.request.portal["social_media_accounts"]
         return context
 
     def get_queryset(self):
-        return super().get_queryset().filter(
-            cancelled=False,
-            end_date__lt=timezone.now()
-        ).annotate(
-            year=ExpressionWrapper(ExtractYear("start_date"), output_field=IntegerField())
-        )
-
-    def render_to_response(self, context, **response_kwargs):
-        travels_data = context["object_list"].values(
-            "uuid", "name", "start_date", "cover_image", "year"
-        )
-        travels_data_sorted = sorted(travels_data, key=lambda x: x["year"])
-        travels_data_grouped = {}
-        for year, group in itertools.groupby(travels_data_sorted, key=lambda x: x["year"]):
-            travels_data_grouped[year] = list(group)
-        travels_data_grouped = {k: travels_data_grouped[k] for k in sorted(travels_data_grouped.keys(), reverse=True)}
+        return super().get_queryset().past_for_gallery().for_portal(self.request.portal["id"]).with_year()
 
-        years = sorted(set(travel["year"] for travel in travels_data), reverse=True)
-        for travel in travels_data:
-            travel["cover_image"] = settings.MEDIA_URL + str(travel["cover_image"])
 
-        data = {
-            "travels": travels_data_grouped,
-            "years": years,
-            "portal": context["portal"],
-            "social_media_accounts": context["social_media_accounts"],
-        }
-        return self.response_class(
-            request=self.request,
-            template=self.get_template_names(),
-            context=data,
-            **response_kwargs
-        )
-
-
-class TravelGalleryView(DetailView):
+@method_decorator(conditional_page(travel_gallery_validators), name="dispatch")
+@method_decorator(page_cache.cache_page("travel_gallery", travel_page_tags), name="dispatch")
+class TravelGalleryView(TravelPageMixin, DetailView):
     """
     TravelGalleryView class based view
     """
     model = Travel
     template_name = 'travel/travel_galery.html'
-    not_found_template = 'travel/detail_not_found.html'
-    slug_field = 'uuid'
-    slug_url_kwarg = 'travel_uuid'
+    not_found_reason = "Oops! Imagenes no se han cargado"
 
     def get_queryset(self):
-        return super().get_queryset().filter(
-            cancelled=False,
-            end_date__lt=timezone.now()
-        ).annotate(
-            year=ExpressionWrapper(ExtractYear("start_date"), output_field=IntegerField())
+        return super().get_queryset().past_for_gallery().for_portal(
+            self.request.portal["id"]
+        ).prefetch_related(
+            Prefetch(
+                "travel_images",
+                queryset=TravelImage.objects.filter(is_gallery_image=True),
+                to_attr="gallery_images",
+            ),
         )
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        travel = self.get_object()
+    def is_available(self, travel):
+        return bool(travel.gallery_images or travel.url)
 
+    def get_travel_data(self, travel):
         start_date = travel.start_date.strftime("%d de %B de %Y")
+        travel_images = [media_url(travel_image.image) for travel_image in travel.gallery_images]
 
-        travel_data = {
-            "uuid": str(travel.uuid),
-            "name": travel.name,
+        return {
+            **super().get_travel_data(travel),
             "start_date": start_date,
-            "cover_image": settings.MEDIA_URL + str(travel.cover_image),
-            "travel_images": [],
+            "travel_images": [travel_images[i::3] for i in range(3)],
             "url": travel.url
         }
 
-        travel_images = list(travel.travel_images.filter(is_gallery_image=True).values("image"))
-        for travel_image in travel_images:
-            travel_data["travel_images"].append(
-                settings.MEDIA_URL + str(travel_image.get("image"))
-            )
-        travel_data["travel_images"] = [travel_data["travel_images"][i::3] for i in range(3)]
 
-        portal_data = get_portal_with_social_media_data()
-        context["travel"] = travel_data
-        context["portal"] = portal_data["portal"]
-        context["social_media_accounts"] = portal_data["social_media_accounts"]
-        return context
+class SearchView(View):
+    """
+    Full-text search over the public travels and their destinations.
+
+    Upcoming travels link to their details and past ones to their gallery.
+    """
+    template_name = 'travel/search.html'
+    max_query_length = 100
 
     def get(self, request, *args, **kwargs):
-        try:
-            self.object = self.get_object()
-            if not self.object.travel_images.filter(is_gallery_image=True).exists() and not self.object.url:
-                raise Http404
-        except Http404:
-            context = get_portal_with_social_media_data()
-            context["reason"] = "Oops! Imagenes no se han cargado"
-            return render(request, self.not_found_template, context)
+        query = request.GET.get("q", "").strip()[:self.max_query_length]
+        travels = []
+        if query:
+            travels = list(
+                Travel.objects.public().for_portal(request.portal["id"]).search(query).values(
+                    "uuid", "name", "start_date", "highlight_feature", "cover_image", "all_inclusive",
+                    "is_travel_full",
+                )[:settings.SEARCH_RESULTS_LIMIT]
+            )
+            today = timezone.now().date()
+            for travel in travels:
+                travel["cover_image"] = media_url(travel["cover_image"])
+                travel["is_upcoming"] = travel["start_date"] > today
 
-        context = self.get_context_data(object=self.object)
-        return self.render_to_response(context)
+        data = {
+            "query": query,
+            "travels": travels,
+            "portal": request.portal["portal"],
+            "social_media_accounts": request.portal["social_media_accounts"],
+        }
+        return render(request, self.template_name, data)
 
 
 class WhatsappTravelView(DetailView):
@@ -385,6 +359,9 @@ class WhatsappTravelView(DetailView):
     slug_field = 'uuid'
     slug_url_kwarg = 'travel_uuid'
 
+    def get_queryset(self):
+        return super().get_queryset().for_portal(self.request.portal["id"])
+
     def get(self, request, *args, **kwargs):
         """
         GET method to process the HTTP request.
@@ -401,7 +378,7 @@ class WhatsappTravelView(DetailView):
         instance = self.get_object()
 
         # Get portal info
-        portal = get_portal_data()
+        portal = request.portal["portal"]
 
         # Get the full URL of the previous page
         referer_url = request.META.get('HTTP_REFERER', '')
@@ -415,7 +392,7 @@ class WhatsappTravelView(DetailView):
         )
 
         # Construct the WhatsApp URL with the encoded message
-        url_whatsapp = f"https://wa.me/502{portal.mobile_phone}?text={quote_plus(message)}"
+        url_whatsapp = f"https://wa.me/502{portal['mobile_phone']}?text={quote_plus(message)}"
 
         # Redirect the user to WhatsApp
         return HttpResponseRedirect(url_whatsapp)
@@ -460,7 +437,7 @@ class WhatsappGeneralView(View):
         message = "Hola, ¿Quisiera información de sus próximos viajes?"
 
         # Construct the WhatsApp URL with the encoded message
-        url_whatsapp = f"https://wa.me/50233570444?text={quote_plus(message)}"
+        url_whatsapp = f"https://wa.me/502{request.portal['portal']['mobile_phone']}?text={quote_plus(message)}"
 
         # Redirect the user to WhatsApp
         return HttpResponseRedirect(url_whatsapp)
@@ -472,10 +449,9 @@ class ContactView(View):
     template_name = 'contact.html'  # Set the template name
 
     def get(self, request, *args, **kwargs):
-        portal_data = get_portal_with_social_media_data()
         data = {
-            "portal": portal_data["portal"],
-            "social_media_accounts": portal_data["social_media_accounts"],
+            "portal": request.portal["portal"],
+            "social_media_accounts": request.portal["social_media_accounts"],
         }
         return render(request, "contact.html", data)
 
@@ -485,33 +461,16 @@ class ContactView(View):
         subject = request.POST.get('subject')
         message = request.POST.get('message')
 
-        message = (f"Nombre: {name} \n\n"
-                   f"Correo: {email} \n\n"
-                   f"Mensaje: {message}")
-
-        recipient_list = list(
-            User.objects.all().values_list("email", flat=True)
-        )
-
-        # Envía el correo electrónico
-        send_mail(
-            subject,  # Asunto del correo
-            message,  # Cuerpo del correo
-            settings.EMAIL_HOST_USER,  # Dirección de correo electrónico del remitente (configurada en settings.py)
-            recipient_list,
-            # Lista de destinatarios (puedes usar una dirección de correo electrónico o una lista de ellas)
-            fail_silently=False,  # Indica si se debe elevar una excepción en caso de error al enviar el correo
-        )
+        # Stored first and emailed in batches by the run_worker command.
+        submit_contact_message(name, email, subject, message)
 
-        portal_data = get_portal_with_social_media_data()
         data = {
-            "portal": portal_data["portal"],
-            "social_media_accounts": portal_data["social_media_accounts"],
+            "portal": request.portal["portal"],
+            "social_media_accounts": request.portal["social_media_accounts"],
         }
         return render(request, "contact.html", data)
 
 
 def no_found_handle(request, exception):
-    context = get_portal_with_social_media_data()
-    context["reason"] = "No se encontraron resultados"
+    context = dict(request.portal, reason="No se encontraron resultados")
     return render(request, 'travel/detail_not_found.html', context)
\ No newline at end of file
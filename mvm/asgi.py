@@ -2,6 +2,8 @@
 ASGI config for mvm project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests are resolved against ``settings.ASGI_URLCONF``, which serves the
+public pages with their async views.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
@@ -9,8 +11,22 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mvm.settings')
 
-application = get_asgi_application()
+
+class AsyncViewsASGIHandler(ASGIHandler):
+    """
+    ASGI handler routing requests with ``settings.ASGI_URLCONF``.
+    """
+
+    async def get_response_async(self, request):
+        request.urlconf = settings.ASGI_URLCONF
+        return await super().get_response_async(request)
+
+
+django.setup(set_prefix=False)
+application = AsyncViewsASGIHandler()
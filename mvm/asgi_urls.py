@@ -0,0 +1,23 @@
+"""mvm URL Configuration under ASGI
+
+Same routes as ``mvm.urls``, with the public travel pages served by their
+async views. Selected by the ASGI handler in ``mvm.asgi`` through the
+``ASGI_URLCONF`` setting.
+"""
+from django.urls import include, path
+
+from apps.travel.urls import async_urlpatterns as async_urlpatterns_travel
+from mvm import urls
+
+urlpatterns = [
+    path(
+        "",
+        include(
+            (async_urlpatterns_travel, "travels"),
+            namespace="travels",
+        ),
+    ),
+    *(pattern for pattern in urls.urlpatterns if getattr(pattern, "namespace", None) != "travels"),
+]
+
+handler404 = urls.handler404
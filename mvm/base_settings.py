@@ -81,6 +81,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 INSTALLED_APPS_MVM = [
@@ -91,6 +92,7 @@ INSTALLED_APPS_MVM = [
 
 INSTALLED_APPS_THIRD_PARTY = [
     "django_ses",
+    "rest_framework",
     "dj_rest_auth",
     "dj_rest_auth.registration",
     "rest_framework.authtoken",
@@ -103,8 +105,11 @@ INSTALLED_APPS_THIRD_PARTY = [
 INSTALLED_APPS += INSTALLED_APPS_MVM + INSTALLED_APPS_THIRD_PARTY
 
 MIDDLEWARE = [
+    "mvm.utils.instrumentation.QueryInstrumentationMiddleware",
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.travel.middleware.PortalMiddleware",
+    "mvm.utils.static_site.StaticSiteMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -115,6 +120,49 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = 'mvm.urls'
+# Same routes with the public pages served by async views, used under ASGI
+ASGI_URLCONF = 'mvm.asgi_urls'
+
+# Expose per-request query counts and timings in a Server-Timing header
+SERVER_TIMING_ENABLED = DEBUG
+
+# Logging
+# https://docs.djangoproject.com/en/4.0/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        # One JSON line per request with its query count and timings
+        "mvm.utils.instrumentation": {
+            "handlers": ["console"],
+            "level": SECRETS.get("MVM_APP_INSTRUMENTATION_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# Read-only JSON API
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
+    "DEFAULT_VERSION": "v1",
+    "ALLOWED_VERSIONS": ("v1",),
+    # Public data: no session or token lookup on API requests
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
+    "UNAUTHENTICATED_USER": None,
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_PARSER_CLASSES": ["rest_framework.parsers.JSONParser"],
+    "DEFAULT_PAGINATION_CLASS": "mvm.utils.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": 24,
+}
 
 TEMPLATES = [
     {
@@ -207,16 +255,87 @@ STATICFILES_DIRS = [
 
 STATIC_ROOT = Path(BASE_DIR / "static_root")
 
+# Prerendered public pages, written by the build_static_site command
+STATIC_SITE_ROOT = Path(BASE_DIR / "static_site")
+# Seconds a rebuild waits after a change, changes close together share one build
+STATIC_SITE_BUILD_DELAY = 30
+
 # Media
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resized WebP copies of uploaded images, served through srcset
+IMAGE_RENDITIONS_ENABLED = True
+IMAGE_RENDITION_WIDTHS = (160, 320, 640, 1280)
+IMAGE_RENDITION_QUALITY = 80
+# Seconds before pages look again for the renditions of a new upload
+IMAGE_RENDITION_MISSING_TIMEOUT = 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# The default cache is the shared tier of the portal, testimonials and contact
+# recipients caches. Their invalidation must reach every gunicorn and job worker
+# process, so outside DEBUG it defaults to files shared by the processes of this
+# host. When the processes run on several hosts, use e.g.
+# "django.core.cache.backends.redis.RedisCache" with "redis://127.0.0.1:6379".
+LOCAL_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+FILE_CACHE_BACKEND = "django.core.cache.backends.filebased.FileBasedCache"
+
+CACHES = {
+    "default": {
+        "BACKEND": SECRETS.get("MVM_APP_CACHE_BACKEND", LOCAL_CACHE_BACKEND if DEBUG else FILE_CACHE_BACKEND),
+        "LOCATION": SECRETS.get("MVM_APP_CACHE_LOCATION", "mvm-default" if DEBUG else str(BASE_DIR / "cache" / "default")),
+    },
+    # Rendered public pages and their validators, purged by tag from any process.
+    "pages": {
+        "BACKEND": SECRETS.get("MVM_APP_PAGE_CACHE_BACKEND", LOCAL_CACHE_BACKEND if DEBUG else FILE_CACHE_BACKEND),
+        "LOCATION": SECRETS.get("MVM_APP_PAGE_CACHE_LOCATION", "mvm-pages" if DEBUG else str(BASE_DIR / "cache" / "pages")),
+    },
+}
+
+# Refuse process-local cache backends for the caches invalidated across processes
+REQUIRE_SHARED_CACHES = not DEBUG
+
+# Full-page cache for anonymous visitors
+PAGE_CACHE_ALIAS = "pages"
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Seconds the portal context lives in the process-local and shared cache tiers
+PORTAL_CACHE_LOCAL_TIMEOUT = 30
+PORTAL_CACHE_SHARED_TIMEOUT = 60 * 60 * 24
+
+# Testimonials shown on the overview page, best rated and most recent first
+FEATURED_REVIEWS_LIMIT = 12
+FEATURED_REVIEWS_CACHE_LOCAL_TIMEOUT = 60
+FEATURED_REVIEWS_CACHE_SHARED_TIMEOUT = 60 * 60 * 24
+
+# Travel search: Spanish stemming with accents removed, created by the
+# travel migrations. Name typos fall back to trigram word similarity.
+SEARCH_CONFIG = "spanish_unaccent"
+SEARCH_RESULTS_LIMIT = 24
+
+# Background jobs run by the run_worker management command
+JOB_WORKER_PROCESSES = 2
+JOB_VISIBILITY_TIMEOUT = 60 * 5
+JOB_POLL_INTERVAL = 1
+JOB_MAX_ATTEMPTS = 5
+# Seconds before the first retry, doubled after every failed attempt
+JOB_RETRY_BACKOFF = 30
+
+# Contact form messages are emailed in batches by the background worker
+CONTACT_DISPATCH_DELAY = 10
+CONTACT_DISPATCH_BATCH_SIZE = 50
+CONTACT_MESSAGE_MAX_ATTEMPTS = 5
+CONTACT_RECIPIENTS_CACHE_LOCAL_TIMEOUT = 60
+CONTACT_RECIPIENTS_CACHE_SHARED_TIMEOUT = 60 * 60 * 24
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
@@ -12,7 +12,10 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 from .base_settings import *
 
 MIDDLEWARE = [
+    "mvm.utils.instrumentation.QueryInstrumentationMiddleware",
     'django.middleware.security.SecurityMiddleware',
+    "apps.travel.middleware.PortalMiddleware",
+    "mvm.utils.static_site.StaticSiteMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
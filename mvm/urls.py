@@ -14,12 +14,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 from django.conf import settings
 from django.urls import include
 from django.conf.urls.static import static
 from django.contrib.auth import views as auth_views
-from apps.travel.urls import urlpatterns as urlpatterns_travel
+from apps.travel.urls import api_urlpatterns as api_urlpatterns_travel, urlpatterns as urlpatterns_travel
 
 urlpatterns = []
 
@@ -66,6 +66,14 @@ urlpatterns += (
                 namespace="travels",
             ),
         ),
+        # Read-only JSON API, versioned in the path, e.g. /api/v1/travels/
+        re_path(
+            r"^api/(?P<version>v1)/",
+            include(
+                (api_urlpatterns_travel, "api"),
+                namespace="api",
+            ),
+        ),
         path("admin/", admin.site.urls, name="admin"),
         path("__reload__/", include("django_browser_reload.urls")),
 
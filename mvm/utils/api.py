@@ -0,0 +1,93 @@
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from mvm.utils.images import media_url
+from mvm.utils.pagination import KeysetCursorPagination
+
+
+class MediaURLField(serializers.Field):
+    """Read-only field turning a stored file name into its URL."""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return media_url(value)
+
+
+class ValuesSerializer(serializers.Serializer):
+    """
+    Read-only serializer of ``.values()`` rows, with sparse fieldsets.
+
+    ``?fields=name,start_date`` keeps only the listed fields; unknown names are
+    rejected with a 400. Every kept field is read from the row under its
+    ``source``, so relations are selected as annotations, e.g. ``ArraySubquery``.
+    """
+    fields_param = "fields"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        value = request.query_params.get(self.fields_param) if request is not None else None
+        if not value:
+            return
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = requested - set(self.fields)
+        if unknown:
+            raise ValidationError({self.fields_param: [f"Unknown field(s): {', '.join(sorted(unknown))}."]})
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
+    @property
+    def value_fields(self):
+        """Columns to select with ``.values()`` for the kept fields."""
+        return [field.source for field in self.fields.values()]
+
+    def wants(self, name):
+        return name in self.fields
+
+
+class ValuesAPIMixin:
+    """
+    Selects ``.values()`` rows holding only the columns of the requested fields.
+    """
+
+    def annotate_fields(self, queryset, serializer):
+        """Annotate the requested fields that are not model columns."""
+        return queryset
+
+    def get_rows(self, serializer, *extra):
+        queryset = self.annotate_fields(self.get_queryset(), serializer)
+        return queryset.values(*dict.fromkeys([*serializer.value_fields, *extra]))
+
+
+class ValuesListAPIView(ValuesAPIMixin, GenericAPIView):
+    """
+    Lists the ``.values()`` rows of ``get_queryset()``, one page at a time.
+
+    Rows are serialized without building model instances.
+    """
+    pagination_class = KeysetCursorPagination
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        rows = self.paginate_queryset(self.get_rows(serializer, *self.pagination_class.keys))
+        return self.get_paginated_response([serializer.to_representation(row) for row in rows])
+
+
+class ValuesDetailAPIView(ValuesAPIMixin, GenericAPIView):
+    """
+    Returns one ``.values()`` row of ``get_queryset()``, related data included,
+    from a single query.
+    """
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        lookup = {self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        row = self.get_rows(serializer).filter(**lookup).first()
+        if row is None:
+            raise NotFound()
+        return Response(serializer.to_representation(row))
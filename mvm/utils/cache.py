@@ -0,0 +1,111 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+PROCESS_LOCAL_BACKENDS = {"django.core.cache.backends.locmem.LocMemCache"}
+
+
+def require_shared_cache(alias):
+    """
+    Raise ``ImproperlyConfigured`` when the cache ``alias`` lives in each
+    process and ``REQUIRE_SHARED_CACHES`` is set.
+
+    Invalidating a process-local cache only reaches the process that made the
+    write, every other worker keeps serving the stale values until they expire.
+    """
+    backend = settings.CACHES[alias]["BACKEND"]
+    if settings.REQUIRE_SHARED_CACHES and backend in PROCESS_LOCAL_BACKENDS:
+        raise ImproperlyConfigured(
+            f"The {alias!r} cache uses {backend}, which is not shared between processes. "
+            f"Configure a shared backend such as RedisCache for it."
+        )
+
+
+class TieredCache:
+    """
+    Two-tier cache for small, rarely changing values.
+
+    Lookups go to a process-local dictionary first, then to a Django cache
+    alias shared between processes and finally to the loader. Invalidation
+    bumps a namespace version in the shared tier, so every process stops
+    reading stale shared entries at once, while other processes' local tiers
+    expire after ``local_timeout`` seconds at most. The shared tier must be a
+    cross-process backend, see ``require_shared_cache``.
+
+    Attributes:
+        namespace (str): Prefix of every key stored in the shared tier.
+        local_timeout (int): Seconds a value lives in the process-local tier.
+        shared_timeout (int): Seconds a value lives in the shared tier.
+        alias (str): Name of the Django cache used as the shared tier.
+    """
+
+    def __init__(self, namespace, local_timeout=30, shared_timeout=3600, alias="default"):
+        require_shared_cache(alias)
+        self.namespace = namespace
+        self.local_timeout = local_timeout
+        self.shared_timeout = shared_timeout
+        self.alias = alias
+        self._local = {}
+        self._lock = threading.Lock()
+        self._counters = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _version_key(self):
+        return f"{self.namespace}:version"
+
+    def _shared_key(self, key):
+        version = self.shared.get_or_set(self._version_key(), time.time_ns, timeout=None)
+        return f"{self.namespace}:{version}:{key}"
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get_or_set(self, key, loader):
+        """
+        Return the cached value for ``key``, calling ``loader()`` on a miss.
+        """
+        now = time.monotonic()
+        entry = self._local.get(key)
+        if entry is not None and entry[0] > now:
+            self._count("local_hits")
+            return entry[1]
+
+        shared_key = self._shared_key(key)
+        value = self.shared.get(shared_key)
+        if value is not None:
+            self._count("shared_hits")
+        else:
+            self._count("misses")
+            value = loader()
+            self.shared.set(shared_key, value, timeout=self.shared_timeout)
+
+        self._local[key] = (now + self.local_timeout, value)
+        return value
+
+    def invalidate(self):
+        """
+        Drop every value of the namespace in this process and in the shared tier.
+        """
+        self._local.clear()
+        try:
+            self.shared.incr(self._version_key())
+        except ValueError:
+            self.shared.set(self._version_key(), time.time_ns(), timeout=None)
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = sum(counters.values())
+        hits = counters["local_hits"] + counters["shared_hits"]
+        counters["hit_ratio"] = hits / lookups if lookups else 0.0
+        return counters
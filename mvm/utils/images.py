@@ -0,0 +1,149 @@
+import io
+import logging
+import posixpath
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_DIR = "renditions"
+RENDITION_FORMAT = "WEBP"
+RENDITION_EXTENSION = "webp"
+
+# Names whose renditions are stored, and when the missing ones are checked again.
+_available_renditions = set()
+_missing_renditions = {}
+
+
+def media_url(name):
+    """URL of a stored file, or an empty string when there is no file."""
+    name = str(name or "")
+    if not name:
+        return ""
+    return default_storage.url(name)
+
+
+def name_from_url(url):
+    """Storage name of a media URL produced by ``media_url``."""
+    url = str(url or "")
+    if url.startswith(settings.MEDIA_URL):
+        return url[len(settings.MEDIA_URL):]
+    return url
+
+
+def rendition_name(name, width):
+    """
+    Storage name of the ``width`` pixels wide rendition of ``name``.
+
+    Renditions live in a ``renditions`` folder next to the original, e.g.
+    ``travel/travels/renditions/cover_640w.webp`` for ``travel/travels/cover.jpg``.
+    Uploaded names are unique, so a new upload never reuses an old rendition.
+    """
+    directory, filename = posixpath.split(str(name))
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, RENDITIONS_DIR, f"{stem}_{width}w.{RENDITION_EXTENSION}")
+
+
+def renditions_available(name):
+    """
+    Cached ``has_renditions(name)``, checked while rendering.
+
+    Names are unique, so renditions once found are remembered for good. A
+    missing one is checked again after ``IMAGE_RENDITION_MISSING_TIMEOUT``
+    seconds, the worker writes them shortly after the upload.
+    """
+    if name in _available_renditions:
+        return True
+    if _missing_renditions.get(name, 0) > time.monotonic():
+        return False
+    if has_renditions(name):
+        _available_renditions.add(name)
+        _missing_renditions.pop(name, None)
+        return True
+    _missing_renditions[name] = time.monotonic() + settings.IMAGE_RENDITION_MISSING_TIMEOUT
+    return False
+
+
+def rendition_url(name, width):
+    """
+    URL of a rendition, falling back to the original when renditions are
+    disabled or not written yet.
+    """
+    if not name:
+        return ""
+    if not settings.IMAGE_RENDITIONS_ENABLED or not renditions_available(name):
+        return media_url(name)
+    return media_url(rendition_name(name, width))
+
+
+def srcset(name, widths=None):
+    """
+    Value of an ``<img srcset>`` attribute listing every rendition of ``name``,
+    empty until they are written.
+    """
+    if not name or not settings.IMAGE_RENDITIONS_ENABLED or not renditions_available(name):
+        return ""
+    widths = widths or settings.IMAGE_RENDITION_WIDTHS
+    return ", ".join(f"{media_url(rendition_name(name, width))} {width}w" for width in widths)
+
+
+def has_renditions(name, storage=default_storage):
+    """
+    Whether the renditions of ``name`` were written.
+
+    Renditions are written from the narrowest to the widest, so checking the
+    widest one is enough.
+    """
+    return storage.exists(rendition_name(name, max(settings.IMAGE_RENDITION_WIDTHS)))
+
+
+def generate_renditions(name, widths=None, force=False, storage=default_storage):
+    """
+    Write the resized renditions of the stored image ``name``.
+
+    Images are never upscaled: when the original is narrower than a width, that
+    rendition keeps the original size so every ``srcset`` candidate exists.
+    Renditions already stored are kept unless ``force`` is set.
+
+    Returns:
+        list: Storage names of the renditions written.
+    """
+    if not name:
+        return []
+    widths = sorted(widths or settings.IMAGE_RENDITION_WIDTHS)
+    pending = [
+        width for width in widths
+        if force or not storage.exists(rendition_name(name, width))
+    ]
+    if not pending:
+        return []
+
+    try:
+        with storage.open(name, "rb") as handle:
+            original = Image.open(handle)
+            original.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Could not read image %s to build its renditions", name, exc_info=True)
+        return []
+
+    original = ImageOps.exif_transpose(original)
+    if original.mode not in ("RGB", "RGBA"):
+        original = original.convert("RGBA" if "transparency" in original.info else "RGB")
+
+    written = []
+    for width in pending:
+        image = original.copy()
+        if image.width > width:
+            image.thumbnail((width, image.height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, RENDITION_FORMAT, quality=settings.IMAGE_RENDITION_QUALITY, method=4)
+        target = rendition_name(name, width)
+        if storage.exists(target):
+            storage.delete(target)
+        written.append(storage.save(target, ContentFile(buffer.getvalue())))
+    _missing_renditions.pop(name, None)
+    return written
@@ -0,0 +1,165 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Collapses the placeholders of IN lists, so queries that only differ in the
+# number of ids share a fingerprint.
+PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+
+
+def fingerprint(sql):
+    """SQL with variable-length placeholder lists collapsed."""
+    return PLACEHOLDER_LIST.sub("(%s, ...)", sql)
+
+
+class QueryRecorder:
+    """
+    Records the queries run on every database connection while installed.
+
+    Installed through ``connection.execute_wrapper``, so it sees every query,
+    including those of other middleware, template rendering and signals.
+
+    Attributes:
+        count (int): Number of queries run.
+        duration (float): Seconds spent running them.
+        fingerprints (Counter): Number of times each query fingerprint ran.
+        queries (list): ``(alias, sql, params)`` of every query, only kept
+            when ``keep_queries`` is set.
+    """
+
+    def __init__(self, keep_queries=False):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.keep_queries = keep_queries
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+            if self.keep_queries:
+                self.queries.append((context["connection"].alias, sql, params))
+
+    @property
+    def duplicates(self):
+        """Fingerprints run more than once, most repeated first."""
+        return {sql: times for sql, times in self.fingerprints.most_common() if times > 1}
+
+    def install(self):
+        """Record the queries of the current thread's connections until ``uninstall``."""
+        for connection in connections.all():
+            connection.execute_wrappers.append(self)
+
+    def uninstall(self):
+        for connection in connections.all():
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+    @classmethod
+    @contextmanager
+    def record(cls, keep_queries=False):
+        recorder = cls(keep_queries)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            yield recorder
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Measures the queries, database time and rendering time of every request.
+
+    The numbers are logged as one JSON line on the ``mvm.utils.instrumentation``
+    logger and, when ``SERVER_TIMING_ENABLED`` is set, exposed in a
+    ``Server-Timing`` header readable in the browser developer tools.
+
+    Under ASGI the async ORM runs the queries of a request on one thread, so
+    the recorder is installed on that thread's connections.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request._render_duration = 0.0
+        started = time.perf_counter()
+        with QueryRecorder.record() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        request._render_duration = 0.0
+        started = time.perf_counter()
+        recorder = QueryRecorder()
+        await sync_to_async(recorder.install)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.uninstall)()
+        return self.report(request, response, recorder, time.perf_counter() - started)
+
+    def report(self, request, response, recorder, total):
+        duplicates = recorder.duplicates
+        metrics = {
+            "method": request.method,
+            "path": request.path,
+            "view": getattr(request.resolver_match, "view_name", None),
+            "status": response.status_code,
+            "queries": recorder.count,
+            "db_ms": round(recorder.duration * 1000, 2),
+            "duplicate_queries": sum(times - 1 for times in duplicates.values()),
+            "render_ms": round(request._render_duration * 1000, 2),
+            "app_ms": round((total - recorder.duration) * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+        }
+        logger.info(json.dumps(metrics))
+        if duplicates:
+            logger.debug("Duplicate queries on %s: %s", request.path, json.dumps(duplicates))
+
+        if settings.SERVER_TIMING_ENABLED:
+            response["Server-Timing"] = ", ".join([
+                f'db;dur={metrics["db_ms"]};desc="{recorder.count} queries"',
+                f'dup;desc="{metrics["duplicate_queries"]} duplicate queries"',
+                f'render;dur={metrics["render_ms"]}',
+                f'app;dur={metrics["app_ms"]}',
+                f'total;dur={metrics["total_ms"]}',
+            ])
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Time the rendering of template responses, which runs after the view
+        returns. Views calling ``render()`` render inside the view and only
+        show up in ``app``.
+        """
+        render = response.render
+
+        def timed_render():
+            started = time.perf_counter()
+            try:
+                return render()
+            finally:
+                request._render_duration += time.perf_counter() - started
+
+        response.render = timed_render
+        return response
@@ -0,0 +1,215 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from mvm.utils.cache import require_shared_cache
+
+
+class TaggedPageCache:
+    """
+    Full-page cache for anonymous GET requests with tag-based invalidation.
+
+    Every cached page depends on a set of tags. Each tag has a version stored
+    in the cache and the versions are part of the page key, so purging a tag
+    (bumping its version) orphans every page that depends on it at once,
+    whatever the backend (locmem, file-based or Redis).
+
+    Hits, misses and the rendering time saved are counted per route in the
+    same cache, so they are shared by every worker process. Purges must reach
+    every process too, so the cache must be a cross-process backend, see
+    ``require_shared_cache``.
+
+    Attributes:
+        alias (str): Name of the Django cache the pages are stored in.
+        timeout (int): Seconds a page stays cached.
+        routes (set): Names of the routes decorated with ``cache_page``.
+    """
+
+    def __init__(self, alias="default", timeout=600, prefix="page"):
+        require_shared_cache(alias)
+        self.alias = alias
+        self.timeout = timeout
+        self.prefix = prefix
+        self.routes = set()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _tag_key(self, tag):
+        return f"{self.prefix}:tag:{tag}"
+
+    def _stat_key(self, route, stat):
+        return f"{self.prefix}:stats:{route}:{stat}"
+
+    def tag_versions(self, tags):
+        keys = [self._tag_key(tag) for tag in tags]
+        versions = self.cache.get_many(keys)
+        missing = {key: time.time_ns() for key in keys if key not in versions}
+        if missing:
+            self.cache.set_many(missing, timeout=None)
+            versions.update(missing)
+        return [versions[key] for key in keys]
+
+    def page_key(self, request, tags):
+        versions = ",".join(str(version) for version in self.tag_versions(tags))
+        url = request.build_absolute_uri()
+        digest = hashlib.sha256(f"{url}|{versions}".encode()).hexdigest()
+        return f"{self.prefix}:content:{digest}"
+
+    def get_or_set(self, key, tags, compute):
+        """
+        Return the value cached as ``key`` until any of ``tags`` is purged,
+        storing ``compute()`` on a miss. ``None`` is not cached.
+        """
+        versions = ",".join(str(version) for version in self.tag_versions(tags))
+        digest = hashlib.sha256(f"{key}|{versions}".encode()).hexdigest()
+        value_key = f"{self.prefix}:value:{digest}"
+        value = self.cache.get(value_key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.cache.set(value_key, value, timeout=self.timeout)
+        return value
+
+    def purge(self, *tags):
+        """
+        Invalidate every cached page that depends on any of ``tags``.
+        """
+        if tags:
+            self.cache.set_many({self._tag_key(tag): time.time_ns() for tag in tags}, timeout=None)
+
+    def _increment(self, route, stat, delta=1):
+        key = self._stat_key(route, stat)
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key, delta)
+        except ValueError:
+            self.cache.set(key, delta, timeout=None)
+
+    def stats(self):
+        """
+        Return ``{route: {"hits", "misses", "hit_ratio", "saved_ms"}}`` for every route.
+        """
+        stats = {}
+        for route in sorted(self.routes):
+            values = self.cache.get_many(
+                [self._stat_key(route, stat) for stat in ("hits", "misses", "saved_ms")]
+            )
+            hits = values.get(self._stat_key(route, "hits"), 0)
+            misses = values.get(self._stat_key(route, "misses"), 0)
+            stats[route] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+                "saved_ms": values.get(self._stat_key(route, "saved_ms"), 0),
+            }
+        return stats
+
+    def reset_stats(self):
+        self.cache.delete_many([
+            self._stat_key(route, stat)
+            for route in self.routes
+            for stat in ("hits", "misses", "saved_ms")
+        ])
+
+    @staticmethod
+    def is_cacheable_request(request):
+        return (
+            request.method in ("GET", "HEAD")
+            and not request.user.is_authenticated
+        )
+
+    @staticmethod
+    def is_cacheable_response(request, response):
+        # Pages that embed a CSRF token are specific to the visitor's cookie.
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        )
+
+    def _lookup(self, route, tags, request, kwargs):
+        """
+        Return the page key and the cached response, if any. The key is
+        ``None`` when the request must not be cached.
+        """
+        if not self.is_cacheable_request(request):
+            return None, None
+        key = self.page_key(request, tags(request, **kwargs))
+        cached = self.cache.get(key)
+        if cached is None:
+            return key, None
+        content, content_type, render_ms = cached
+        self._increment(route, "hits")
+        self._increment(route, "saved_ms", render_ms)
+        response = HttpResponse(content, content_type=content_type)
+        response["X-Page-Cache"] = "hit"
+        return key, response
+
+    def _store_response(self, route, key, request, response, started):
+        self._increment(route, "misses")
+
+        def store(rendered):
+            if self.is_cacheable_response(request, rendered):
+                render_ms = round((time.perf_counter() - started) * 1000)
+                self.cache.set(
+                    key,
+                    (rendered.content, rendered["Content-Type"], render_ms),
+                    timeout=self.timeout,
+                )
+            rendered["X-Page-Cache"] = "miss"
+            return rendered
+
+        if getattr(response, "is_rendered", True) is False:
+            response.add_post_render_callback(store)
+            return response
+        return store(response)
+
+    def cache_page(self, route, tags):
+        """
+        View decorator caching anonymous GET responses of ``route``.
+
+        ``tags`` is a callable receiving the request and the view kwargs and
+        returning the tags the page depends on. Async views are supported, the
+        cache is then read and written off the event loop.
+        """
+        self.routes.add(route)
+
+        def decorator(view_func):
+            if iscoroutinefunction(view_func):
+                @wraps(view_func)
+                async def async_wrapper(request, *args, **kwargs):
+                    # One thread hop: reading request.user may load the session and the user.
+                    key, response = await sync_to_async(self._lookup)(route, tags, request, kwargs)
+                    if response is not None:
+                        return response
+                    if key is None:
+                        return await view_func(request, *args, **kwargs)
+
+                    started = time.perf_counter()
+                    response = await view_func(request, *args, **kwargs)
+                    return await sync_to_async(self._store_response)(route, key, request, response, started)
+
+                return async_wrapper
+
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                key, response = self._lookup(route, tags, request, kwargs)
+                if response is not None:
+                    return response
+                if key is None:
+                    return view_func(request, *args, **kwargs)
+
+                started = time.perf_counter()
+                response = view_func(request, *args, **kwargs)
+                return self._store_response(route, key, request, response, started)
+
+            return wrapper
+
+        return decorator
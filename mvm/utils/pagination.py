@@ -0,0 +1,209 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def estimated_count(queryset):
+    """Rows of ``queryset`` estimated by the PostgreSQL planner, without running it."""
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the count from the planner estimate on large tables.
+
+    ``COUNT(*)`` scans every matching row, the estimate costs an EXPLAIN. The
+    exact count is still used below ``exact_count_limit`` rows, where it is
+    cheap and an approximate total would be noticed, and for filtered or
+    searched lists, whose selectivity the planner can misjudge by orders of
+    magnitude.
+    """
+    exact_count_limit = 10000
+
+    def is_filtered(self):
+        """Whether the rows are narrowed down beyond the default manager of their model."""
+        queryset = self.object_list
+        return queryset.query.where != queryset.model._default_manager.all().query.where
+
+    @cached_property
+    def count(self):
+        if self.is_filtered():
+            return super().count
+        estimate = estimated_count(self.object_list)
+        if estimate < self.exact_count_limit:
+            return super().count
+        return estimate
+
+
+class KeysetPage:
+    """
+    One page returned by ``KeysetPaginator``.
+
+    Attributes:
+        object_list (list): The rows of the page.
+        cursor (str): The cursor the page was requested with, if any.
+        next_cursor (str): The cursor of the following page, or None on the last page.
+        last_row (dict): The keys of the row the page was seeked from, if any,
+            parsed into Python values by their model fields.
+    """
+
+    def __init__(self, object_list, cursor, next_cursor, last_row):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.last_row = last_row
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Seek ("keyset") pagination in descending order of ``keys``.
+
+    Unlike offset pagination, every page is fetched with an index-friendly
+    ``WHERE (k1, k2) < (v1, v2) ORDER BY k1 DESC, k2 DESC LIMIT n`` query, so the
+    cost of a page does not grow with its position. The last key must be unique.
+    Rows may be model instances or ``.values()`` dicts, as long as they carry the keys.
+    """
+
+    def __init__(self, queryset, per_page, keys=("start_date", "id")):
+        self.keys = keys
+        self.per_page = per_page
+        self.queryset = queryset.order_by(*[f"-{key}" for key in keys])
+
+    @staticmethod
+    def _value(row, key):
+        return row[key] if isinstance(row, dict) else getattr(row, key)
+
+    def encode_cursor(self, row):
+        values = [self._value(row, key) for key in self.keys]
+        payload = json.dumps(values, default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """
+        Keys of the row encoded in ``cursor``, parsed by their model fields.
+
+        Raise ``InvalidCursor`` for anything ``encode_cursor`` could not have
+        produced, e.g. a tampered value, so it never reaches the query.
+        """
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(payload)
+        except (ValueError, TypeError) as error:
+            raise InvalidCursor(cursor) from error
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise InvalidCursor(cursor)
+        return {key: self._parse(key, value, cursor) for key, value in zip(self.keys, values)}
+
+    def _parse(self, key, value, cursor):
+        field = self.queryset.model._meta.get_field(key)
+        if value is None or isinstance(value, (list, dict, bool)):
+            raise InvalidCursor(cursor)
+        try:
+            value = field.to_python(value)
+            # Range validators, e.g. an id out of the bigint range.
+            field.run_validators(value)
+        except (ValidationError, TypeError, ValueError) as error:
+            raise InvalidCursor(cursor) from error
+        return value
+
+    def _seek_filter(self, values):
+        # (k1 < v1) OR (k1 = v1 AND k2 < v2) OR ...
+        condition = Q()
+        for position, key in enumerate(self.keys):
+            step = Q(**{f"{key}__lt": values[key]})
+            for previous in self.keys[:position]:
+                step &= Q(**{previous: values[previous]})
+            condition |= step
+        return condition
+
+    def _seek(self, cursor):
+        queryset = self.queryset
+        last_row = None
+        if cursor:
+            last_row = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._seek_filter(last_row))
+        return queryset[:self.per_page + 1], last_row
+
+    def _build_page(self, rows, cursor, last_row):
+        next_cursor = None
+        if len(rows) > self.per_page:
+            rows = rows[:self.per_page]
+            next_cursor = self.encode_cursor(rows[-1])
+        return KeysetPage(rows, cursor, next_cursor, last_row)
+
+    def page(self, cursor=None):
+        """
+        Return the page that follows ``cursor``, or the first page without one.
+        """
+        queryset, last_row = self._seek(cursor)
+        return self._build_page(list(queryset), cursor, last_row)
+
+    async def apage(self, cursor=None):
+        """
+        Async version of ``page``, fetching the rows with the async ORM.
+        """
+        queryset, last_row = self._seek(cursor)
+        return self._build_page([row async for row in queryset], cursor, last_row)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    DRF pagination backed by ``KeysetPaginator``.
+
+    Pages are seeked on ``keys`` in descending order and linked by an opaque
+    ``?cursor=``, so deep pages cost the same as the first one.
+    """
+    page_size = None
+    cursor_query_param = "cursor"
+    keys = ("start_date", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.page_size or settings.REST_FRAMEWORK["PAGE_SIZE"]
+        paginator = KeysetPaginator(queryset, page_size, self.keys)
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise NotFound("Invalid cursor.")
+        self.request = request
+        return list(self.page)
+
+    def get_next_link(self):
+        if not self.page.has_next():
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.page.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,182 @@
+"""
+Static snapshot of the public pages, written by ``build_static_site``.
+
+Every page is stored as ``<portal>/<url>/index.html`` under
+``settings.STATIC_SITE_ROOT``, ``<portal>`` being the primary key of the portal
+it was rendered for, and served by ``StaticSiteMiddleware`` without touching
+the database. Pages missing from the snapshot are served by the views as usual.
+"""
+import copy
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+STATIC_SITE_MIDDLEWARE = "mvm.utils.static_site.StaticSiteMiddleware"
+MANIFEST_NAME = "manifest.json"
+BUILD_STAMP = "built"
+
+
+def page_path(root, url):
+    """File of the page at ``url``, e.g. ``<root>/travels/index.html`` for ``/travels/``."""
+    return Path(root, url.strip("/"), "index.html")
+
+
+def write_atomic(path, content):
+    """Write ``content`` to ``path`` through a rename, readers never see half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(handle, "wb") as temp_file:
+            temp_file.write(content)
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def remove_page(root, url):
+    path = page_path(root, url)
+    path.unlink(missing_ok=True)
+    # Drop the directories left empty, never the root itself.
+    root = Path(root)
+    for directory in path.parents:
+        if directory == root or root not in directory.parents:
+            break
+        try:
+            directory.rmdir()
+        except OSError:
+            break
+
+
+def read_manifest(root):
+    """Fingerprints of the pages in the snapshot, by URL."""
+    try:
+        with Path(root, MANIFEST_NAME).open() as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(root, manifest):
+    write_atomic(Path(root, MANIFEST_NAME), json.dumps(manifest, indent=1, sort_keys=True).encode())
+
+
+def mark_built(root):
+    """Record a finished build, so running ``StaticSiteMiddleware`` instances index it."""
+    write_atomic(Path(root, BUILD_STAMP), str(time.time_ns()).encode())
+
+
+def build_time(root):
+    """Time of the last finished build under ``root``, None before the first one."""
+    try:
+        return os.stat(Path(root, BUILD_STAMP)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def setup_worker():
+    """Process pool initializer, a spawned process starts without Django set up."""
+    django.setup()
+
+
+def portal_root(root, portal_id):
+    """Directory of the snapshot of the portal ``portal_id`` under ``root``."""
+    return Path(root, str(portal_id)) if portal_id is not None else Path(root)
+
+
+def render_pages(root, urls, host="testserver"):
+    """
+    Render ``urls`` requested on ``host`` through the full middleware stack and
+    write them under ``root``. Pages that do not answer a 200 are removed from
+    the snapshot.
+
+    Return the URLs written.
+    """
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    # Rendering must not read back the snapshot being rebuilt.
+    middleware = [name for name in settings.MIDDLEWARE if name != STATIC_SITE_MIDDLEWARE]
+    written = []
+    with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=[host]):
+        client = Client(HTTP_HOST=host)
+        for url in urls:
+            response = client.get(url)
+            if response.status_code == 200 and not response.streaming:
+                write_atomic(page_path(root, url), response.content)
+                written.append(url)
+            else:
+                remove_page(root, url)
+    return written
+
+
+class StaticSiteMiddleware(WhiteNoiseMiddleware):
+    """
+    Serves the pages of the snapshot with WhiteNoise.
+
+    Only GET and HEAD requests of page URLs without a query string are looked
+    up, e.g. ``/travels/`` but not ``/travels/?cursor=...``, everything else
+    goes on to the views. Pages are looked up in the snapshot of
+    ``request.portal``, set by ``PortalMiddleware`` further up the stack.
+
+    Outside DEBUG the files are indexed once per build: every request checks
+    the build stamp written by ``mark_built`` and the snapshot is indexed again
+    when it changed, so a rebuild is served without a restart.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        self.get_response = get_response
+        WhiteNoise.__init__(
+            self,
+            application=None,
+            autorefresh=settings.DEBUG,
+            max_age=0,
+            index_file=True,
+        )
+        self.use_finders = False
+        self.root = Path(settings.STATIC_SITE_ROOT)
+        self.built_at = None
+        if self.autorefresh:
+            self.add_files(self.root)
+        else:
+            self.refresh_files()
+
+    def refresh_files(self):
+        built_at = build_time(self.root)
+        if built_at == self.built_at:
+            return
+        # Index into a copy and swap it in, concurrent requests never see half an index.
+        snapshot = copy.copy(self)
+        snapshot.files = {}
+        snapshot.add_files(self.root)
+        self.files = snapshot.files
+        self.built_at = built_at
+
+    def immutable_file_test(self, path, url):
+        # Pages keep their URL across rebuilds.
+        return False
+
+    def __call__(self, request):
+        if (
+            request.method in ("GET", "HEAD")
+            and not request.META.get("QUERY_STRING")
+            and request.path_info.endswith("/")
+        ):
+            portal = getattr(request, "portal", None)
+            prefix = f"/{portal['id']}" if portal and portal["id"] is not None else ""
+            if self.autorefresh:
+                static_file = self.find_file(prefix + request.path_info)
+            else:
+                self.refresh_files()
+                static_file = self.files.get(prefix + request.path_info)
+            if static_file is not None:
+                return self.serve(static_file, request)
+        return self.get_response(request)
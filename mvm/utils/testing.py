@@ -0,0 +1,49 @@
+from django.urls import reverse
+
+from mvm.utils.instrumentation import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin asserting how many queries a route may run.
+
+    ``query_budgets`` maps a URL name to the maximum number of queries of one
+    request, optionally with the ``args`` used to reverse it::
+
+        query_budgets = {
+            "travels:overview": 4,
+            "travels:travel_details": (3, lambda test: [test.travel.uuid]),
+        }
+
+    Call ``assertQueryBudgets()`` from a test to request every route with the
+    test client. A route over budget fails with the repeated queries listed,
+    which are the usual cause of a regression. Override ``prepare_route()`` to
+    reset caches, so every route is measured cold whatever the order.
+    """
+    query_budgets = {}
+
+    def prepare_route(self, name):
+        pass
+
+    def assertQueryBudget(self, url, budget, method="get", **kwargs):
+        with QueryRecorder.record() as recorder:
+            response = getattr(self.client, method)(url, **kwargs)
+        if recorder.count > budget:
+            duplicates = "\n".join(
+                f"  {times}x {sql}" for sql, times in recorder.duplicates.items()
+            ) or "  none"
+            self.fail(
+                f"{url} ran {recorder.count} queries, budget is {budget}.\n"
+                f"Repeated queries:\n{duplicates}"
+            )
+        return response
+
+    def assertQueryBudgets(self):
+        for name, budget in self.query_budgets.items():
+            args = []
+            if isinstance(budget, tuple):
+                budget, get_args = budget
+                args = get_args(self)
+            self.prepare_route(name)
+            with self.subTest(route=name):
+                self.assertQueryBudget(reverse(name, args=args), budget)